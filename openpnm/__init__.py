@@ -24,16 +24,27 @@ from . import physics
 from . import algorithms
 from . import solvers
 from . import integrators
-from . import materials
-from . import io
-from . import metrics
-from . import contrib
 
 from .utils import Workspace, Project
 
+import importlib as _importlib
 import numpy as _np
 _np.seterr(divide='ignore', invalid='ignore')
 
 __version__ = utils._get_version()
 
 utils._setup_logger()
+
+
+# These modules pull in heavy dependencies, so are imported on first access
+_lazy_modules = ['materials', 'io', 'metrics', 'contrib']
+
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        return _importlib.import_module('.' + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + _lazy_modules)
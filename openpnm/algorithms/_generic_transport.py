@@ -6,6 +6,7 @@ from openpnm.algorithms import GenericAlgorithm
 from openpnm.algorithms import BCsMixin
 from openpnm.utils import prettify_logger_message
 from openpnm.utils import Docorator, SettingsAttr, TypedSet, Workspace
+from openpnm.utils import profiled
 from openpnm import solvers
 from ._solution import SteadyStateSolution, SolutionContainer
 docstr = Docorator()
@@ -32,6 +33,12 @@ class GenericTransportSettings:
         associated with the given *Phase*.
     cache : bool
         If ``True``, A matrix is cached and rather than getting rebuilt.
+    matrix_free : bool
+        If ``True``, A is a stencil-based operator created by the network's
+        ``create_laplacian_operator`` method rather than a sparse matrix,
+        which is only available for ``Cubic`` networks. This is best used
+        with an iterative solver such as ``ScipyCG``, which is the default
+        in this case.
 
     """
     prefix = 'transport'
@@ -39,6 +46,7 @@ class GenericTransportSettings:
     quantity = ''
     conductance = ''
     cache = True
+    matrix_free = False
     variable_props = TypedSet()
 
 
@@ -111,6 +119,7 @@ class GenericTransport(GenericAlgorithm, BCsMixin):
             self.pop(self.settings['quantity'], None)
 
     @docstr.dedent
+    @profiled('transport', output=lambda self: self._A)
     def _build_A(self):
         r"""
         Builds the coefficient matrix based on throat conductance values.
@@ -137,8 +146,14 @@ class GenericTransport(GenericAlgorithm, BCsMixin):
         if self._pure_A is None:
             phase = self.project[self.settings.phase]
             g = phase[gvals]
-            am = self.network.create_adjacency_matrix(weights=g, fmt='coo')
-            self._pure_A = spgr.laplacian(am).astype(float)
+            if self.settings['matrix_free']:
+                if not hasattr(self.network, 'create_laplacian_operator'):
+                    raise Exception('matrix_free requires a Cubic network')
+                self._pure_A = self.network.create_laplacian_operator(g)
+            else:
+                am = self.network.create_adjacency_matrix(weights=g,
+                                                          fmt='coo')
+                self._pure_A = spgr.laplacian(am).astype(float)
         self.A = self._pure_A.copy()
 
     def _build_b(self):
@@ -173,6 +188,7 @@ class GenericTransport(GenericAlgorithm, BCsMixin):
     def b(self, value):
         self._b = value
 
+    @profiled('transport')
     def _apply_BCs(self):
         r"""
         Applies all the boundary conditions that have been specified, by
@@ -193,15 +209,20 @@ class GenericTransport(GenericAlgorithm, BCsMixin):
             self.b[~ind] -= (self.A * x_BC)[~ind]
             # Update A
             P_bc = self.to_indices(ind)
-            mask = np.isin(self.A.row, P_bc) | np.isin(self.A.col, P_bc)
             # Remove entries from A for all BC rows/cols
-            self.A.data[mask] = 0
+            if self.settings['matrix_free']:
+                self.A.drop_connections(P_bc)
+            else:
+                mask = np.isin(self.A.row, P_bc) | np.isin(self.A.col, P_bc)
+                self.A.data[mask] = 0
             # Add diagonal entries back into A
             datadiag = self.A.diagonal()
             datadiag[P_bc] = np.ones_like(P_bc, dtype=float) * f
             self.A.setdiag(datadiag)
-            self.A.eliminate_zeros()
+            if not self.settings['matrix_free']:
+                self.A.eliminate_zeros()
 
+    @profiled('transport')
     def run(self, solver=None, x0=None, verbose=True):
         r"""
         Builds the A and b matrices, and calls the solver specified in the
@@ -220,7 +241,9 @@ class GenericTransport(GenericAlgorithm, BCsMixin):
 
         """
         logger.info('Running GenericTransport')
-        if solver is None:
+        if solver is None and self.settings['matrix_free']:
+            solver = solvers.ScipyCG()
+        elif solver is None:
             solver = getattr(solvers, ws.settings.default_solver)()
         # Perform pre-solve validations
         self._validate_settings()
@@ -294,6 +317,8 @@ class GenericTransport(GenericAlgorithm, BCsMixin):
         Ensures the network is not clustered, and if it is, they're at
         least connected to a boundary condition pore.
         """
+        if self.settings['matrix_free']:
+            return  # This would require 'throat.conns' to be built
         Ps = ~np.isnan(self['pore.bc_rate']) + ~np.isnan(self['pore.bc_value'])
         if not is_fully_connected(network=self.network, pores_BC=Ps):
             msg = ("Your network is clustered. Run h = net.check_network_"
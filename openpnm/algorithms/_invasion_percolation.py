@@ -316,8 +316,7 @@ class InvasionPercolation(GenericAlgorithm):
         # For all the steps after the inlets are set up to break-through
         # Reverse the sequence and assess the neighbors cluster state
         stopped_clusters = np.zeros(net.Np, dtype=bool)
-        all_neighbors = net.find_neighbor_pores(net.pores(), flatten=False,
-                                                include_input=True)
+        all_neighbors = net.neighbors_csr()
         for un_seq, pore in inv_seq:
             if pore not in outlets and un_seq > 0:  # Skip inlets and outlets
                 nc = clusters[all_neighbors[pore]]  # Neighboring clusters
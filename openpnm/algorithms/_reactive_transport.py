@@ -2,10 +2,8 @@ import sys
 import logging
 import numpy as np
 from numpy.linalg import norm
-from scipy.optimize.nonlin import TerminationCondition
 from openpnm.algorithms import GenericTransport
 from openpnm.utils import TypedList, Docorator, SettingsAttr
-from tqdm import tqdm
 docstr = Docorator()
 logger = logging.getLogger(__name__)
 
@@ -229,6 +227,8 @@ class ReactiveTransport(GenericTransport):
             Initial guess of the unknown variable
 
         """
+        from tqdm import tqdm
+        from scipy.optimize.nonlin import TerminationCondition
         w = self.settings['relaxation_quantity']
         maxiter = self.settings['newton_maxiter']
         f_rtol = self.settings['f_rtol']
@@ -45,7 +45,7 @@ class TransientReactiveTransport(ReactiveTransport):
         self.settings['phase'] = phase.name
         self["pore.ic"] = np.nan
 
-    def run(self, x0, tspan, saveat=None, integrator=None):
+    def run(self, x0, tspan, saveat=None, integrator=None, callback=None):
         """
         Runs the transient algorithm and returns the solution.
 
@@ -62,6 +62,11 @@ class TransientReactiveTransport(ReactiveTransport):
         integrator : Integrator, optional
             Integrator object which will be used to to the time stepping.
             Can be instantiated using openpnm.integrators module.
+        callback : callable, optional
+            Function called as ``callback(t, x)`` each time the solution
+            is stored during the integration, such as the ``callback`` of
+            ``openpnm.io.XDMFTimeSeries``. This requires an integrator
+            that supports callbacks, such as the default ``ScipyRK45``.
 
         Returns
         -------
@@ -89,7 +94,8 @@ class TransientReactiveTransport(ReactiveTransport):
         # Build RHS (dx/dt = RHS), then integrate the system of ODEs
         rhs = self._build_rhs()
         # Integrate RHS using the given solver
-        soln = integrator.solve(rhs, x0, tspan, saveat)
+        kwargs = {} if callback is None else {'callback': callback}
+        soln = integrator.solve(rhs, x0, tspan, saveat, **kwargs)
         # Return solution as dictionary
         self.soln = SolutionContainer()
         self.soln[self.settings['quantity']] = soln
@@ -34,7 +34,7 @@ class TransientMultiPhysics(GenericAlgorithm):
         self._algs = algorithms
         super().__init__(settings=self.settings, **kwargs)
 
-    def run(self, x0, tspan, saveat=None, integrator=None):
+    def run(self, x0, tspan, saveat=None, integrator=None, callback=None):
         """
         Runs all of the transient algorithms simultaneoulsy and returns the
         solution.
@@ -52,6 +52,11 @@ class TransientMultiPhysics(GenericAlgorithm):
         integrator : Integrator, optional
             Integrator object which will be used to to the time stepping.
             Can be instantiated using openpnm.integrators module.
+        callback : callable, optional
+            Function called as ``callback(t, x)`` each time the solution
+            is stored during the integration, such as the ``callback`` of
+            ``openpnm.io.XDMFTimeSeries``. This requires an integrator
+            that supports callbacks, such as the default ``ScipyRK45``.
 
         Returns
         -------
@@ -82,7 +87,8 @@ class TransientMultiPhysics(GenericAlgorithm):
         # Build RHS (dx/dt = RHS), then integrate the system of ODEs
         rhs = self._build_rhs()
         # Integrate RHS using the given solver
-        soln = integrator.solve(rhs, x0, tspan, saveat)
+        kwargs = {} if callback is None else {'callback': callback}
+        soln = integrator.solve(rhs, x0, tspan, saveat, **kwargs)
         # Return dictionary containing solution
         self.soln = SolutionContainer()
         for i, alg in enumerate(self._algs):
@@ -5,7 +5,7 @@ from copy import deepcopy
 import numpy as np
 from openpnm.utils import Workspace
 from openpnm.utils import SettingsAttr
-from openpnm.utils import PrintableList, Docorator
+from openpnm.utils import PrintableList, Docorator, LazyArray
 docstr = Docorator()
 logger = logging.getLogger(__name__)
 ws = Workspace()
@@ -124,8 +124,8 @@ class Base(dict):
             raise Exception('All keys must start with either pore, or throat')
 
         # Check 2: If adding a new key, make sure it has no conflicts
-        if self.project:
-            proj = self.project
+        proj = self.project
+        if proj:
             boss = proj.find_full_domain(self)
             keys = boss.keys(mode='all', deep=True)
         else:
@@ -153,8 +153,14 @@ class Base(dict):
         if not isinstance(value, np.ndarray):
             value = np.array(value, ndmin=1)  # Convert value to an ndarray
 
+        # Apply the dtype policy of the project, see ProjectSettings
+        if proj:
+            value = proj._cast_to_policy(key, value)
+
         # Skip checks for 'coords', 'conns'
         if key in ['pore.coords', 'throat.conns']:
+            if proj:
+                value = proj._to_storage(self, key, value)
             super(Base, self).__setitem__(key, value)
             return
 
@@ -173,8 +179,9 @@ class Base(dict):
         # Write value to dictionary
         if np.shape(value)[0] == 1:  # If value is scalar
             value = np.ones((self._count(element), ), dtype=value.dtype)*value
-            super(Base, self).__setitem__(key, value)
-        elif np.shape(value)[0] == self._count(element):
+        if np.shape(value)[0] == self._count(element):
+            if proj:  # Place in out-of-core storage if requested
+                value = proj._to_storage(self, key, value)
             super(Base, self).__setitem__(key, value)
         else:
             if self._count(element) == 0:
@@ -193,6 +200,9 @@ class Base(dict):
         if key in self.keys():
             # Get values if present on self
             vals = super().__getitem__(key)
+            if isinstance(vals, LazyArray):  # Read from disk on first access
+                vals = vals.load()
+                super().__setitem__(key, vals)
         elif key in self.keys(mode='all', deep=True):
             # Interleave values from geom if found there
             vals = self.interleave_data(key)
@@ -1,9 +1,10 @@
+import heapq
 import logging
 import inspect
-import numpy as np
 from openpnm.utils import PrintableDict, Workspace
 from openpnm.utils import is_valid_propname
 from openpnm.utils import prettify_logger_message
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
@@ -40,6 +41,73 @@ class ModelsDict(PrintableDict):
                         return obj
         raise Exception("No parent object found!")
 
+    def _dependencies(self, deep=False):
+        r"""
+        Returns the nodes and edges of the dependency graph as plain
+        python containers, reusing the cached result if neither the models
+        nor the model-less properties they refer to have changed.
+
+        Parameters
+        ----------
+        deep : bool, optional
+            If ``True`` then dependencies on properties that do not exist
+            on the parent object are retained.
+
+        Returns
+        -------
+        nodes : list[str]
+            The nodes of the graph, in order of insertion
+        edges : dict
+            A dictionary mapping each node to the list of nodes that depend
+            on it
+
+        Notes
+        -----
+        The cache key is built from the string arguments of each model
+        rather than invalidated on assignment since the individual model
+        dictionaries can be edited in place (i.e.
+        ``obj.models['pore.foo']['prop'] = 'pore.bar'``).
+
+        """
+        models = list(self.keys())
+        signature = []
+        for model in models:
+            # Filter pore/throat props only
+            dependencies = {}
+            for param in self[model].values():
+                if type(param) == list:
+                    for element in param:
+                        if is_valid_propname(element):
+                            dependencies[element] = None
+                else:
+                    if is_valid_propname(param):
+                        dependencies[param] = None
+            signature.append((model, tuple(dependencies)))
+        if not deep:
+            # Fetch model-less props: those w/o any model, like temperature
+            # otherwise, they won't get picked up in the dependency graph.
+            all_props = set(self._find_parent().keys())
+            all_props.difference_update(["pore.all", "throat.all"])
+            pure_props = {d for _, deps in signature for d in deps
+                          if (d not in self) and (d in all_props)}
+            key = (tuple(signature), frozenset(pure_props))
+        else:
+            key = (tuple(signature), None)
+        cache = self.__dict__.setdefault('_dependency_cache', {})
+        if cache.get(deep, (None,))[0] == key:
+            return cache[deep][1]
+        nodes = {}
+        edges = {}
+        for model, deps in signature:
+            nodes[model] = None
+            for d in deps:
+                if deep or (d in self) or (d in pure_props):
+                    nodes[d] = None
+                    edges.setdefault(d, []).append(model)
+        nodes = list(nodes)
+        cache[deep] = (key, (nodes, edges))
+        return nodes, edges
+
     def dependency_list(self):
         r"""
         Returns a list of dependencies in the order with which they should
@@ -53,21 +121,43 @@ class ModelsDict(PrintableDict):
         models can be called that will work).  In this case it is possible
         to visually inspect the graph using ``dependency_graph``.
 
+        The sorting is done on the cached dependencies without creating a
+        NetworkX graph, which is only imported to report a cycle.
+
         See Also
         --------
         dependency_graph
         dependency_map
 
         """
-        import networkx as nx
-
-        dtree = self.dependency_graph()
-        cycles = list(nx.simple_cycles(dtree))
-        if cycles:
+        nodes, edges = self._dependencies()
+        cache = self._dependency_cache
+        if cache.get('order', (None,))[0] is cache[False][0]:
+            return list(cache['order'][1])
+        # Kahn's algorithm, with ties broken as done by NetworkX's
+        # lexicographical_topological_sort(dtree, key=sorted)
+        indegree = dict.fromkeys(nodes, 0)
+        for children in edges.values():
+            for child in children:
+                indegree[child] += 1
+        node_id = {n: i for i, n in enumerate(nodes)}
+        queue = [(sorted(n), node_id[n], n) for n in nodes if indegree[n] == 0]
+        heapq.heapify(queue)
+        order = []
+        while queue:
+            node = heapq.heappop(queue)[2]
+            order.append(node)
+            for child in edges.get(node, []):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(queue, (sorted(child), node_id[child], child))
+        if len(order) < len(nodes):
+            import networkx as nx
+            cycles = list(nx.simple_cycles(self.dependency_graph()))
             raise Exception('Cyclic dependency found: ' + ' -> '.join(
                             cycles[0] + [cycles[0][0]]))
-        d = nx.algorithms.dag.lexicographical_topological_sort(dtree, sorted)
-        return list(d)
+        cache['order'] = (cache[False][0], order)
+        return list(order)
 
     def dependency_graph(self, deep=False):
         r"""
@@ -116,34 +206,11 @@ class ModelsDict(PrintableDict):
         """
         import networkx as nx
 
+        nodes, edges = self._dependencies(deep=deep)
         dtree = nx.DiGraph()
-        models = list(self.keys())
-        # Fetch model-less props: those w/o any model, like temperature
-        # otherwise, they won't get picked up in the dependency graph.
-        all_props = list(self._find_parent().keys())
-        exclude_keys = ["pore.all", "throat.all"]
-        pure_props = np.setdiff1d(all_props, models + exclude_keys).tolist()
-
-        for model in models:
-            dtree.add_node(model)
-            # Filter pore/throat props only
-            dependencies = set()
-            for param in self[model].values():
-                if type(param) == list:
-                    for element in param:
-                        if is_valid_propname(element):
-                            dependencies.add(element)
-                else:
-                    if is_valid_propname(param):
-                        dependencies.add(param)
-            # Add depenency from model's parameters
-            for d in dependencies:
-                if not deep:
-                    if d in models + pure_props:
-                        dtree.add_edge(d, model)
-                else:
-                    dtree.add_edge(d, model)
-
+        dtree.add_nodes_from(nodes)
+        dtree.add_edges_from((d, m) for d, models in edges.items()
+                             for m in models)
         return dtree
 
     def dependency_map(self,
@@ -352,8 +419,9 @@ class ModelsMixin:
             return
         if isinstance(propnames, str):  # Convert string to list if necessary
             propnames = [propnames]
+        self_models = self.models.dependency_list()
         if propnames is None:  # If no props given, then regenerate them all
-            propnames = self.models.dependency_list()
+            propnames = self_models
             # If some props are to be excluded, remove them from list
             for k, v in self.models.items():
                 if 'regen_mode' not in v:
@@ -362,7 +430,6 @@ class ModelsMixin:
                     exclude.extend([k])
             propnames = [i for i in propnames if i not in exclude]
         # Re-order given propnames according to dependency tree
-        self_models = self.models.dependency_list()
         propnames = [i for i in self_models if i in propnames]
 
         if deep:
@@ -387,6 +454,8 @@ class ModelsMixin:
             for item in propnames:
                 self._regen(item)
 
+    @profiled('model', name=lambda self, prop: prop,
+              output=lambda self, prop: self._get_model_data(prop))
     def _regen(self, prop):
         # Create a temporary dict of all model arguments
         try:
@@ -411,6 +480,13 @@ class ModelsMixin:
                 logger.error(prettify_logger_message(msg))
                 self.models[prop]['regen_mode'] = 'deferred'
 
+    def _get_model_data(self, prop):
+        # Fetches the data written by a model without triggering lookups
+        # on other objects, so it can be inspected by the Profiler
+        if dict.__contains__(self, prop):
+            return dict.__getitem__(self, prop)
+        return {k: v for k, v in dict.items(self) if k.startswith(prop + '.')}
+
     def remove_model(self, propname=None, mode=['model', 'data']):
         r"""
         Removes model and data from object.
@@ -1,5 +1,6 @@
-from scipy.integrate import solve_ivp
+import numpy as np
 from openpnm.integrators import Integrator
+from openpnm.utils import profiled
 from openpnm.algorithms._solution import TransientSolution
 
 __all__ = ['ScipyRK45']
@@ -14,7 +15,8 @@ class ScipyRK45(Integrator):
         self.verbose = verbose
         self.linsolver = linsolver
 
-    def solve(self, rhs, x0, tspan, saveat, **kwargs):
+    @profiled('solver')
+    def solve(self, rhs, x0, tspan, saveat, callback=None, **kwargs):
         """
         Solves the system of ODEs defined by dy/dt = rhs(t, y).
 
@@ -31,6 +33,11 @@ class ScipyRK45(Integrator):
             If float, defines the time interval at which the solution is
             to be stored. If array_like, defines the time points at which
             the solution is to be stored.
+        callback : callable, optional
+            Function called as ``callback(t, y)`` each time the solution is
+            stored, while the integration is still running. This can be used
+            to write or plot the results of long simulations as they
+            progress.
         **kwargs : keyword arguments
             Other keyword arguments that might get used by the integrator
 
@@ -42,6 +49,7 @@ class ScipyRK45(Integrator):
             solution at intermediate time points via: y = soln(t_i)).
 
         """
+        from scipy.integrate import solve_ivp
         options = {
             "atol": self.atol,
             "rtol": self.rtol,
@@ -49,7 +57,47 @@ class ScipyRK45(Integrator):
             # FIXME: uncomment next line when/if scipy#11815 is merged
             # "verbose": self.verbose,
         }
+        if callback is not None:
+            return self._solve_stepwise(rhs, x0, tspan, saveat, callback)
         sol = solve_ivp(rhs, tspan, x0, method="RK45", **options)
         if sol.success:
             return TransientSolution(sol.t, sol.y)
         raise Exception(sol.message)
+
+    def _solve_stepwise(self, rhs, x0, tspan, saveat, callback):
+        r"""
+        Advances the solver one step at a time, as done by ``solve_ivp``,
+        so the stored solutions can be passed to ``callback`` as they are
+        found
+        """
+        from scipy.integrate import RK45
+        solver = RK45(rhs, tspan[0], x0, tspan[1], atol=self.atol,
+                      rtol=self.rtol)
+        ts, ys = [], []
+
+        def store(t, y):
+            ts.append(t)
+            ys.append(y)
+            callback(t, y)
+
+        if saveat is None:
+            store(solver.t, np.array(x0, dtype=float))
+            pending = []
+        else:
+            pending = list(np.sort(np.atleast_1d(saveat)))
+            while pending and pending[0] <= solver.t:
+                store(pending.pop(0), np.array(x0, dtype=float))
+        while solver.status == 'running':
+            solver.step()
+            if solver.status == 'failed':
+                raise Exception('Required step size is less than spacing'
+                                + ' between numbers.')
+            if saveat is None:
+                store(solver.t, solver.y.copy())
+                continue
+            if pending and pending[0] <= solver.t:
+                dense = solver.dense_output()
+                while pending and pending[0] <= solver.t:
+                    t = pending.pop(0)
+                    store(t, dense(t))
+        return TransientSolution(np.array(ts), np.array(ys).T)
@@ -24,8 +24,9 @@ from ._statoil import to_statoil, from_statoil
 from ._pergeos import to_pergeos, from_pergeos
 from ._porespy import from_porespy
 from ._pandas import to_pandas
-from ._hdf5 import to_hdf5, print_hdf5
-from ._xdmf import to_xdmf
+from ._parquet import to_parquet, from_parquet
+from ._hdf5 import to_hdf5, from_hdf5, print_hdf5
+from ._xdmf import XDMFTimeSeries, to_xdmf
 from ._jsongraph import to_jsongraph, from_jsongraph
 from ._stl import to_stl
 from ._comsol import to_comsol
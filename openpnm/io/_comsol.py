@@ -1,6 +1,8 @@
+from itertools import chain, islice
 import numpy as np
 import openpnm as op
 from openpnm.io import GenericIO
+from openpnm.utils import profiled
 
 
 class COMSOL(GenericIO):
@@ -16,6 +18,7 @@ class COMSOL(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network, filename=None):
         r"""
         Saves the network and geometry data from the given objects into the
@@ -53,7 +56,7 @@ class COMSOL(GenericIO):
         dif_x = p2[:, 0]-p1[:, 0]
         dif_y = p2[:, 1]-p1[:, 1]
         # Avoid division by 0
-        m = np.array([dif_x_i != 0 for dif_x_i in dif_x])
+        m = dif_x != 0
         r = np.zeros((len(dif_x)))
         r[~m] = np.inf
         r[m] = dif_y[m]/dif_x[m]
@@ -87,25 +90,102 @@ def header(file, Nr, Nc):
     f.write(str(Nc+Nr)+' '+'# number of tags'+'\n')
     f.write('# Tags'+'\n')
 
-    for r in range(1, Nr+1):
-        tag = 'r'+str(int(r))
-        tag = str(len(tag))+' '+tag
-        f.write(tag+'\n')
-
-    for c in range(1, Nc+1):
-        tag = 'c'+str(int(c))
-        tag = str(len(tag))+' '+tag
-        f.write(tag+'\n')
+    tags = [f'r{r}' for r in range(1, Nr+1)] + [f'c{c}' for c in range(1, Nc+1)]
+    f.write(''.join([f'{len(tag)} {tag}\n' for tag in tags]))
 
     f.write('\n'+str(Nc+Nr)+' '+'# number of types'+'\n')
     f.write('# Types'+'\n')
 
-    for i in range(Nc+Nr):
-        f.write('3 obj'+'\n')
+    f.write('3 obj\n'*(Nc+Nr))
 
     f.write('\n')
 
 
+def _to_str(arr):
+    r"""
+    Converts an array of floats to a list of strings, as given by ``str``
+    """
+    return list(map(float.__repr__, arr.tolist()))
+
+
+def _write_blocks(file, template, items, blocksize=10000):
+    r"""
+    Writes each item formatted with ``template``, formatting ``blocksize``
+    items at once with a single repeated template
+    """
+    items = iter(items)
+    while True:
+        block = list(islice(items, blocksize))
+        if len(block) == 0:
+            break
+        file.write((template*len(block)) % tuple(chain.from_iterable(block)))
+
+
+_object = (
+    '0 0 1\n'
+    '5 Geom2 # class\n'
+    '2 # version\n'
+    '2 # type\n'
+    '1 # voidsLabeled\n'
+    '1e-010 # gtol\n'
+    '0.0001 # resTol\n\n'
+    '4 # number of vertices\n'
+    '# Vertices\n'
+    '# X Y dom tol\n'
+    '%s %s -1 NAN\n'
+    '%s %s -1 NAN\n'
+    '%s %s -1 NAN\n'
+    '%s %s -1 NAN\n\n'
+    '4 # number of edges\n'
+    '# Edges\n'
+    '# vtx1 vtx2 s1 s2 up down mfd tol\n'
+    '2 1 0 1 0 1 1 NAN\n'
+    '3 2 0 1 0 1 2 NAN\n'
+    '4 3 0 1 0 1 3 NAN\n'
+    '1 4 0 1 0 1 4 NAN\n\n'
+    '4 # number of manifolds\n'
+    '# Manifolds\n\n'
+)
+
+_line = (
+    '11 BezierCurve # class\n'
+    '0 0 # version\n'
+    '2 # sdim\n'
+    '0 2 1 # transformation\n'
+    '1 0 # degrees\n'
+    '2 # number of control points\n'
+    '# control point coords and weights\n'
+    '%s %s 1\n'
+    '%s %s 1\n\n'
+)
+
+_arc = (
+    '11 BezierCurve # class\n'
+    '0 0 # version\n'
+    '2 # sdim\n'
+    '0 2 1 # transformation\n'
+    '2 0 # degrees\n'
+    '3 # number of control points\n'
+    '# control point coords and weights\n'
+    '%s %s 1\n'
+    '%s %s 0.70710678118654746\n'
+    '%s %s 1\n\n'
+)
+
+_attributes = (
+    '# Attributes\n'
+    '0 # nof attributes\n\n'
+)
+
+_rectangle = ('# --------- rectangle nbr %d ---------\n\n' + _object
+              + ''.join([f'# Manifold #{i}\n' + _line for i in range(4)])
+              + _attributes)
+
+_circle = ('# --------- circle nbr %d ---------\n\n' + _object
+           + ''.join([f'# Manifold #{i}\n' + _arc for i in range(4)])
+           + _attributes)
+
+
 def rectangles(file, pores1, pores2, alphas, widths):
     f = file
 
@@ -118,82 +198,16 @@ def rectangles(file, pores1, pores2, alphas, widths):
     p4x = pores1[:, 0] - (widths/2)*np.sin(alphas)
     p4y = pores1[:, 1] + (widths/2)*np.cos(alphas)
 
-    for r in range(len(pores1)):
-        f.write('# --------- rectangle nbr '+str(r+1)+' ---------'+2*'\n')
-
-        f.write('0 0 1'+'\n')
-        f.write('5 Geom2 # class'+'\n')
-        f.write('2 # version'+'\n')
-        f.write('2 # type'+'\n')
-        f.write('1 # voidsLabeled'+'\n')
-        f.write('1e-010 # gtol'+'\n')
-        f.write('0.0001 # resTol'+2*'\n')
-
-        f.write('4 # number of vertices'+'\n')
-        f.write('# Vertices'+'\n')
-        f.write('# X Y dom tol'+'\n')
-        f.write(str(p1x[r])+' '+str(p1y[r])+' '+'-1 NAN'+'\n')
-        f.write(str(p2x[r])+' '+str(p2y[r])+' '+'-1 NAN'+'\n')
-        f.write(str(p3x[r])+' '+str(p3y[r])+' '+'-1 NAN'+'\n')
-        f.write(str(p4x[r])+' '+str(p4y[r])+' '+'-1 NAN'+2*'\n')
-
-        f.write('4 # number of edges'+'\n')
-        f.write('# Edges'+'\n')
-        f.write('# vtx1 vtx2 s1 s2 up down mfd tol'+'\n')
-        f.write('2 1 0 1 0 1 1 NAN'+'\n')
-        f.write('3 2 0 1 0 1 2 NAN'+'\n')
-        f.write('4 3 0 1 0 1 3 NAN'+'\n')
-        f.write('1 4 0 1 0 1 4 NAN'+2*'\n')
-
-        f.write('4 # number of manifolds'+'\n')
-        f.write('# Manifolds'+2*'\n')
-
-        f.write('# Manifold #0'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('1 0 # degrees'+'\n')
-        f.write('2 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        f.write(str(p2x[r])+' '+str(p2y[r])+' '+'1'+'\n')
-        f.write(str(p1x[r])+' '+str(p1y[r])+' '+'1'+2*'\n')
-
-        f.write('# Manifold #1'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('1 0 # degrees'+'\n')
-        f.write('2 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        f.write(str(p3x[r])+' '+str(p3y[r])+' '+'1'+'\n')
-        f.write(str(p2x[r])+' '+str(p2y[r])+' '+'1'+2*'\n')
-
-        f.write('# Manifold #2'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('1 0 # degrees'+'\n')
-        f.write('2 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        f.write(str(p4x[r])+' '+str(p4y[r])+' '+'1'+'\n')
-        f.write(str(p3x[r])+' '+str(p3y[r])+' '+'1'+2*'\n')
-
-        f.write('# Manifold #3'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('1 0 # degrees'+'\n')
-        f.write('2 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        f.write(str(p1x[r])+' '+str(p1y[r])+' '+'1'+'\n')
-        f.write(str(p4x[r])+' '+str(p4y[r])+' '+'1'+2*'\n')
-
-        f.write('# Attributes'+'\n')
-        f.write('0 # nof attributes'+2*'\n')
+    # Vertices, followed by the start and end point of each edge
+    p1x, p1y, p2x, p2y = _to_str(p1x), _to_str(p1y), _to_str(p2x), _to_str(p2y)
+    p3x, p3y, p4x, p4y = _to_str(p3x), _to_str(p3y), _to_str(p4x), _to_str(p4y)
+    cols = [p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y,
+            p2x, p2y, p1x, p1y,
+            p3x, p3y, p2x, p2y,
+            p4x, p4y, p3x, p3y,
+            p1x, p1y, p4x, p4y]
+    nbrs = range(1, len(pores1)+1)
+    _write_blocks(f, _rectangle, zip(nbrs, *cols))
 
 
 def circles(file, centers, radii):
@@ -208,99 +222,15 @@ def circles(file, centers, radii):
     p4x = centers[:, 0]
     p4y = centers[:, 1]+radii
 
-    for c in range(len(centers)):
-        f.write('# --------- circle nbr '+str(c+1)+' ---------'+2*'\n')
-
-        f.write('0 0 1'+'\n')
-        f.write('5 Geom2 # class'+'\n')
-        f.write('2 # version'+'\n')
-        f.write('2 # type'+'\n')
-        f.write('1 # voidsLabeled'+'\n')
-        f.write('1e-010 # gtol'+'\n')
-        f.write('0.0001 # resTol'+2*'\n')
-
-        f.write('4 # number of vertices'+'\n')
-        f.write('# Vertices'+'\n')
-        f.write('# X Y dom tol'+'\n')
-        # extreme left point of the circle
-        f.write(str(p1x[c])+' '+str(p1y[c])+' '+'-1 NAN'+'\n')
-        # extreme bottom point of the circle
-        f.write(str(p2x[c])+' '+str(p2y[c])+' '+'-1 NAN'+'\n')
-        # extreme right point of the circle
-        f.write(str(p3x[c])+' '+str(p3y[c])+' '+'-1 NAN'+'\n')
-        # extreme top point of the circle
-        f.write(str(p4x[c])+' '+str(p4y[c])+' '+'-1 NAN'+2*'\n')
-
-        f.write('4 # number of edges'+'\n')
-        f.write('# Edges'+'\n')
-        f.write('# vtx1 vtx2 s1 s2 up down mfd tol'+'\n')
-        f.write('2 1 0 1 0 1 1 NAN'+'\n')
-        f.write('3 2 0 1 0 1 2 NAN'+'\n')
-        f.write('4 3 0 1 0 1 3 NAN'+'\n')
-        f.write('1 4 0 1 0 1 4 NAN'+2*'\n')
-
-        f.write('4 # number of manifolds'+'\n')
-        f.write('# Manifolds'+2*'\n')
-
-        # bottom left quart of the circle
-        f.write('# Manifold #0'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('2 0 # degrees'+'\n')
-        f.write('3 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        # extreme bottom point of the circle
-        f.write(str(p2x[c])+' '+str(p2y[c])+' '+'1'+'\n')
-        f.write(str(p1x[c])+' '+str(p2y[c])+' '+'0.70710678118654746'+'\n')
-        # extreme left point of the circle
-        f.write(str(p1x[c])+' '+str(p1y[c])+' '+'1'+2*'\n')
-
-        # bottom right quart of the circle
-        f.write('# Manifold #1'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('2 0 # degrees'+'\n')
-        f.write('3 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        # extreme right point of the circle
-        f.write(str(p3x[c])+' '+str(p3y[c])+' '+'1'+'\n')
-        f.write(str(p3x[c])+' '+str(p2y[c])+' '+'0.70710678118654746'+'\n')
-        # extreme bottom point of the circle
-        f.write(str(p2x[c])+' '+str(p2y[c])+' '+'1'+2*'\n')
-
-        # top right quart of the circle
-        f.write('# Manifold #2'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('2 0 # degrees'+'\n')
-        f.write('3 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        # extreme top point of the circle
-        f.write(str(p4x[c])+' '+str(p4y[c])+' '+'1'+'\n')
-        f.write(str(p3x[c])+' '+str(p4y[c])+' '+'0.70710678118654746'+'\n')
-        # extreme right point of the circle
-        f.write(str(p3x[c])+' '+str(p3y[c])+' '+'1'+2*'\n')
-
-        # top left quart of the circle
-        f.write('# Manifold #3'+'\n')
-        f.write('11 BezierCurve # class'+'\n')
-        f.write('0 0 # version'+'\n')
-        f.write('2 # sdim'+'\n')
-        f.write('0 2 1 # transformation'+'\n')
-        f.write('2 0 # degrees'+'\n')
-        f.write('3 # number of control points'+'\n')
-        f.write('# control point coords and weights'+'\n')
-        # extreme left point of the circle
-        f.write(str(p1x[c])+' '+str(p1y[c])+' '+'1'+'\n')
-        f.write(str(p1x[c])+' '+str(p4y[c])+' '+'0.70710678118654746'+'\n')
-        # extreme top point of the circle
-        f.write(str(p4x[c])+' '+str(p4y[c])+' '+'1'+2*'\n')
-
-        f.write('# Attributes'+'\n')
-        f.write('0 # nof attributes'+2*'\n')
+    # The extreme left, bottom, right and top points of the circle are the
+    # vertices, and the edges are the four quarters of the circle, going
+    # counterclockwise from the bottom left
+    p1x, p1y, p2x, p2y = _to_str(p1x), _to_str(p1y), _to_str(p2x), _to_str(p2y)
+    p3x, p3y, p4x, p4y = _to_str(p3x), _to_str(p3y), _to_str(p4x), _to_str(p4y)
+    cols = [p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y,
+            p2x, p2y, p1x, p2y, p1x, p1y,
+            p3x, p3y, p3x, p2y, p2x, p2y,
+            p4x, p4y, p3x, p4y, p3x, p3y,
+            p1x, p1y, p1x, p4y, p4x, p4y]
+    nbrs = range(1, len(centers)+1)
+    _write_blocks(f, _circle, zip(nbrs, *cols))
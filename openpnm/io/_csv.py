@@ -3,6 +3,7 @@ import numpy as np
 from openpnm.io._pandas import Pandas
 from openpnm.io import GenericIO, Dict
 from openpnm.utils import Workspace
+from openpnm.utils import profiled
 
 ws = Workspace()
 
@@ -40,6 +41,7 @@ class CSV(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network=None, phases=[], filename='', delim=' | '):
         r"""
         Save all the pore and throat property data on the Network (and
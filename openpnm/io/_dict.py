@@ -3,6 +3,7 @@ import pickle
 from flatdict import FlatDict
 from openpnm.utils import NestedDict, sanitize_dict, Workspace
 from openpnm.io import GenericIO
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
@@ -253,6 +254,7 @@ class Dict(GenericIO):
         return d
 
     @classmethod
+    @profiled('io')
     def export_data(cls, dct, filename):
         r"""
         Saves data from the given dictionary into the specified file.
@@ -1,7 +1,10 @@
 import logging
+import numpy as np
 from flatdict import FlatDict
 from openpnm.io import Dict, GenericIO
+from openpnm.utils import profiled, LazyArray, Workspace
 logger = logging.getLogger(__name__)
+ws = Workspace()
 
 
 class HDF5(GenericIO):
@@ -11,6 +14,7 @@ class HDF5(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network=None, phases=[], element=['pore', 'throat'],
                     filename='', interleave=True, flatten=False, categorize_by=[]):
         r"""
@@ -85,10 +89,180 @@ class HDF5(GenericIO):
             elif 'U' in str(arr[0].dtype):
                 pass
             else:
-                f.create_dataset(name='/'+tempname, shape=arr.shape,
-                                 dtype=arr.dtype, data=arr)
+                dset = f.create_dataset(name='/'+tempname, shape=arr.shape,
+                                        dtype=arr.dtype, data=arr)
+                # Keep the propname since '.' is replaced in dataset names
+                comps = item.split('/')
+                dset.attrs['propname'] = '.'.join(comps[cls._find_prop(comps):])
         return f
 
+    @classmethod
+    def _find_prop(cls, comps):
+        r"""
+        Finds where the propname starts in the components of an HDF5 path
+        """
+        for i, c in enumerate(comps):
+            if c in ['pore', 'throat'] or c.split('.')[0] in ['pore', 'throat'] \
+                    or c.split('_')[0] in ['pore', 'throat']:
+                return i
+        raise Exception('No pore or throat data found in ' + '/'.join(comps))
+
+    @classmethod
+    @profiled('io')
+    def import_data(cls, filename, project=None, lazy=False, pores=None,
+                    throats=None):
+        r"""
+        Creates network and phase objects from an HDF5 file written by
+        ``export_data``
+
+        Parameters
+        ----------
+        filename : str or path object
+            The name of the file to read
+        project : Project, optional
+            The project to which the objects are added. If not given a new
+            project is created.
+        lazy : bool
+            If ``True`` the arrays are left in the file and each is only read
+            the first time it is accessed. The file remains open until all
+            arrays have been read or the objects are deleted. The default is
+            ``False``.
+        pores : array_like, optional
+            The indices of the pores to read, so that only a sub-region of
+            the stored network is loaded. If ``throats`` are not given then
+            the throats connecting the given pores are read.
+        throats : array_like, optional
+            The indices of the throats to read. If ``pores`` are not given
+            then the pores connected to these throats are read.
+
+        Returns
+        -------
+        project : Project
+            The project containing the loaded objects
+
+        Notes
+        -----
+        Any of the layouts produced by the ``categorize_by``, ``interleave``
+        and ``flatten`` arguments of ``export_data`` can be read. The type
+        of each object is taken from the 'object' category if present, and
+        otherwise inferred from its data, with objects that are neither
+        networks, geometries nor physics treated as phases.
+
+        When reading a subset, the pore indices in 'throat.conns' are
+        renumbered to match the new pore order, which is that of the sorted
+        ``pores``.
+
+        """
+        from h5py import File as hdfFile
+        filename = cls._parse_filename(filename, ext='hdf')
+        f = hdfFile(filename, mode='r')
+        try:
+            objs, types = {}, {}
+            dsets = []
+            f.visititems(lambda name, obj: dsets.append(name)
+                         if hasattr(obj, 'dtype') else None)
+            for name in dsets:
+                comps = name.split('/')
+                i = cls._find_prop(comps)
+                j = i - 2 if comps[i-1] in ['labels', 'properties'] else i - 1
+                if 'propname' in f[name].attrs:
+                    prop = f[name].attrs['propname']
+                elif len(comps[i:]) == 1:
+                    prop = comps[i].replace('_', '.', 1)
+                else:
+                    prop = '.'.join(comps[i:])
+                objs.setdefault(comps[j], {})[prop] = f[name]
+                if (j > 0) and comps[j-1] in ['network', 'geometry', 'phase',
+                                              'physics']:
+                    types[comps[j]] = comps[j-1]
+            # Infer the type of any objects not categorized as such
+            nets = [k for k in objs.keys() if types.get(k) == 'network'
+                    or 'throat.conns' in objs[k].keys()]
+            for name in objs.keys():
+                hosts = [k for k in objs.keys() if 'pore.' + name in objs[k]]
+                if name in nets:
+                    types[name] = 'network'
+                elif any([k in nets for k in hosts]):
+                    types.setdefault(name, 'geometry')
+                elif len(hosts):
+                    types.setdefault(name, 'physics')
+                else:
+                    types.setdefault(name, 'phase')
+            if len(nets) != 1:
+                raise Exception('The file must contain exactly one network')
+            conns = objs[nets[0]]['throat.conns']
+            inds = {'pore': pores, 'throat': throats}
+            if (pores is not None) or (throats is not None):
+                conns = np.array(conns)
+                if pores is None:
+                    pores = np.unique(conns[throats])
+                pores = np.unique(pores)
+                if throats is None:
+                    keep = np.isin(conns, pores).all(axis=1)
+                    throats = np.where(keep)[0]
+                throats = np.unique(throats)
+                Pmap = -np.ones(len(objs[nets[0]]['pore.all']), dtype=int)
+                Pmap[pores] = np.arange(len(pores))
+                conns = Pmap[conns[throats]]
+                if np.any(conns < 0):
+                    raise Exception('The given throats are connected to pores'
+                                    + ' that are not included')
+                inds = {'pore': pores, 'throat': throats}
+            # Subdomains store their arrays in local numbering, so the
+            # requested locations are converted using their location labels
+            local = {}
+            if (pores is not None) or (throats is not None):
+                for name in objs.keys():
+                    if types[name] in ['geometry', 'physics']:
+                        local[name] = cls._local_indices(objs, name, inds)
+            # Read the data, or wrap it for later reading
+            for name, data in objs.items():
+                for prop, dset in data.items():
+                    ind = local.get(name, inds)[prop.split('.')[0]]
+                    if (prop == 'throat.conns') and (ind is not None):
+                        data[prop] = conns
+                    elif lazy:
+                        data[prop] = LazyArray(dset, index=ind)
+                    elif ind is None:
+                        data[prop] = np.array(dset)
+                    else:
+                        data[prop] = LazyArray(dset, index=ind).load()
+        finally:
+            if not lazy:  # Lazy arrays keep the file open while needed
+                f.close()
+
+        if project is None:
+            project = ws.new_project()
+        # Create all objects before adding data, since subdomains overwrite
+        # their location labels on the network when created
+        order = nets + [k for k in objs.keys() if types[k] == 'phase'] \
+            + [k for k in objs.keys() if types[k] not in ['network', 'phase']]
+        loglevel = ws.settings['loglevel']
+        ws.settings['loglevel'] = 50
+        for name in order:
+            project._new_object(objtype=types[name], name=name)
+        ws.settings['loglevel'] = loglevel
+        for name in order:
+            project[name].update(objs[name])
+        return project
+
+    @classmethod
+    def _local_indices(cls, objs, name, inds):
+        r"""
+        Returns the indices of a subdomain's own arrays which correspond to
+        the given network indices, found from its location labels
+        """
+        local = {}
+        for element, ind in inds.items():
+            label = element + '.' + name
+            hosts = [k for k in objs.keys() if (k != name) and label in objs[k]]
+            if len(hosts) == 0:
+                raise Exception(f'The locations of {name} are not in the file,'
+                                + ' so a subset of it cannot be read')
+            mask = np.array(objs[hosts[0]][label], dtype=bool)
+            local[element] = (np.cumsum(mask) - 1)[ind[mask[ind]]]
+        return local
+
 
 def print_hdf5(f, flat=False):
     r"""
@@ -125,3 +299,11 @@ def to_hdf5(network=None, phases=[], element=['pore', 'throat'],
 
 
 to_hdf5.__doc__ = HDF5.export_data.__doc__
+
+
+def from_hdf5(filename, project=None, lazy=False, pores=None, throats=None):
+    return HDF5.import_data(filename=filename, project=project, lazy=lazy,
+                            pores=pores, throats=throats)
+
+
+from_hdf5.__doc__ = HDF5.import_data.__doc__
@@ -3,11 +3,13 @@ import json
 import pickle
 import logging
 import numpy as np
+from itertools import islice
 from pathlib import Path
 from openpnm.io import GenericIO
 from openpnm.geometry import Imported
 import openpnm.models.geometry as gmods
 from openpnm.network import GenericNetwork
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +46,25 @@ class JSONGraph(GenericIO):
             return False
 
     @classmethod
+    def _sample_json(cls, json_file, n):
+        r"""
+        Returns a copy of the JSON object containing only ``n`` nodes and
+        edges, evenly spaced throughout the lists
+        """
+        sample = {k: v for k, v in json_file.items() if k != 'graph'}
+        graph = json_file.get('graph', None)
+        if isinstance(graph, dict):
+            graph = dict(graph)
+            for k in ['nodes', 'edges']:
+                items = graph.get(k, None)
+                if isinstance(items, list) and (len(items) > n):
+                    graph[k] = items[::int(np.ceil(len(items)/n))]
+        if graph is not None:
+            sample['graph'] = graph
+        return sample
+
+    @classmethod
+    @profiled('io')
     def export_data(cls, network, filename=''):
         r"""
         Write the network to disk as a JGF file.
@@ -72,46 +93,62 @@ class JSONGraph(GenericIO):
         graph_metadata_obj = {'number_of_nodes': network.Np,
                               'number_of_links': network.Nt}
 
-        # Create 'nodes' JSON object
-        nodes_obj = [
-            {
-                'id': str(ps),
-                'metadata': {
-                    'node_squared_radius': int(network['pore.diameter'][ps] / 2)**2,
-                    'node_coordinates': {
-                        'x': int(network['pore.coords'][ps, 0]),
-                        'y': int(network['pore.coords'][ps, 1]),
-                        'z': int(network['pore.coords'][ps, 2])
-                    }
-                }
-            } for ps in network.Ps]
-
-        # Create 'edges' JSON object
-        edges_obj = [
-            {
-                'id': str(ts),
-                'source': str(network['throat.conns'][ts, 0]),
-                'target': str(network['throat.conns'][ts, 1]),
-                'metadata': {
-                    'link_length': float(network['throat.length'][ts]),
-                    'link_squared_radius': float(network['throat.diameter'][ts] / 2)**2
-                }
-            } for ts in network.Ts]
-
-        # Build 'graph' JSON object from 'metadata', 'nodes' and 'edges'
-        graph_obj = {'metadata': graph_metadata_obj,
-                     'nodes': nodes_obj,
-                     'edges': edges_obj}
-
-        # Build full JSON object
-        json_obj = {'graph': graph_obj}
-
-        # Load and validate input JSON
+        # Format the values of all nodes and edges at once
+        radius = (network['pore.diameter'] / 2).astype(int)**2
+        coords = network['pore.coords'].astype(int)
+        nodes = zip(network.Ps.tolist(), radius.tolist(),
+                    *coords.T.tolist())
+        conns = network['throat.conns']
+        squared_radius = [r**2 for r in (network['throat.diameter'] / 2).tolist()]
+        edges = zip(network.Ts.tolist(), *conns.T.tolist(),
+                    cls._format_floats(network['throat.length']),
+                    cls._format_floats(squared_radius))
+
+        # Write the file one block of nodes and edges at a time, rather than
+        # building the whole JSON object in memory
+        head = json.dumps({'graph': {'metadata': graph_metadata_obj}})[:-2]
         with open(filename, 'w') as file:
-            json.dump(json_obj, file, indent=2)
+            file.write(head + ',\n"nodes": [\n')
+            cls._write_items(file, cls._node_template, nodes)
+            file.write('\n],\n"edges": [\n')
+            cls._write_items(file, cls._edge_template, edges)
+            file.write('\n]}}\n')
+
+    _node_template = ('{"id": "%d", "metadata": {"node_squared_radius": %d, '
+                      '"node_coordinates": {"x": %d, "y": %d, "z": %d}}}')
+    _edge_template = ('{"id": "%d", "source": "%d", "target": "%d", '
+                      '"metadata": {"link_length": %s, '
+                      '"link_squared_radius": %s}}')
+
+    @classmethod
+    def _format_floats(cls, arr):
+        r"""
+        Converts an array of floats to strings as written by ``json``
+        """
+        vals = [float.__repr__(x) for x in np.asarray(arr, dtype=float).tolist()]
+        if not np.all(np.isfinite(arr)):
+            names = {'nan': 'NaN', 'inf': 'Infinity', '-inf': '-Infinity'}
+            vals = [names.get(x, x) for x in vals]
+        return vals
+
+    @classmethod
+    def _write_items(cls, file, template, items, blocksize=10000):
+        r"""
+        Writes the items formatted with ``template`` as a comma separated
+        list, in blocks of ``blocksize`` items
+        """
+        items = iter(items)
+        sep = ''
+        while True:
+            block = [template % item for item in islice(items, blocksize)]
+            if len(block) == 0:
+                break
+            file.write(sep + ',\n'.join(block))
+            sep = ',\n'
 
     @classmethod
-    def import_data(cls, filename, project=None):
+    @profiled('io')
+    def import_data(cls, filename, project=None, validate=1000):
         r"""
         Loads the JGF file onto the given project.
 
@@ -126,6 +163,14 @@ class JSONGraph(GenericIO):
             If no Project object is supplied then one will be created and
             returned.
 
+        validate : bool or int
+            Controls the validation of the file against the JGF schema. If
+            ``True`` the entire file is validated, and if ``False`` it is not
+            validated at all. If an int is given, only that many nodes and
+            edges, evenly spaced throughout the file, are validated. The
+            default is 1000, which validates small files completely while
+            keeping the cost fixed for large ones.
+
         Returns
         -------
         If no project object is supplied then one will be created and returned.
@@ -137,38 +182,49 @@ class JSONGraph(GenericIO):
         # Load and validate input JSON
         with open(filename, 'r') as file:
             json_file = json.load(file)
-            if not cls._validate_json(json_file):
+        if validate is not False:
+            sample = json_file
+            if validate is not True:
+                sample = cls._sample_json(json_file, n=validate)
+            if not cls._validate_json(sample):
                 raise Exception('FIle is not in the JSON Graph Format')
 
         # Extract graph metadata from JSON
         number_of_nodes = json_file['graph']['metadata']['number_of_nodes']
         number_of_links = json_file['graph']['metadata']['number_of_links']
 
-        # Extract node properties from JSON
-        nodes = sorted(json_file['graph']['nodes'], key=lambda node: int(node['id']))
-        x = np.array([node['metadata']['node_coordinates']['x'] for node in nodes])
-        y = np.array([node['metadata']['node_coordinates']['y'] for node in nodes])
-        z = np.array([node['metadata']['node_coordinates']['z'] for node in nodes])
-
-        # Extract link properties from JSON
-        edges = sorted(json_file['graph']['edges'], key=lambda edge: int(edge['id']))
-        source = np.array([int(edge['source']) for edge in edges])
-        target = np.array([int(edge['target']) for edge in edges])
-        link_length = np.array([edge['metadata']['link_length'] for edge in edges])
-        link_squared_radius = np.array(
-            [edge['metadata']['link_squared_radius'] for edge in edges])
+        # Extract node properties from JSON, then sort them by id
+        nodes = json_file['graph']['nodes']
+        ids = np.fromiter((node['id'] for node in nodes), dtype=int,
+                          count=len(nodes))
+        coords = [node['metadata']['node_coordinates'] for node in nodes]
+        coords = np.array([(c['x'], c['y'], c['z']) for c in coords])
+        coords = coords[np.argsort(ids, kind='stable')]
+
+        # Extract link properties from JSON, then sort them by id
+        edges = json_file['graph']['edges']
+        ids = np.fromiter((edge['id'] for edge in edges), dtype=int,
+                          count=len(edges))
+        conns = np.array([(edge['source'], edge['target']) for edge in edges],
+                         dtype=int)
+        meta = [edge['metadata'] for edge in edges]
+        meta = np.array([(m['link_length'], m['link_squared_radius'])
+                         for m in meta], dtype=float)
+        order = np.argsort(ids, kind='stable')
+        conns, meta = conns[order], meta[order]
+        link_length, link_squared_radius = meta.T
 
         # Generate network object
         network = GenericNetwork(Np=number_of_nodes, Nt=number_of_links)
 
         # Define primitive throat properties
         network['throat.length'] = link_length
-        network['throat.conns'] = np.column_stack([source, target])
+        network['throat.conns'] = conns
         network['throat.diameter'] = 2.0 * np.sqrt(link_squared_radius)
 
         # Define primitive pore properties
         network['pore.index'] = np.arange(number_of_nodes)
-        network['pore.coords'] = np.column_stack([x, y, z])
+        network['pore.coords'] = coords
         network['pore.diameter'] = np.zeros(number_of_nodes)
 
         geom = Imported(network=network)
@@ -192,8 +248,9 @@ class JSONGraph(GenericIO):
         return network.project
 
 
-def from_jsongraph(filename, project=None):
-    project = JSONGraph.import_data(filename=filename, project=project)
+def from_jsongraph(filename, project=None, validate=1000):
+    project = JSONGraph.import_data(filename=filename, project=project,
+                                    validate=validate)
     return project
 
 
@@ -3,6 +3,7 @@ import scipy.io as spio
 from flatdict import FlatDict
 from openpnm.io import GenericIO, Dict
 from openpnm.utils import sanitize_dict, Workspace
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
@@ -28,6 +29,7 @@ class MAT(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network, phases=[], filename=''):
         r"""
         Write Network to a Mat file for exporting to Matlab.
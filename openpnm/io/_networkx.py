@@ -1,7 +1,9 @@
 import logging
+from itertools import chain
 import numpy as np
 from openpnm.io import GenericIO
 from openpnm.network import GenericNetwork
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +42,33 @@ class NetworkX(GenericIO):
     """
 
     @classmethod
+    def _get_attribute(cls, props, name):
+        r"""
+        Converts the values of ``name`` in a list of attribute dictionaries
+        into an array, with NaNs (or zeros) where the value is missing
+        """
+        try:
+            vals = np.array([d[name] for d in props])
+            index = None
+        except KeyError:
+            index = [i for i, d in enumerate(props) if name in d]
+            vals = np.array([props[i][name] for i in index])
+        if vals.dtype.kind in 'US':  # handle strings of arbitrary length
+            vals = vals.astype(object)
+        if index is None:
+            return vals
+        shape = (len(props), ) + vals.shape[1:]
+        if vals.dtype.kind == 'f':
+            arr = np.full(shape, np.nan, dtype=vals.dtype)
+        elif vals.dtype == object:
+            arr = np.empty(shape, dtype=object)
+        else:
+            arr = np.zeros(shape, dtype=vals.dtype)
+        arr[index] = vals
+        return arr
+
+    @classmethod
+    @profiled('io')
     def import_data(cls, G, project=None):
         r"""
         Add data to an OpenPNM Network from a undirected NetworkX graph object.
@@ -72,81 +101,57 @@ class NetworkX(GenericIO):
             raise Exception('Provided object is not a NetworkX graph.')
         if nx.is_directed(G):
             raise Exception('Provided graph is directed. Convert to undirected graph.')
-        if not all(isinstance(n, int) for n in G.nodes()):
+        if not all(isinstance(n, (int, np.integer)) for n in G.nodes()):
             raise Exception('Node numbering is not numeric. Convert to int.')
-        if min(G.nodes()) != 0:
+        nodes = np.fromiter(G.nodes(), dtype=int, count=len(G))
+        if nodes.min() != 0:
             raise Exception('Node numbering does not start at zero.')
-        if max(G.nodes()) + 1 != len(G.nodes()):
+        if nodes.max() + 1 != len(G.nodes()):
             raise Exception('Node numbering contains gaps. Map nodes to remove gaps.')
 
         # Parsing node data
         Np = len(G)
         net.update({'pore.all': np.ones((Np,), dtype=bool)})
-        for n, props in G.nodes(data=True):
-            for item in props.keys():
-                val = props[item]
-                dtype = type(val)
-                # Remove prepended pore. and pore_ if present
-                for b in ['pore.', 'pore_']:
-                    item = item.replace(b, '')
-                # Create arrays for subsequent indexing, if not present already
-                if 'pore.'+item not in net.keys():
-                    if dtype == str:  # handle strings of arbitrary length
-                        net['pore.'+item] = np.ndarray((Np,), dtype='object')
-                    elif dtype is list:
-                        dtype = type(val[0])
-                        if dtype == str:
-                            dtype = 'object'
-                        cols = len(val)
-                        net['pore.'+item] = np.ndarray((Np, cols), dtype=dtype)
-                    else:
-                        net['pore.'+item] = np.ndarray((Np,), dtype=dtype)
-                net['pore.'+item][n] = val
+        props = [None]*Np
+        for n, d in G.nodes(data=True):
+            props[n] = d
+        for name in set().union(*props):
+            # Remove prepended pore. and pore_ if present
+            item = name
+            for b in ['pore.', 'pore_']:
+                item = item.replace(b, '')
+            net['pore.'+item] = cls._get_attribute(props, name)
 
         # Parsing edge data
-        # Deal with conns explicitly
-        try:
-            conns = list(G.edges)   # NetworkX V2
-        except Exception:
-            conns = G.edges()       # NetworkX V1
-        conns.sort()
+        # Deal with conns explicitly, by sorting the nodes of each edge and
+        # then the edges themselves
+        edges = list(G.edges(data=True))
+        conns = np.fromiter(chain.from_iterable(e[:2] for e in edges),
+                            dtype=int, count=2*len(edges)).reshape(-1, 2)
+        conns.sort(axis=1)
+        order = np.lexsort((conns[:, 1], conns[:, 0]))
+        conns = conns[order]
 
         # Add conns to Network
         Nt = len(conns)
         net.update({'throat.all': np.ones(Nt, dtype=bool)})
-        net.update({'throat.conns': np.array(conns)})
-
-        # Scan through each edge and extract all its properties
-        i = 0
-        for t in conns:
-            props = G[t[0]][t[1]]
-            for item in props:
-                val = props[item]
-                dtype = type(val)
-                # Remove prepended throat. and throat_ if present
-                for b in ['throat.', 'throat_']:
-                    item = item.replace(b, '')
-                # Create arrays for subsequent indexing, if not present already
-                if 'throat.'+item not in net.keys():
-                    if dtype == str:
-                        net['throat.'+item] = np.ndarray((Nt,), dtype='object')
-                    if dtype is list:
-                        dtype = type(val[0])
-                        if dtype == str:
-                            dtype = 'object'
-                        cols = len(val)
-                        net['throat.'+item] = np.ndarray((Nt, cols),
-                                                         dtype=dtype)
-                    else:
-                        net['throat.'+item] = np.ndarray((Nt,), dtype=dtype)
-                net['throat.'+item][i] = val
-            i += 1
+        net.update({'throat.conns': conns})
+
+        # Extract all edge properties in the sorted order
+        props = [e[2] for e in edges]
+        for name in set().union(*props):
+            # Remove prepended throat. and throat_ if present
+            item = name
+            for b in ['throat.', 'throat_']:
+                item = item.replace(b, '')
+            net['throat.'+item] = cls._get_attribute(props, name)[order]
 
         network = GenericNetwork(project=project)
         network = cls._update_network(network=network, net=net)
         return network.project
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network):
         r"""
         Write OpenPNM Network to a NetworkX object.
@@ -169,24 +174,21 @@ class NetworkX(GenericIO):
         G = nx.Graph()
 
         # Extracting node list and connectivity matrix from Network
-        nodes = map(int, network.Ps)
+        nodes = range(network.Np)
         conns = network['throat.conns']
+        edges = list(zip(conns[:, 0].tolist(), conns[:, 1].tolist()))
 
         # Explicitly add nodes and connectivity matrix
         G.add_nodes_from(nodes)
-        G.add_edges_from(conns)
+        G.add_edges_from(edges)
 
         # Attach Network properties to G
         for prop in network.props(deep=True) + network.labels():
             if 'pore.' in prop:
-                if len(network[prop].shape) > 1:
-                    val = {i: list(network[prop][i]) for i in network.Ps}
-                else:
-                    val = {i: network[prop][i] for i in network.Ps}
+                val = dict(zip(nodes, network[prop].tolist()))
                 nx.set_node_attributes(G, name=prop[5:], values=val)
             if 'throat.' in prop:
-                val = {tuple(conn): network[prop][i] for i, conn
-                       in enumerate(conns)}
+                val = dict(zip(edges, network[prop].tolist()))
                 nx.set_edge_attributes(G, name=prop[7:], values=val)
 
         return G
@@ -3,6 +3,7 @@ from flatdict import FlatDict
 from collections import namedtuple
 from openpnm.io import Dict, GenericIO
 from openpnm.utils import sanitize_dict
+from openpnm.utils import profiled
 
 
 class Pandas(GenericIO):
@@ -25,6 +26,7 @@ class Pandas(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network=None, phases=[], join=False, delim=' | '):
         r"""
         Convert the Network (and optionally Phase) data to Pandas DataFrames.
@@ -4,6 +4,7 @@ import openpnm as op
 import subprocess
 from flatdict import FlatDict
 from openpnm.io import GenericIO
+from openpnm.utils import profiled
 
 
 class ParaView(GenericIO):
@@ -12,6 +13,7 @@ class ParaView(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network, filename):
         r"""
         Exports an OpenPNM network to a paraview state file.
@@ -0,0 +1,185 @@
+import json
+import logging
+import numpy as np
+from flatdict import FlatDict
+from openpnm.io import Dict, GenericIO
+from openpnm.utils import profiled
+logger = logging.getLogger(__name__)
+
+
+class Parquet(GenericIO):
+    r"""
+    Writes and reads pore and throat data as columnar Apache Parquet files
+
+    The pore and throat data are stored in separate tables, named
+    ``<filename>_pore.parquet`` and ``<filename>_throat.parquet``, with
+    one row per pore or throat and one column per property or label.
+    Unlike CSV files, vector properties such as 'pore.coords' are kept in
+    a single column of fixed-size lists, and the data types of all arrays
+    are preserved.
+
+    Notes
+    -----
+    This requires the ``pyarrow`` package.
+
+    """
+
+    @classmethod
+    def _to_table(cls, dct):
+        r"""
+        Converts a flat dictionary of arrays into an Arrow table
+        """
+        import pyarrow as pa
+        columns, fields = [], []
+        for key, arr in dct.items():
+            arr = np.asarray(arr)
+            if arr.dtype == object:
+                logger.warning(key + ' has dtype object, will not write to file')
+                continue
+            metadata = None
+            if arr.ndim > 1:
+                n = int(np.prod(arr.shape[1:]))
+                flat = np.ascontiguousarray(arr).reshape(-1)
+                col = pa.FixedSizeListArray.from_arrays(pa.array(flat), n)
+                if arr.ndim > 2:
+                    metadata = {'shape': json.dumps(arr.shape[1:])}
+            else:
+                col = pa.array(arr)
+            columns.append(col)
+            fields.append(pa.field(key, col.type, metadata=metadata))
+        return pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+    @classmethod
+    def _from_table(cls, table):
+        r"""
+        Converts an Arrow table into a dictionary of NumPy arrays, without
+        copying the data where possible
+        """
+        import pyarrow as pa
+        dct = {}
+        for field, col in zip(table.schema, table.columns):
+            col = col.chunk(0) if col.num_chunks == 1 else col.combine_chunks()
+            if pa.types.is_fixed_size_list(col.type):
+                n = col.type.list_size
+                vals = col.flatten().to_numpy(zero_copy_only=False)
+                shape = (n, )
+                if field.metadata and (b'shape' in field.metadata):
+                    shape = tuple(json.loads(field.metadata[b'shape']))
+                arr = vals.reshape((len(col), ) + shape)
+            else:
+                arr = col.to_numpy(zero_copy_only=False)
+            dct[field.name] = arr
+        return dct
+
+    @classmethod
+    @profiled('io')
+    def export_data(cls, network=None, phases=[], filename='',
+                    row_group_size=None, compression='snappy', delim=' | '):
+        r"""
+        Saves the pore and throat data on the network, and optionally on
+        any phases, to Parquet files
+
+        Parameters
+        ----------
+        network : GenericNetwork
+            The network containing the data to be stored
+        phases : list[GenericPhase]s (optional, default is none)
+            The phases whose data should be stored
+        filename : str or path object
+            The base name of the files. If not given the name of the project
+            is used.
+        row_group_size : int, optional
+            The number of rows written in each row group. Readers process
+            files one row group at a time, so smaller groups lower their
+            memory use. If not given each table is written as one group of
+            up to 1 million rows.
+        compression : str
+            The codec used to compress each column. Options include
+            'snappy' (default), 'zstd', 'gzip', 'lz4', and 'none'.
+
+        Notes
+        -----
+        The data from all Geometry and Physics objects is interleaved onto
+        the network and phases. Column names contain the object type and
+        name, such as ``'network | net_01 | pore.coords'``, so that the
+        objects can be reconstructed upon import.
+
+        """
+        import pyarrow.parquet as pq
+        project, network, phases = cls._parse_args(network=network,
+                                                   phases=phases)
+        if filename == '':
+            filename = project.name
+        fname = cls._parse_filename(filename=filename, ext='parquet')
+        for element in ['pore', 'throat']:
+            dct = Dict.to_dict(network=network, phases=phases, element=element,
+                               interleave=True, flatten=True,
+                               categorize_by=['object'])
+            table = cls._to_table(FlatDict(dct, delimiter=delim))
+            path = fname.with_name(fname.stem + '_' + element + '.parquet')
+            pq.write_table(table, path, row_group_size=row_group_size,
+                           compression=compression)
+
+    @classmethod
+    @profiled('io')
+    def import_data(cls, filename, project=None, memory_map=False,
+                    delim=' | '):
+        r"""
+        Reads the pore and throat data from Parquet files written by
+        ``export_data``
+
+        Parameters
+        ----------
+        filename : str or path object
+            The base name of the files, as given to ``export_data``
+        project : Project
+            The project to which the objects are added. If not given a new
+            project is created.
+        memory_map : bool
+            If ``True`` the files are memory-mapped rather than read, which
+            is faster for uncompressed files. The default is ``False``.
+
+        Returns
+        -------
+        project : Project
+            The project containing a network, and any phases, holding the
+            data in the files
+
+        Notes
+        -----
+        Numerical columns are converted to NumPy arrays without copying
+        when each column is stored in a single row group, so the returned
+        arrays are read-only. Assigning new arrays to the objects works as
+        usual, but arrays that are modified in place must be copied first.
+
+        """
+        import pyarrow.parquet as pq
+        fname = cls._parse_filename(filename=filename, ext='parquet')
+        dct = {}
+        for element in ['pore', 'throat']:
+            path = fname.with_name(fname.stem + '_' + element + '.parquet')
+            if path.exists():
+                table = pq.read_table(path, memory_map=memory_map)
+                dct.update(cls._from_table(table))
+        if len(dct) == 0:
+            raise OSError(f'No Parquet files found for {fname.stem}')
+        project = Dict.from_dict(dct, project=project, delim=delim)
+        return project
+
+
+def to_parquet(network=None, phases=[], filename='', row_group_size=None,
+               compression='snappy', delim=' | '):
+    Parquet.export_data(network=network, phases=phases, filename=filename,
+                        row_group_size=row_group_size,
+                        compression=compression, delim=delim)
+
+
+to_parquet.__doc__ = Parquet.export_data.__doc__
+
+
+def from_parquet(filename, project=None, memory_map=False, delim=' | '):
+    return Parquet.import_data(filename=filename, project=project,
+                               memory_map=memory_map, delim=delim)
+
+
+from_parquet.__doc__ = Parquet.import_data.__doc__
@@ -2,6 +2,7 @@ import logging
 import numpy as np
 from openpnm.io import GenericIO
 from openpnm.network import GenericNetwork
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 
 
@@ -12,6 +13,7 @@ class PerGeos(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network=None, phases=[], filename=''):
         r"""
         """
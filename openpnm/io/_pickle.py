@@ -3,6 +3,7 @@ import logging
 import pickle
 from openpnm.io import GenericIO
 from openpnm.utils import Workspace, Project
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
@@ -73,6 +74,7 @@ class Pickle(GenericIO):
         return project
 
     @classmethod
+    @profiled('io')
     def save_project(cls, project, filename=''):
         r"""
         Saves an OpenPNM Project to a file on disk
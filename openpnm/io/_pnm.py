@@ -4,8 +4,11 @@ import json_tricks as jsont
 import numpy as np
 import importlib
 from datetime import datetime
-from openpnm.utils import Workspace, Project
+from openpnm.utils import Workspace, Project, PrintableDict, LazyArray
+from openpnm.core import ParamMixin
+from openpnm.core._models import ModelWrapper
 from openpnm.io import GenericIO
+from openpnm.utils import profiled
 from h5py import File as hdfFile
 logger = logging.getLogger(__name__)
 ws = Workspace()
@@ -16,12 +19,44 @@ class PNM(GenericIO):
     This is the official way to save and load OpenPNM projects
     """
     @classmethod
-    def save_project(cls, project, filename=None):
+    @profiled('io')
+    def save_project(cls, project, filename=None, compression='gzip',
+                     compression_level=None, chunks=None):
+        r"""
+        Saves the given project to an HDF5 file with the 'pnm' extension
+
+        Parameters
+        ----------
+        project : Project
+            The project to save
+        filename : str, path or file object, optional
+            The name of the file, or an open binary file object such as
+            ``io.BytesIO``. If not given the project name is used.
+        compression : str or None
+            The codec used to compress each array. Options are 'gzip'
+            (default), 'lzf', which is faster but compresses less, or
+            ``None`` to store uncompressed data.
+        compression_level : int, optional
+            The compression level from 0 to 9 when using 'gzip', with
+            higher values giving smaller files at the cost of speed. The
+            default is 4.
+        chunks : int, optional
+            The number of pores or throats stored in each chunk. Files are
+            read one chunk at a time, so smaller chunks speed up partial
+            reads of large arrays. If not given a size is chosen by h5py
+            when compressing, otherwise arrays are stored contiguously.
+
+        """
+        if compression not in [None, 'gzip', 'lzf']:
+            raise Exception(f'Unsupported compression: {compression}')
+        if (compression_level is not None) and (compression != 'gzip'):
+            raise Exception('compression_level only applies to gzip')
         if filename is None:
             filename = project.name + '.pnm'
 
         # Make a directory using the given file name
-        f = cls._parse_filename(filename, 'pnm')
+        f = filename if hasattr(filename, 'write') \
+            else cls._parse_filename(filename, 'pnm')
         with hdfFile(f, mode='w') as root:
             # root = hdfFile(f, mode='w')
             root.attrs['version'] = ws.version
@@ -32,7 +67,9 @@ class PNM(GenericIO):
             for obj in project:
                 found_attrs = set(obj.__dict__.keys())
                 known_attrs = set(['settings', '_models_dict',
-                                   '_am', '_im',
+                                   '_am', '_im', '_csr', '_kdtree',
+                                   '_topology_version', '_lattice',
+                                   '_lattice_version',
                                    '_spacing', '_shape'])
                 foreign_attrs = found_attrs.difference(known_attrs)
                 if len(foreign_attrs) > 0:
@@ -43,9 +80,12 @@ class PNM(GenericIO):
                 item = root.create_group(obj.name)
                 for arr in obj.keys():  # Store data
                     try:
-                        item.create_dataset(name=arr, data=obj[arr],
-                                            shape=obj[arr].shape,
-                                            compression="gzip")
+                        data = obj[arr]
+                        item.create_dataset(name=arr, data=data,
+                                            shape=data.shape,
+                                            compression=compression,
+                                            compression_opts=compression_level,
+                                            chunks=cls._get_chunks(data, chunks))
                     except TypeError:  # Deal with 'object' arrays
                         logger.warning(arr + ' is being converted to a string')
                         b = jsont.dumps(obj[arr])
@@ -74,71 +114,174 @@ class PNM(GenericIO):
                 item.attrs['class'] = str(obj.__class__)
 
     @classmethod
-    def load_project(cls, filename):
-        f = cls._parse_filename(filename, 'pnm')
-        with hdfFile(f, mode='r') as root:
-            logger.info('Loading project from file ' + f.name)
-            try:  # Create an empty project with old name
-                proj = Project(name=root.attrs['name'])
-                logger.info('Loading ' + proj.name)
-            except Exception:  # Generate a new name if collision occurs
-                proj = Project()
-                logger.warning('A project named ' + root.attrs['name']
-                               + ' already exists, renaming to ' + proj.name)
-            logger.info('Created using OpenPNM version ' + root.attrs['version'])
-            logger.info('Saved on ' + root.attrs['date saved'])
-            loglevel = ws.settings['loglevel']
-            ws.settings['loglevel'] = 50
-            for name in root.keys():
-                if 'network' in root[name].attrs['class']:
-                    proj, obj = create_obj(root, name, proj)
-            for name in root.keys():
-                if 'network' not in root[name].attrs['class']:
-                    proj, obj = create_obj(root, name, proj)
-            ws.settings['loglevel'] = loglevel
+    def _get_chunks(cls, data, chunks):
+        r"""
+        Converts the number of pores or throats per chunk into the chunk
+        shape expected by h5py
+        """
+        if (chunks is None) or (data.ndim == 0) or (data.shape[0] == 0):
+            return None
+        return (min(int(chunks), data.shape[0]), ) + data.shape[1:]
+
+    @classmethod
+    def load_project(cls, filename, lazy=False, objects=None, props=None):
+        r"""
+        Loads a project from a 'pnm' file
+
+        Parameters
+        ----------
+        filename : str, path or file object
+            The name of the file to load, or an open binary file object
+        lazy : bool
+            If ``True`` the arrays are left on disk and each is only read
+            the first time it is accessed, so that large files can be
+            opened quickly and only the needed data is loaded into memory.
+            The file remains open until all arrays have been read or the
+            objects are deleted. The default is ``False``.
+        objects : list of str, optional
+            The names of the objects to load. The network is always loaded.
+            Physics objects should be accompanied by their phase.
+        props : list of str, optional
+            The names of the properties and labels to load, such as
+            ``['pore.coords', 'throat.conns', 'pore.pressure']``. Nested
+            properties can be given by their prefix, such as
+            ``'throat.conduit_lengths'``. The 'pore.all' and 'throat.all'
+            arrays, and the labels indicating the locations of the loaded
+            objects are always loaded.
+
+        Returns
+        -------
+        project : Project
+            The loaded project
+
+        """
+        contents = cls._read_project(filename, lazy=lazy, objects=objects,
+                                     props=props)
+        return cls._create_project(contents)
+
+    @classmethod
+    def _read_project(cls, filename, lazy=False, objects=None, props=None):
+        r"""
+        Reads the data and metadata of each object from the file, without
+        creating any objects, so it can be done in parallel across files
+        """
+        f = filename if hasattr(filename, 'read') \
+            else cls._parse_filename(filename, 'pnm')
+        root = hdfFile(f, mode='r')
+        try:
+            contents = {k: root.attrs[k] for k in ['name', 'version', 'date saved']}
+            nets = [k for k in root.keys() if 'network' in root[k].attrs['class']]
+            names = [k for k in root.keys() if k not in nets]
+            if objects is not None:
+                names = [k for k in names if k in objects]
+            if props is not None:
+                props = list(props) + ['pore.all', 'throat.all'] \
+                    + ['pore.' + k for k in nets + names] \
+                    + ['throat.' + k for k in nets + names]
+            contents['objects'] = [read_obj(root, name, lazy=lazy, props=props)
+                                   for name in nets + names]
+        finally:
+            if not lazy:  # Lazy arrays keep the file open while needed
+                root.close()
+        return contents
+
+    @classmethod
+    def _create_project(cls, contents):
+        r"""
+        Creates a project and its objects from the output of
+        ``_read_project``
+        """
+        try:  # Create an empty project with old name
+            proj = Project(name=contents['name'])
+            logger.info('Loading ' + proj.name)
+        except Exception:  # Generate a new name if collision occurs
+            proj = Project()
+            logger.warning('A project named ' + contents['name']
+                           + ' already exists, renaming to ' + proj.name)
+        logger.info('Created using OpenPNM version ' + contents['version'])
+        logger.info('Saved on ' + contents['date saved'])
+        loglevel = ws.settings['loglevel']
+        ws.settings['loglevel'] = 50
+        for item in contents['objects']:
+            build_obj(item, proj)
+        ws.settings['loglevel'] = loglevel
         return proj
 
 
-def create_obj(root, name, proj):
+def read_obj(root, name, lazy=False, props=None):
     r"""
-    Reproduces an OpenPNM object, given the hdf5 file and name
+    Reads the data of an OpenPNM object from the hdf5 file, optionally
+    leaving its arrays on disk or only reading the listed ``props``
+    """
+    data = {}
+    for arr in root[name].keys():
+        if (props is not None) and not any([arr == p or arr.startswith(p + '.')
+                                            for p in props]):
+            continue
+        dset = root[name][arr]
+        if lazy and not str(dset.dtype).startswith("|V"):
+            data[arr] = LazyArray(dset)
+            continue
+        a = np.array(dset)
+        if str(a.dtype).startswith("|V"):
+            logger.warning(arr + ' is being converted from string')
+            b = np.string_(a)
+            c = b.astype(str)
+            a = jsont.loads(c)
+        data[arr] = a
+    return {'name': name, 'class': root[name].attrs['class'], 'data': data,
+            'models': root[name].attrs.get('models', None)}
+
+
+def create_obj(root, name, proj, lazy=False, props=None):
+    r"""
+    Reproduces an OpenPNM object, given the hdf5 file and name, optionally
+    leaving its arrays on disk or only loading the listed ``props``
+    """
+    obj = build_obj(read_obj(root, name, lazy=lazy, props=props), proj)
+    return proj, obj
+
+
+def build_obj(item, proj):
+    r"""
+    Creates an OpenPNM object in the given project from the output of
+    ``read_obj``
     """
     import openpnm as op
     # regenerate object as same class
-    mro = root[name].attrs['class']
+    mro = item['class']
     mro = mro.split("'")[1]
     mro = mro.split('.')
     mod = importlib.import_module('.'.join(mro[:-1]))
     clss = getattr(mod, mro[-1])
     obj = clss.__new__(cls=clss)
-    obj._name = name
+    obj.settings['name'] = item['name']
+    if isinstance(obj, ParamMixin):
+        obj._params = PrintableDict()
     # Add data to obj
-    for arr in root[name].keys():
-        a = np.array(root[name][arr])
-        if str(a.dtype).startswith("|V"):
-            logger.warning(arr + ' is being converted from string')
-            b = np.string_(a)
-            c = b.astype(str)
-            a = jsont.loads(c)
-        obj.update({arr: a})
+    obj.update(item['data'])
+    # Create the topology caches, which are not saved
+    if hasattr(obj, '_invalidate_topology'):
+        obj._invalidate_topology()
     # Add settings to obj
     # obj.settings._update(json.loads(root[name].attrs['settings']))
-    # Add models to obj
+    proj.append(obj)
+    # Add models to obj, without running them
     if hasattr(obj, 'models'):
-        obj.models.update(json.loads(root[name].attrs['models']))
-        for m in obj.models.keys():
-            md, fn = obj.models[m]['model'].split('|')
+        models = json.loads(item['models'])
+        for m in models.keys():
+            md, fn = models[m]['model'].split('|')
             try:
                 md = importlib.import_module(md)
                 try:
-                    obj.models[m]['model'] = getattr(md, fn)
+                    models[m]['model'] = getattr(md, fn)
                 except AttributeError:
                     logger.warning(f"The function {fn} could not be loaded, adding"
                                    + " 'blank' instead")
-                    obj.models[m]['model'] = op.models.misc.blank
+                    models[m]['model'] = op.models.misc.blank
             except ModuleNotFoundError:
                 logger.warning(f"The module {md} could not be loaded, adding"
                                + " 'blank' instead")
-                obj.models[m]['model'] = op.models.misc.blank
-    proj.append(obj)
-    return proj, obj
+                models[m]['model'] = op.models.misc.blank
+            obj.models[m] = ModelWrapper(models[m])
+    return obj
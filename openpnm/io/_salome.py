@@ -1,6 +1,7 @@
 import logging
 import numpy as np
 from openpnm.io import GenericIO
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 
 
@@ -33,8 +34,9 @@ def pnm_2_salome(cylinder_head, cylinder_tail, cylinder_r,
     OZ = geompy.MakeVectorDXDYDZ(0, 0, 1)
     s = len(sphere_r)
     c = len(cylinder_r)
+    lengths = np.linalg.norm(cylinder_head - cylinder_tail, axis=1)
     vertex_id = 0
-    fuse_list = np.array([])
+    fuse_list = []
     for i in range(s):
         vertex_s = geompy.MakeVertex(sphere_c[i, 0], sphere_c[i, 1],
                                      sphere_c[i, 2])
@@ -43,15 +45,15 @@ def pnm_2_salome(cylinder_head, cylinder_tail, cylinder_r,
             geompy.addToStudy(vertex_s, "Vertex_{}".format(vertex_id))
             geompy.addToStudy(sphere, "Sphere_{}".format(i))
         vertex_id += 1
-        fuse_list = np.append(fuse_list, sphere)
+        fuse_list.append(sphere)
     for i in range(c):
         vertex_c1 = geompy.MakeVertex(cylinder_head[i, 0], cylinder_head[i, 1],
                                       cylinder_head[i, 2])
         vertex_c2 = geompy.MakeVertex(cylinder_tail[i, 0], cylinder_tail[i, 1],
                                       cylinder_tail[i, 2])
         line = geompy.MakeLineTwoPnt(vertex_c1, vertex_c2)
-        length = abs(np.linalg.norm(cylinder_head[i] - cylinder_tail[i]))
-        cylinder = geompy.MakeCylinder(vertex_c1, line, cylinder_r[i], length)
+        cylinder = geompy.MakeCylinder(vertex_c1, line, cylinder_r[i],
+                                       lengths[i])
         if explicit:
             geompy.addToStudy(vertex_c1, "Vertex_{}".format(vertex_id))
         vertex_id += 1
@@ -61,8 +63,8 @@ def pnm_2_salome(cylinder_head, cylinder_tail, cylinder_r,
         if explicit:
             geompy.addToStudy(line, "Line_{}".format(i))
             geompy.addToStudy(cylinder, "Cylinder_{}".format(i))
-        fuse_list = np.append(fuse_list, cylinder)
-    fuse = geompy.MakeFuseList(list(fuse_list), True, True)
+        fuse_list.append(cylinder)
+    fuse = geompy.MakeFuseList(fuse_list, True, True)
     geompy.addToStudy(fuse, 'network')
     geompy.addToStudy( O, 'O' )
     geompy.addToStudy( OX, 'OX' )
@@ -79,6 +81,18 @@ pnm_2_salome(cylinder_head, cylinder_tail, cylinder_r,
     """
 
     @classmethod
+    def _write_array(cls, file, name, x):
+        r"""
+        Writes the array ``x`` as a Python statement assigning it to ``name``
+        """
+        x = np.asarray(x, dtype=float)
+        file.write(name + ' = np.array([')
+        file.write(','.join(['%.18e']*x.size) % tuple(x.ravel().tolist()))
+        file.write('])\n')
+        file.write(name + ' = np.reshape(' + name + ', ' + str(x.shape) + ')\n')
+
+    @classmethod
+    @profiled('io')
     def export_data(cls, network, filename=None, explicit=False):
         r"""
         Saves the network data and writes a Salome .py instruction file.
@@ -98,50 +112,18 @@ pnm_2_salome(cylinder_head, cylinder_tail, cylinder_r,
         project, network, phases = cls._parse_args(network=network, phases=[])
         net = network = network[0]
 
-        # Temporarily add endpoints to network so STL class works
-        network["throat.endpoints.head"] = network.coords[network.conns[:, 0]]
-        network["throat.endpoints.tail"] = network.coords[network.conns[:, 1]]
-
         filename = network.name if filename is None else filename
         filename = cls._parse_filename(filename=filename, ext='py')
 
         f = open(filename, 'w')
         f.write(cls._header+'\n')
 
-        x = net['throat.endpoints.head']
-        s = str(x.shape)
-        f.write('cylinder_head = np.array([')
-        np.savetxt(f, X=[x.flatten()], fmt='%.18e', delimiter=',', newline='')
-        f.write('])\n')
-        f.write('cylinder_head = np.reshape(cylinder_head, '+s+')\n')
-
-        x = net['throat.endpoints.tail']
-        s = str(x.shape)
-        f.write('cylinder_tail = np.array([')
-        np.savetxt(f, X=[x.flatten()], fmt='%.18e', delimiter=',', newline='')
-        f.write('])\n')
-        f.write('cylinder_tail = np.reshape(cylinder_tail, '+s+')\n')
-
-        x = net['throat.diameter']/2
-        s = str(x.shape)
-        f.write('cylinder_r = np.array([')
-        np.savetxt(f, X=[x.flatten()], fmt='%.18e', delimiter=',', newline='')
-        f.write('])\n')
-        f.write('cylinder_r = np.reshape(cylinder_r, '+s+')\n')
-
-        x = net['pore.coords']
-        s = str(x.shape)
-        f.write('sphere_c = np.array([')
-        np.savetxt(f, X=[x.flatten()], fmt='%.18e', delimiter=',', newline='')
-        f.write('])\n')
-        f.write('sphere_c = np.reshape(sphere_c, '+s+')\n')
-
-        x = net['pore.diameter']/2
-        s = str(x.shape)
-        f.write('sphere_r = np.array([')
-        np.savetxt(f, X=[x.flatten()], fmt='%.18e', delimiter=',', newline='')
-        f.write('])\n')
-        f.write('sphere_r = np.reshape(sphere_r, '+s+')\n')
+        conns = net['throat.conns']
+        cls._write_array(f, 'cylinder_head', net['pore.coords'][conns[:, 0]])
+        cls._write_array(f, 'cylinder_tail', net['pore.coords'][conns[:, 1]])
+        cls._write_array(f, 'cylinder_r', net['throat.diameter']/2)
+        cls._write_array(f, 'sphere_c', net['pore.coords'])
+        cls._write_array(f, 'sphere_r', net['pore.diameter']/2)
 
         f.write('explicit = '+str(explicit))
 
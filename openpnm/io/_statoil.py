@@ -1,4 +1,5 @@
 import os
+import re
 import logging
 import numpy as np
 from openpnm.topotools import trim, extend
@@ -6,10 +7,11 @@ from openpnm.io import GenericIO
 from openpnm.network import GenericNetwork
 from openpnm.geometry import GenericGeometry
 import openpnm.models as mods
+from openpnm.utils import profiled
 from pathlib import Path
-from pandas import read_table, DataFrame
-from tqdm import tqdm
+from pandas import read_csv
 logger = logging.getLogger(__name__)
+_exponent = re.compile(r'e([+-])(\d\d)(?!\d)')
 
 
 class Statoil(GenericIO):
@@ -29,6 +31,7 @@ class Statoil(GenericIO):
     """
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network, shape, prefix=None, path=None, Pin=None, Pout=None):
         r"""
 
@@ -63,151 +66,217 @@ class Statoil(GenericIO):
             Pin = network.Np - 2
         if Pout is None:
             Pout = network.Np - 1
-        Ptemp = network.find_neighbor_pores(pores=Pin)
-        inlets = np.zeros_like(network.Ps, dtype=bool)
-        inlets[Ptemp] = True
-        Ptemp = network.find_neighbor_pores(pores=Pout)
-        outlets = np.zeros_like(network.Ps, dtype=bool)
-        outlets[Ptemp] = True
+        # Statoil numbering starts at 1, with -1 and 0 for the reservoirs
+        Pmap = network.Ps + 1
+        Pmap[Pin] = -1
+        Pmap[Pout] = 0
+        conns = Pmap[network['throat.conns']]
+        Ts = network.Ts + 1
 
         # Write link 1 file
-        props = ['throat.conns',
-                 'throat.diameter',
+        props = ['throat.diameter',
                  'throat.shape_factor',
                  'throat.total_length']
+        cols = [Ts, conns[:, 0], conns[:, 1]]
+        cols += [cls._get_column(network, col) for col in props]
+        cols[3] = cols[3]/2  # Convert diameter to radius
         with open(p.joinpath(prefix + '_link1.dat'), 'wt') as f:
             f.write(str(network.Nt) + '\n')
-            for row in tqdm(network.throats(), desc='Writing Link1 file'):
-                s = ''
-                s = s + '{:>9}'.format(str(row+1))
-                for col in props:
-                    try:
-                        val = network[col][row]
-                    except KeyError:
-                        val = 0.0
-                    if col == 'throat.conns':
-                        val = np.copy(val)
-                        val[val == network.Np - 1] = -1
-                        val[val == (network.Np - 2)] = -2
-                        s = s + '{:>9}'.format(str(val[0] + 1))
-                        s = s + '{:>9}'.format(str(val[1] + 1))
-                        continue
-                    if isinstance(val, float):
-                        if 'diameter' in col:  # Convert to radius
-                            val = val/2
-                        if np.isnan(val):
-                            val = 0.0
-                        val = np.format_float_scientific(val, precision=6,
-                                                         exp_digits=3,
-                                                         trim='k',
-                                                         unique=False)
-                    s = s + '{:>15}'.format(str(val))
-                s = s + '\n'  # Remove trailing tab and add a new line
-                f.write(s)
+            # Original file has 7 spaces for pore indices, but this is not
+            # enough for networks with > 10 million pores so it is bumped
+            # to 9. It is not clear if this works with the ICL binaries.
+            cls._write_rows(f, cols, 'iiifff')
 
         # Write Link 2 file
-        props = ['throat.conns',
-                 'throat.conduit_lengths.pore1',
+        props = ['throat.conduit_lengths.pore1',
                  'throat.conduit_lengths.pore2',
                  'throat.conduit_lengths.throat',
                  'throat.volume',
                  'throat.clay_volume']
+        cols = [Ts, conns[:, 0], conns[:, 1]]
+        cols += [cls._get_column(network, col) for col in props]
         with open(p.joinpath(prefix + '_link2.dat'), 'wt') as f:
-            for row in tqdm(network.throats(), desc='Writing Link2 file'):
-                s = ''
-                s = s + '{:>9}'.format(str(row+1))
-                for col in props:
-                    try:
-                        val = network[col][row]
-                    except KeyError:
-                        val = 0.0
-                    if col == 'throat.conns':
-                        val = np.copy(val)
-                        val[val == network.Np - 1] = -1
-                        val[val == (network.Np - 2)] = -2
-                        # Original file has 7 spaces for pore indices, but
-                        # this is not enough for networks with > 10 million
-                        # pores so I have bumped it to 9. I'm not sure if
-                        # this will still work with the ICL binaries.
-                        s = s + '{:>9}'.format(str(val[0] + 1))
-                        s = s + '{:>9}'.format(str(val[1] + 1))
-                        continue
-                    if isinstance(val, float):
-                        if np.isnan(val):
-                            val = 0.0
-                        val = np.format_float_scientific(val, precision=6,
-                                                         exp_digits=3,
-                                                         trim='k',
-                                                         unique=False)
-                    s = s + '{:>15}'.format(str(val))
-                s = s + '\n'  # Remove trailing tab and a new line
-                f.write(s)
+            cls._write_rows(f, cols, 'iiifffff')
 
         # Write Node 1 file
+        Ps = network.pores('reservoir', mode='not')
+        Ps = Ps[(Ps != Pin) * (Ps != Pout)]
+        # Find neighboring throats of each pore, ordered by throat index, and
+        # the pores at their other ends so that both lists correspond
+        neighbors = network.neighbors_csr(pores=Ps, element='throat')
+        rows = neighbors.rows
+        heads = network['throat.conns'][neighbors.indices].sum(axis=1) \
+            - Ps[rows]
+        counts = neighbors.counts
+        inlets = np.isin(Ps, network.find_neighbor_pores(pores=Pin))
+        outlets = np.isin(Ps, network.find_neighbor_pores(pores=Pout))
+        coords = network['pore.coords'][Ps]
+        # Format the fixed and variable parts of all rows at once
+        first = cls._format_columns([Ps + 1, coords[:, 0], coords[:, 1],
+                                     coords[:, 2], counts], 'ifffi')
+        heads = cls._format_columns([Pmap[heads]], 'i')
+        middle = cls._format_columns([inlets, outlets], 'ii')
+        throats = cls._format_columns([neighbors.indices + 1], 'i')
+        # Copy each part to its place in the file, with each row holding
+        # first, then counts[i] heads, middle, counts[i] throats and '\n'
+        length = first.shape[1] + middle.shape[1] + 1 \
+            + counts*(heads.shape[1] + throats.shape[1])
+        start = np.cumsum(length) - length
+        offset = np.arange(rows.size) - neighbors.indptr[rows]
+        text = np.full(length.sum(), ord('\n'), dtype=np.uint8)
+        loc = start + first.shape[1]
+        cls._place(text, start, first)
+        cls._place(text, loc[rows] + offset*heads.shape[1], heads)
+        loc = loc + counts*heads.shape[1]
+        cls._place(text, loc, middle)
+        loc = loc + middle.shape[1]
+        cls._place(text, loc[rows] + offset*throats.shape[1], throats)
         with open(p.joinpath(prefix + '_node1.dat'), 'wt') as f:
-            s = ''
-            s = s + str(network.num_pores('reservoir', 'not'))
-            for d in shape:
-                val = np.format_float_scientific(d, precision=6, exp_digits=3,
-                                                 trim='k', unique=False)
-                s = s + '{:>17}'.format(str(val))
-            s = s + '\n'
-            f.write(s)
-            for row in tqdm(network.pores('reservoir', mode='not'),
-                            desc='Writing Node1 file'):
-                if row in [Pin, Pout]:
-                    continue
-                s = ''
-                s = s + '{:>9}'.format(str(row+1))
-                for c in network['pore.coords'][row]:
-                    if isinstance(c, float):
-                        c = np.format_float_scientific(c, precision=6,
-                                                       exp_digits=3,
-                                                       trim='k',
-                                                       unique=False)
-                    s = s + '{:>15}'.format(str(c))
-                s = s + '{:>9}'.format(str(network.num_neighbors(row)[0]))
-                for n in network.find_neighbor_pores(row):
-                    if n == Pin:
-                        n = 0
-                    elif n == Pout:
-                        n = -1
-                    else:
-                        n = n + 1
-                    s = s + '{:>9}'.format(str(n))
-                s = s + '{:>9}'.format(str(int(inlets[row])))
-                s = s + '{:>9}'.format(str(int(outlets[row])))
-                for n in network.find_neighbor_throats(row):
-                    s = s + '{:>9}'.format(str(n + 1))
-                s = s + '\n'  # Remove trailing tab and a new line
-                f.write(s)
+            header = str(len(Ps)) + ('%16.6e'*len(shape)) % tuple(shape)
+            f.write(cls._fix_exponents(header) + '\n')
+            f.write(text.tobytes().decode('ascii'))
 
         # Write Node 2 file
         props = ['pore.volume',
                  'pore.diameter',
                  'pore.shape_factor',
                  'pore.clay_volume']
+        Ps = network.pores('reservoir', mode='not')
+        cols = [Ps + 1] + [cls._get_column(network, col)[Ps] for col in props]
+        cols[2] = cols[2]/2  # Convert diameter to radius
         with open(p.joinpath(prefix + '_node2.dat'), 'wt') as f:
-            for row in tqdm(network.pores('reservoir', mode='not'),
-                            desc='Writing Node2 file'):
-                s = ''
-                s = s + '{:>9}'.format(str(row+1))
-                for col in props:
-                    try:
-                        val = network[col][row]
-                    except KeyError:
-                        val = 0.0
-                    if isinstance(val, float):
-                        if 'diameter' in col:
-                            val = val/2
-                        val = np.format_float_scientific(val, precision=6,
-                                                         exp_digits=3,
-                                                         trim='k',
-                                                         unique=False)
-                        s = s + '{:>15}'.format(str(val))
-                s = s + '\n'  # Remove trailing tab and a new line
-                f.write(s)
+            cls._write_rows(f, cols, 'iffff')
 
+    @classmethod
+    def _get_column(cls, network, prop):
+        r"""
+        Fetches the given property as floats, with 0's in place of NaNs or
+        for missing properties
+        """
+        element = prop.split('.')[0]
+        try:
+            vals = np.array(network[prop], dtype=float)
+        except KeyError:
+            vals = np.zeros(network._count(element), dtype=float)
+        vals[np.isnan(vals)] = 0.0
+        return vals
+
+    @classmethod
+    def _fix_exponents(cls, text):
+        r"""
+        Converts the 2 digit exponents written by printf-style formatting
+        into the 3 digit exponents used in Statoil files, which also widens
+        each float by one character.
+        """
+        return _exponent.sub(r'e\g<1>0\2', text)
+
+    @classmethod
+    def _write_rows(cls, f, cols, kinds):
+        r"""
+        Writes the given columns to the open file ``f``, one row per line
+        """
+        text = cls._format_columns(cols, kinds)
+        text = np.hstack((text, np.full((text.shape[0], 1), ord('\n'),
+                                        dtype=np.uint8)))
+        f.write(text.tobytes().decode('ascii'))
+
+    @classmethod
+    def _format_columns(cls, cols, kinds):
+        r"""
+        Formats the given columns as the rows of a 2D array of characters,
+        with each kind ``'i'`` as ``'%9d'`` and ``'f'`` as ``'%14.6e'`` with
+        the 3 digit exponents of Statoil files
+
+        Notes
+        -----
+        The digits are found with array arithmetic rather than by formatting
+        each number in turn. Values whose rounding cannot be decided this
+        way, such as those within 1e-6 of a tie, are formatted by Python.
+        Floats are always 15 characters wide, while printf-style formatting
+        gives one less for exponents beyond 99.
+        """
+        blocks = []
+        for col, kind in zip(cols, kinds):
+            if kind == 'i':
+                blocks.append(cls._format_ints(np.asarray(col)))
+            else:
+                blocks.append(cls._format_floats(np.asarray(col)))
+        return np.hstack(blocks)
+
+    @classmethod
+    def _format_ints(cls, vals, width=9):
+        r"""
+        Right aligns the integers in fields of at least ``width``
+        """
+        vals = vals.astype(np.int64)
+        neg = vals < 0
+        mag = np.abs(vals)
+        powers = 10**np.arange(1, 19, dtype=np.int64)
+        ndigits = np.searchsorted(powers, mag, side='right') + 1
+        width = max(width, int((ndigits + neg).max(initial=0)))
+        out = np.full((vals.size, width), ord(' '), dtype=np.uint8)
+        for i in range(width - 1, -1, -1):
+            mag, digit = np.divmod(mag, 10)
+            hit = (width - i) <= ndigits
+            out[hit, i] = ord('0') + digit[hit]
+        out[neg, width - 1 - ndigits[neg]] = ord('-')
+        return out
+
+    @classmethod
+    def _format_floats(cls, vals):
+        r"""
+        Writes the floats with 7 significant digits and a 3 digit exponent
+        in fields of 15 characters
+        """
+        vals = vals.astype(float)
+        mag = np.abs(vals)
+        ok = np.isfinite(vals) & ((mag == 0) | ((mag > 1e-290) & (mag < 1e290)))
+        mag[~ok] = 1.0
+        exp = np.floor(np.log10(np.where(mag == 0, 1.0, mag))).astype(int)
+        # Correct the exponent where the logarithm or rounding moves the
+        # value to the next power of 10
+        for _ in range(2):
+            scaled = mag * 10.0**(6 - exp)
+            frac = scaled - np.floor(scaled)
+            ok &= np.abs(frac - 0.5) > 1e-6
+            mant = np.rint(scaled).astype(np.int64)
+            exp += (mant >= 10**7).astype(int) - (mant < 10**6)*(mag != 0)
+        ok &= (mant < 10**7) & ((mant >= 10**6) | (mag == 0))
+        out = np.full((vals.size, 15), ord(' '), dtype=np.uint8)
+        out[np.signbit(vals), 1] = ord('-')
+        for i in [9, 8, 7, 6, 5, 4, 2]:
+            mant, digit = np.divmod(mant, 10)
+            out[:, i] = ord('0') + digit
+        out[:, 3] = ord('.')
+        out[:, 10] = ord('e')
+        out[:, 11] = np.where(exp < 0, ord('-'), ord('+'))
+        exp = np.abs(exp)
+        for i in [14, 13, 12]:
+            exp, digit = np.divmod(exp, 10)
+            out[:, i] = ord('0') + digit
+        # Leave the undecided values to Python
+        for i in np.where(~ok)[0]:
+            text = cls._fix_exponents('%14.6e' % vals[i]).rjust(15)
+            out[i] = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        return out
+
+    @classmethod
+    def _place(cls, text, start, block):
+        r"""
+        Copies the rows of ``block`` into the character array ``text`` at
+        the given start positions
+        """
+        loc = start[:, None] + np.arange(block.shape[1])
+        text[loc] = block
+
+    @classmethod
+    def _read_table(cls, filename, skiprows=0, usecols=None):
+        r"""
+        Reads the whitespace delimited columns of the given file in bulk
+        """
+        table = read_csv(filename, sep=r'\s+', header=None,
+                         skiprows=skiprows, usecols=usecols)
+        return table.to_numpy()
 
     @classmethod
     def import_data(cls, path, prefix, network=None):
@@ -236,78 +305,41 @@ class Statoil(GenericIO):
         # Parse the link1 file
         path = Path(path)
         filename = Path(path.resolve(), prefix+'_link1.dat')
-        with open(filename, mode='r') as f:
-            link1 = read_table(filepath_or_buffer=f,
-                               header=None,
-                               skiprows=1,
-                               sep=' ',
-                               skipinitialspace=True,
-                               index_col=0)
-        link1.columns = ['throat.pore1', 'throat.pore2', 'throat.radius',
-                         'throat.shape_factor', 'throat.total_length']
+        link1 = cls._read_table(filename, skiprows=1)
         # Add link1 props to net
-        net['throat.conns'] = np.vstack((link1['throat.pore1']-1,
-                                         link1['throat.pore2']-1)).T
+        net['throat.conns'] = link1[:, [1, 2]].astype(int) - 1
         net['throat.conns'] = np.sort(net['throat.conns'], axis=1)
-        net['throat.radius'] = np.array(link1['throat.radius'])
-        net['throat.shape_factor'] = np.array(link1['throat.shape_factor'])
-        net['throat.total_length'] = np.array(link1['throat.total_length'])
+        net['throat.radius'] = link1[:, 3]
+        net['throat.shape_factor'] = link1[:, 4]
+        net['throat.total_length'] = link1[:, 5]
 
         filename = Path(path.resolve(), prefix+'_link2.dat')
-        with open(filename, mode='r') as f:
-            link2 = read_table(filepath_or_buffer=f,
-                               header=None,
-                               sep=' ',
-                               skipinitialspace=True,
-                               index_col=0)
-        link2.columns = ['throat.pore1', 'throat.pore2',
-                         'throat.pore1_length', 'throat.pore2_length',
-                         'throat.length', 'throat.volume',
-                         'throat.clay_volume']
+        link2 = cls._read_table(filename)
         # Add link2 props to net
-        cl_t = np.array(link2['throat.length'])
+        cl_t = link2[:, 5]
         net['throat.length'] = cl_t
         net['throat.conduit_lengths.throat'] = cl_t
-        net['throat.volume'] = np.array(link2['throat.volume'])
-        cl_p1 = np.array(link2['throat.pore1_length'])
+        net['throat.volume'] = link2[:, 6]
+        cl_p1 = link2[:, 3]
         net['throat.conduit_lengths.pore1'] = cl_p1
-        cl_p2 = np.array(link2['throat.pore2_length'])
+        cl_p2 = link2[:, 4]
         net['throat.conduit_lengths.pore2'] = cl_p2
-        net['throat.clay_volume'] = np.array(link2['throat.clay_volume'])
+        net['throat.clay_volume'] = link2[:, 7]
         # ---------------------------------------------------------------------
-        # Parse the node1 file
+        # Parse the node1 file, of which only the first columns are needed
         filename = Path(path.resolve(), prefix+'_node1.dat')
-        with open(filename, mode='r') as f:
-            row_0 = f.readline().split()
-            num_lines = int(row_0[0])
-            array = np.ndarray([num_lines, 6])
-            for i in range(num_lines):
-                row = f.readline()\
-                       .replace('\t', ' ').replace('\n', ' ').split()
-                array[i, :] = row[0:6]
-        node1 = DataFrame(array[:, [1, 2, 3, 4]])
-        node1.columns = ['pore.x_coord', 'pore.y_coord', 'pore.z_coord',
-                         'pore.coordination_number']
+        node1 = cls._read_table(filename, skiprows=1, usecols=range(5))
         # Add node1 props to net
-        net['pore.coords'] = np.vstack((node1['pore.x_coord'],
-                                        node1['pore.y_coord'],
-                                        node1['pore.z_coord'])).T
+        net['pore.coords'] = node1[:, [1, 2, 3]]
         # ---------------------------------------------------------------------
         # Parse the node2 file
         filename = Path(path.resolve(), prefix+'_node2.dat')
-        with open(filename, mode='r') as f:
-            node2 = read_table(filepath_or_buffer=f,
-                               header=None,
-                               sep=' ',
-                               skipinitialspace=True,
-                               index_col=0)
-        node2.columns = ['pore.volume', 'pore.radius', 'pore.shape_factor',
-                         'pore.clay_volume']
+        node2 = cls._read_table(filename)
         # Add node2 props to net
-        net['pore.volume'] = np.array(node2['pore.volume'])
-        net['pore.radius'] = np.array(node2['pore.radius'])
-        net['pore.shape_factor'] = np.array(node2['pore.shape_factor'])
-        net['pore.clay_volume'] = np.array(node2['pore.clay_volume'])
+        net['pore.volume'] = node2[:, 1]
+        net['pore.radius'] = node2[:, 2]
+        net['pore.shape_factor'] = node2[:, 3]
+        net['pore.clay_volume'] = node2[:, 4]
         net['throat.cross_sectional_area'] = ((net['throat.radius']**2)
                                               / (4.0*net['throat.shape_factor']))
         net['pore.area'] = ((net['pore.radius']**2)
@@ -1,6 +1,7 @@
 import logging
 import numpy as _np
 from openpnm.io import GenericIO
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 
 
@@ -9,13 +10,121 @@ class STL(GenericIO):
     The STL Format is a Standard Triangle (or Tessellation) Language supported
     by many CAD packages and used for 3D printing. Export to this format may be
     slow since a 3D closed surface mesh is built.
-    Requires installation of "netgen".
+    Requires installation of "netgen", unless the "numpy" mesher is used.
 
     """
 
     @classmethod
+    def _sphere(cls, resolution):
+        r"""
+        Returns the triangles of a unit sphere centered on the origin, as
+        an array of shape (N, 3, 3)
+        """
+        n = resolution
+        theta = _np.linspace(0, _np.pi, n//2 + 1)
+        phi = _np.linspace(0, 2*_np.pi, n + 1)
+        theta, phi = _np.meshgrid(theta, phi, indexing='ij')
+        pts = _np.stack((_np.sin(theta)*_np.cos(phi),
+                         _np.sin(theta)*_np.sin(phi),
+                         _np.cos(theta)), axis=-1)
+        a, b = pts[:-1, :-1], pts[:-1, 1:]
+        c, d = pts[1:, :-1], pts[1:, 1:]
+        # Each quad is split in two, skipping the degenerate triangles at
+        # the poles
+        tris = _np.concatenate((_np.stack((a[:-1], c[:-1], d[:-1]), axis=-2),
+                                _np.stack((a[1:], d[1:], b[1:]), axis=-2)))
+        return cls._orient(tris.reshape(-1, 3, 3), center=[0, 0, 0])
+
+    @classmethod
+    def _cylinder(cls, resolution):
+        r"""
+        Returns the triangles of a closed cylinder of unit radius, spanning
+        from 0 to 1 along the z-axis, as an array of shape (N, 3, 3)
+        """
+        phi = _np.linspace(0, 2*_np.pi, resolution + 1)
+        x, y = _np.cos(phi), _np.sin(phi)
+        z0, z1 = _np.zeros_like(phi), _np.ones_like(phi)
+        bot = _np.stack((x, y, z0), axis=-1)
+        top = _np.stack((x, y, z1), axis=-1)
+        o0 = _np.broadcast_to([0., 0., 0.], bot[:-1].shape)
+        o1 = _np.broadcast_to([0., 0., 1.], top[:-1].shape)
+        tris = _np.concatenate((_np.stack((bot[:-1], bot[1:], top[1:]), axis=1),
+                                _np.stack((bot[:-1], top[1:], top[:-1]), axis=1),
+                                _np.stack((o0, bot[1:], bot[:-1]), axis=1),
+                                _np.stack((o1, top[:-1], top[1:]), axis=1)))
+        return cls._orient(tris, center=[0, 0, 0.5])
+
+    @classmethod
+    def _orient(cls, tris, center):
+        r"""
+        Reorders the vertices of the triangles of a convex shape so that
+        their normals point outward
+        """
+        n = _np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+        flip = _np.einsum('ij,ij->i', n, tris.mean(axis=1) - center) < 0
+        tris[flip] = tris[flip][:, [0, 2, 1]]
+        return tris
+
+    @classmethod
+    def _triangles(cls, network, resolution):
+        r"""
+        Builds the triangles of all pores and throats at once, as spheres and
+        cylinders respectively
+        """
+        # Spheres are scaled and moved into place all at once
+        unit = cls._sphere(resolution)
+        r = network['pore.diameter'][:, None, None, None]/2
+        c = network['pore.coords'][:, None, None, :]
+        spheres = (unit*r + c).reshape(-1, 3, 3)
+        # Cylinders are also rotated using an orthonormal basis (u, v, w)
+        # aligned with each throat
+        unit = cls._cylinder(resolution)
+        A = network['pore.coords'][network['throat.conns'][:, 0]]
+        B = network['pore.coords'][network['throat.conns'][:, 1]]
+        L = _np.linalg.norm(B - A, axis=1)
+        w = _np.zeros_like(A)
+        w[:, 2] = 1.0
+        m = L > 0
+        w[m] = (B - A)[m]/L[m, None]
+        a = _np.zeros_like(A)
+        a[_np.abs(w[:, 0]) < 0.9, 0] = 1.0
+        a[_np.abs(w[:, 0]) >= 0.9, 1] = 1.0
+        u = _np.cross(w, a)
+        u /= _np.linalg.norm(u, axis=1)[:, None]
+        v = _np.cross(w, u)
+        r = network['throat.diameter']/2
+        R = _np.stack((u*r[:, None], v*r[:, None], w*L[:, None]), axis=1)
+        cylinders = (unit.reshape(-1, 3) @ R).reshape(len(R), -1, 3)
+        cylinders += A[:, None, :]
+        return _np.concatenate((spheres, cylinders.reshape(-1, 3, 3)))
+
+    @classmethod
+    def _write_binary(cls, filename, tris):
+        r"""
+        Writes the triangles to a binary STL file in a single buffer
+        """
+        dtype = _np.dtype([('normal', '<f4', (3, )),
+                           ('vertices', '<f4', (3, 3)),
+                           ('attribute', '<u2')])
+        data = _np.zeros(len(tris), dtype=dtype)
+        data['vertices'] = tris
+        tris = data['vertices']
+        n = data['normal']
+        n[:] = _np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+        norm = _np.sqrt(_np.einsum('ij,ij->i', n, n))
+        norm[norm == 0] = 1.0
+        n /= norm[:, None]
+        header = b'Exported by OpenPNM'.ljust(80)
+        with open(filename, 'wb') as f:
+            f.write(header)
+            f.write(_np.uint32(len(data)).tobytes())
+            f.write(memoryview(data).cast('B'))
+
+    @classmethod
+    @profiled('io')
     def export_data(cls, network, filename=None, maxsize='auto',
-                    fileformat='STL Format', logger_level=0):
+                    fileformat='STL Format', logger_level=0, mesher='netgen',
+                    resolution=16):
         r"""
         Saves (transient/steady-state) data from the given objects into the
         specified file.
@@ -38,6 +147,16 @@ class STL(GenericIO):
             formats such as Gmsh and Fluent are supported (see ngsolve.org).
         logger_level : integer between 0 and 7 (optional).
             Default is 0. The logger level set in netgen package.
+        mesher : str (optional).
+            Default is "netgen", which fuses all pores and throats into a
+            single closed surface and meshes it. If "numpy" is given, each
+            pore and throat is meshed separately as a sphere or cylinder,
+            which is much faster, and all triangles are written to a binary
+            STL file. The surfaces then overlap where pores and throats meet,
+            and ``maxsize``, ``fileformat`` and ``logger_level`` are ignored.
+        resolution : int (optional).
+            Default is 16. The number of segments around the circumference
+            of each sphere and cylinder when ``mesher`` is "numpy".
 
         Notes
         -----
@@ -46,6 +165,15 @@ class STL(GenericIO):
         Project use the ``Workspace`` object.
 
         """
+        if mesher == 'numpy':
+            project, network, phases = cls._parse_args(network=network,
+                                                       phases=[])
+            network = network[0]
+            filename = network.name if filename is None else filename
+            path = cls._parse_filename(filename=filename, ext='stl')
+            tris = cls._triangles(network, resolution=resolution)
+            cls._write_binary(path, tris)
+            return
         try:
             import netgen.csg as csg
         except ModuleNotFoundError:
@@ -120,9 +248,10 @@ class STL(GenericIO):
 
 
 def to_stl(network, filename=None, maxsize='auto', fileformat='STL Format',
-           logger_level=0):
+           logger_level=0, mesher='netgen', resolution=16):
     STL.export_data(network, filename=filename, maxsize=maxsize,
-                    fileformat=fileformat, logger_level=logger_level)
+                    fileformat=fileformat, logger_level=logger_level,
+                    mesher=mesher, resolution=resolution)
 
 
 to_stl.__doc__ = STL.export_data.__doc__
@@ -1,9 +1,12 @@
+import zlib
+import base64
 import logging
 import numpy as np
 from flatdict import FlatDict
 from xml.etree import ElementTree as ET
 from openpnm.io import GenericIO, Dict
 from openpnm.utils import Workspace
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
@@ -18,8 +21,16 @@ class VTK(GenericIO):
     Because OpenPNM data is unstructured, the actual output format is VTP,
     not VTK.
 
+    The data arrays can be written as ASCII text, which is the default, or
+    in binary form, either base64 encoded within each ``DataArray`` or as
+    raw bytes in an ``AppendedData`` section at the end of the file. The
+    binary forms are much faster to write and read, and produce smaller
+    files, especially with zlib compression.
+
     """
 
+    _BLOCK_SIZE = 2**20  # Uncompressed size of zlib blocks, in bytes
+
     _TEMPLATE = """
     <?xml version="1.0" ?>
     <VTKFile byte_order="LittleEndian" type="PolyData" version="0.1">
@@ -39,8 +50,10 @@ class VTK(GenericIO):
     """.strip()
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network, phases=[], filename="", delim=" | ",
-                    fill_nans=None, fill_infs=None):
+                    fill_nans=None, fill_infs=None, encoding="ascii",
+                    compression=None):
         r"""
         Save network and phase data to a single vtp file for visualizing in
         Paraview.
@@ -70,6 +83,22 @@ class VTK(GenericIO):
             which means that property arrays containing ``None`` will *not*
             be written to the file, and a warning will be issued.  A useful
             value is
+        encoding : str
+            How the data arrays are written. Options are:
+
+            ========== ======================================================
+            encoding   meaning
+            ========== ======================================================
+            'ascii'    (default) Values are written as text.
+            'base64'   The binary data of each array is base64 encoded and
+                       written inline.
+            'raw'      The binary data of all arrays is written unencoded in
+                       an ``AppendedData`` section at the end of the file.
+            ========== ======================================================
+
+        compression : str, optional
+            If 'zlib' the binary data are compressed. This is ignored if
+            ``encoding`` is 'ascii'.
 
         """
         project, network, phases = cls._parse_args(network=network, phases=phases)
@@ -98,17 +127,29 @@ class VTK(GenericIO):
         num_points = np.shape(points)[0]
         num_throats = np.shape(pairs)[0]
 
+        if encoding not in ["ascii", "base64", "raw"]:
+            raise Exception(f"Unrecognized encoding: {encoding}")
+        if compression not in [None, "zlib"]:
+            raise Exception(f"Unrecognized compression: {compression}")
+        fmt = {"encoding": encoding, "compression": compression,
+               "appended": []}
+
         root = ET.fromstring(VTK._TEMPLATE)
+        if encoding != "ascii":
+            root.set("header_type", "UInt64")
+            if compression == "zlib":
+                root.set("compressor", "vtkZLibDataCompressor")
         piece_node = root.find("PolyData").find("Piece")
         piece_node.set("NumberOfPoints", str(num_points))
         piece_node.set("NumberOfLines", str(num_throats))
         points_node = piece_node.find("Points")
-        coords = VTK._array_to_element("coords", points.T.ravel("F"), n=3)
+        coords = VTK._array_to_element("coords", points, n=3, **fmt)
         points_node.append(coords)
         lines_node = piece_node.find("Lines")
-        connectivity = VTK._array_to_element("connectivity", pairs)
+        connectivity = VTK._array_to_element("connectivity", pairs, **fmt)
         lines_node.append(connectivity)
-        offsets = VTK._array_to_element("offsets", 2 * np.arange(len(pairs)) + 2)
+        offsets = VTK._array_to_element("offsets",
+                                        2 * np.arange(len(pairs)) + 2, **fmt)
         lines_node.append(offsets)
 
         point_data_node = piece_node.find("PointData")
@@ -132,21 +173,26 @@ class VTK(GenericIO):
                         continue
                     else:
                         array[np.isinf(array)] = fill_infs
-                element = VTK._array_to_element(key, array)
                 if array.size == num_points:
+                    element = VTK._array_to_element(key, array, **fmt)
                     point_data_node.append(element)
                 elif array.size == num_throats:
+                    element = VTK._array_to_element(key, array, **fmt)
                     cell_data_node.append(element)
 
-        tree = ET.ElementTree(root)
-        tree.write(filename)
-
-        with open(filename, "r+") as f:
-            string = f.read()
-            string = string.replace("</DataArray>", "</DataArray>\n\t\t\t")
-            f.seek(0)
-            # consider adding header: '<?xml version="1.0"?>\n'+
-            f.write(string)
+        string = ET.tostring(root, encoding="unicode")
+        string = string.replace("</DataArray>", "</DataArray>\n\t\t\t")
+        with open(filename, "wb") as f:
+            if encoding == "raw":
+                head, tail = string.rsplit("</VTKFile>", 1)
+                f.write(head.encode())
+                f.write(b'<AppendedData encoding="raw">\n_')
+                for block in fmt["appended"]:
+                    f.write(block)
+                f.write(b"\n</AppendedData>\n</VTKFile>")
+            else:
+                # consider adding header: '<?xml version="1.0"?>\n'+
+                f.write(string.encode())
 
     @classmethod
     def import_data(cls, filename, project=None, delim=" | "):
@@ -166,25 +212,40 @@ class VTK(GenericIO):
         net = {}
 
         filename = cls._parse_filename(filename, ext="vtp")
-        tree = ET.parse(filename)
-        piece_node = tree.find("PolyData").find("Piece")
+        with open(filename, "rb") as f:
+            data = f.read()
+        # Raw appended data is not valid xml so must be split off first
+        appended = b""
+        start = data.find(b"<AppendedData")
+        if start >= 0:
+            begin = data.index(b"_", data.index(b">", start)) + 1
+            end = data.rindex(b"</AppendedData>")
+            # Each array is sliced using the byte counts in its header, so
+            # the newline written before the closing tag is left in place
+            appended = data[begin:end]
+            data = data[:start] + b"</VTKFile>"
+        root = ET.fromstring(data)
+        fmt = {"header_type": root.get("header_type", "UInt32"),
+               "compressor": root.get("compressor", None),
+               "appended": appended}
+        piece_node = root.find("PolyData").find("Piece")
 
         # Extract connectivity
         conn_element = piece_node.find("Lines").find("DataArray")
-        conns = VTK._element_to_array(conn_element, 2)
+        conns = VTK._element_to_array(conn_element, 2, **fmt)
         # Extract coordinates
         coord_element = piece_node.find("Points").find("DataArray")
-        coords = VTK._element_to_array(coord_element, 3)
+        coords = VTK._element_to_array(coord_element, 3, **fmt)
 
         # Extract pore data
         for item in piece_node.find("PointData").iter("DataArray"):
             key = item.get("Name")
-            array = VTK._element_to_array(item)
+            array = VTK._element_to_array(item, **fmt)
             net[key] = array
         # Extract throat data
         for item in piece_node.find("CellData").iter("DataArray"):
             key = item.get("Name")
-            array = VTK._element_to_array(item)
+            array = VTK._element_to_array(item, **fmt)
             net[key] = array
 
         if project is None:
@@ -203,7 +264,8 @@ class VTK(GenericIO):
         return project
 
     @classmethod
-    def _array_to_element(cls, name, array, n=1):
+    def _array_to_element(cls, name, array, n=1, encoding="ascii",
+                          compression=None, appended=None):
         dtype_map = {
             "int8": "Int8",
             "int16": "Int16",
@@ -223,15 +285,82 @@ class VTK(GenericIO):
             element.set("Name", name)
             element.set("NumberOfComponents", str(n))
             element.set("type", dtype_map[str(array.dtype)])
-            element.text = "\t".join(map(str, array.ravel()))
+            if encoding == "ascii":
+                element.text = "\t".join(map(str, array.ravel()))
+                return element
+            array = np.ascontiguousarray(array,
+                                         dtype=array.dtype.newbyteorder("<"))
+            blocks = cls._encode_binary(memoryview(array).cast("B"),
+                                        compression)
+            if encoding == "base64":
+                element.set("format", "binary")
+                if compression is None:
+                    text = base64.b64encode(b"".join(blocks))
+                else:  # Header must be encoded separately from the data
+                    text = (base64.b64encode(blocks[0])
+                            + base64.b64encode(b"".join(blocks[1:])))
+                element.text = text.decode()
+            else:
+                element.set("format", "appended")
+                element.set("offset", str(sum([len(b) for b in appended])))
+                appended.extend(blocks)
         return element
 
     @classmethod
-    def _element_to_array(cls, element, n=1):
-        string = element.text
+    def _encode_binary(cls, buffer, compression=None):
+        r"""
+        Returns a list of bytes containing the header followed by the data
+        blocks, in the layout expected by VTK for a UInt64 header_type.
+        """
+        nbytes = len(buffer)
+        if compression is None:
+            return [np.array([nbytes], dtype="<u8").tobytes(), buffer]
+        bs = cls._BLOCK_SIZE
+        blocks = [zlib.compress(buffer[i:i+bs]) for i in range(0, nbytes, bs)]
+        last = nbytes - bs*(len(blocks) - 1) if blocks else 0
+        header = [len(blocks), bs, last] + [len(b) for b in blocks]
+        return [np.array(header, dtype="<u8").tobytes()] + blocks
+
+    @classmethod
+    def _element_to_array(cls, element, n=1, header_type="UInt32",
+                          compressor=None, appended=b""):
         dtype = element.get("type")
-        array = np.fromstring(string, sep="\t")
-        array = array.astype(dtype.lower())
+        fmt = element.get("format", "ascii")
+        if fmt == "ascii":
+            string = element.text
+            array = np.fromstring(string, sep="\t")
+            array = array.astype(dtype.lower())
+        else:
+            htype = np.dtype(header_type.lower()).newbyteorder("<")
+            if fmt == "appended":
+                start = int(element.get("offset"))
+                raw = memoryview(appended)[start:]
+            else:
+                text = element.text.strip().encode()
+            if compressor is None:
+                if fmt == "binary":
+                    raw = base64.b64decode(text)
+                nbytes = int(np.frombuffer(raw, htype, count=1)[0])
+                data = raw[htype.itemsize:htype.itemsize + nbytes]
+            else:
+                if fmt == "binary":
+                    nblocks = int(np.frombuffer(base64.b64decode(text[:12]),
+                                                htype, count=1)[0])
+                    hlen = htype.itemsize*(3 + nblocks)
+                    hchars = -(-hlen // 3) * 4
+                    header = np.frombuffer(base64.b64decode(text[:hchars]),
+                                           htype)
+                    raw = base64.b64decode(text[hchars:])
+                else:
+                    nblocks = int(np.frombuffer(raw, htype, count=1)[0])
+                    header = np.frombuffer(raw, htype, count=3 + nblocks)
+                    raw = raw[htype.itemsize*(3 + nblocks):]
+                sizes = np.cumsum(np.r_[0, header[3:]]).astype(int)
+                data = b"".join([zlib.decompress(raw[sizes[i]:sizes[i+1]])
+                                 for i in range(len(sizes) - 1)])
+            dtype = np.dtype(dtype.lower())
+            array = np.frombuffer(data, dtype=dtype.newbyteorder("<"))
+            array = array.astype(dtype)
         if n != 1:
             array = array.reshape(array.size // n, n)
         return array
@@ -246,9 +375,10 @@ from_vtk.__doc__ = VTK.import_data.__doc__
 
 
 def to_vtk(network, phases=[], filename="", delim=" | ",
-           fill_nans=None, fill_infs=None):
+           fill_nans=None, fill_infs=None, encoding="ascii", compression=None):
     VTK.export_data(network=network, phases=phases, filename=filename,
-                    delim=delim, fill_nans=fill_nans, fill_infs=fill_infs)
+                    delim=delim, fill_nans=fill_nans, fill_infs=fill_infs,
+                    encoding=encoding, compression=compression)
 
 
 to_vtk.__doc__ = VTK.export_data.__doc__
@@ -1,7 +1,9 @@
 import logging
+import numpy as np
 from flatdict import FlatDict
 import xml.etree.cElementTree as ET
 from openpnm.io import Dict, GenericIO
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +21,7 @@ class XDMF(GenericIO):
                  <!DOCTYPE Xdmf SYSTEM "Xdmf.dtd" []>"""
 
     @classmethod
+    @profiled('io')
     def export_data(cls, network, phases=[], filename=''):
         r"""
         Saves (transient/steady-state) data from the given objects into
@@ -170,6 +173,284 @@ def to_xdmf(network, phases=[], filename=''):
 to_xdmf.__doc__ = XDMF.export_data.__doc__
 
 
+class XDMFTimeSeries(GenericIO):
+    r"""
+    Writes transient results to an XDMF file one time step at a time
+
+    The network topology and geometry, along with the data on the network
+    and phases, are written to ``<filename>.hdf`` once upon creation, and
+    are defined once in ``<filename>.xmf``. Each time step added afterwards
+    is appended to the same HDF5 file, and a grid which refers to the
+    static definitions is appended to the temporal collection in the
+    ``.xmf`` file, so the cost of each step does not grow with the number
+    of steps. The files are valid after every step, so a long simulation
+    can be viewed while it runs.
+
+    Parameters
+    ----------
+    network : GenericNetwork
+        The network whose topology and geometry are written
+    phases : list[GenericPhase] (optional, default is None)
+        A list of phase objects whose (static) data are to be included
+    filename : str or path object
+        The name of the files. If not given the name of the project is
+        used.
+    compression : str
+        The codec used to compress the datasets in the HDF5 file. The
+        default is 'gzip'.
+
+    Examples
+    --------
+    The ``callback`` method returns a function that can be passed to the
+    ``run`` method of transient algorithms, so that each saved time step
+    is written as soon as it is computed:
+
+    >>> import openpnm as op
+    >>> pn = op.network.Cubic(shape=[5, 5, 1])
+    >>> pn['pore.volume'] = 1.0
+    >>> air = op.phase.GenericPhase(network=pn)
+    >>> air['throat.diffusive_conductance'] = 1.0
+    >>> alg = op.algorithms.TransientFickianDiffusion(network=pn, phase=air)
+    >>> alg.set_value_BC(pores=pn.pores('left'), values=1.0)
+    >>> with op.io.XDMFTimeSeries(pn, filename='demo') as xdmf:  # doctest: +SKIP
+    ...     soln = alg.run(x0=0, tspan=[0, 10], saveat=1,
+    ...                    callback=xdmf.callback('pore.concentration'))
+
+    A solution that has already been computed can be written using
+    ``add_solution`` instead.
+
+    """
+
+    def __init__(self, network, phases=[], filename='', compression='gzip'):
+        import h5py
+        project, network, phases = self._parse_args(network=network,
+                                                    phases=phases)
+        network = network[0]
+        if filename == '':
+            filename = project.name
+        self._path = self._parse_filename(filename=filename, ext='xmf')
+        self._fname_hdf = self._path.stem + '.hdf'
+        self._compression = compression
+        self._Np, self._Nt = network.Np, network.Nt
+        self._static = []
+        self._steps = []
+        f = h5py.File(self._path.with_name(self._fname_hdf), 'w')
+        self._file = f
+        f["coordinates"] = network["pore.coords"]
+        f["connections"] = network["throat.conns"]
+        d = Dict.to_dict(network, phases=phases, interleave=True,
+                         flatten=False, categorize_by=['element', 'data'])
+        D = FlatDict(d, delimiter='/')
+        for item in D.keys():
+            if D[item].dtype == 'O':
+                logger.warning(item + ' has dtype object,'
+                               + ' will not write to file')
+            elif 'U' in str(D[item].dtype):
+                pass
+            else:
+                f.create_dataset(name='/'+item, data=D[item],
+                                 compression=compression)
+                name = item.replace('/', ' | ')
+                self._static.append((name, '/'+item, D[item].shape))
+        f.flush()
+        self._write_head()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def times(self):
+        r"""
+        The times of the steps written so far
+        """
+        return [t for t, _ in self._steps]
+
+    def add_step(self, t, data):
+        r"""
+        Appends the data for a single time step to the files
+
+        Parameters
+        ----------
+        t : float
+            The time of the step
+        data : dict
+            A dictionary of arrays, with pore or throat propnames such as
+            ``'pore.concentration'`` as keys
+
+        """
+        if self._file is None:
+            raise Exception('Cannot add steps after the files are closed')
+        i = len(self._steps)
+        items = []
+        for propname, arr in data.items():
+            arr = np.asarray(arr)
+            element = propname.split('.', 1)[0]
+            if arr.shape[0] != {'pore': self._Np, 'throat': self._Nt}[element]:
+                raise Exception(f'{propname} has the wrong length')
+            loc = '/time_series/' + propname + '/' + str(i)
+            self._file.create_dataset(name=loc, data=arr,
+                                      compression=self._compression)
+            items.append((propname, loc, arr.shape))
+        self._file.flush()
+        self._steps.append((float(t), items))
+        self._append_grid(i, float(t), items)
+
+    def add_solution(self, soln, propname=None):
+        r"""
+        Appends every time step of a transient solution to the files
+
+        Parameters
+        ----------
+        soln : TransientSolution or dict
+            The solution to write, with one column per time step. A
+            dictionary of solutions, such as that returned by the ``run``
+            method of transient algorithms, can be given instead in which
+            case the keys are used as propnames.
+        propname : str
+            The propname under which ``soln`` is written. This is required
+            if ``soln`` is a single ``TransientSolution``.
+
+        """
+        if isinstance(soln, dict):
+            solns = list(soln.values())
+            propnames = list(soln.keys())
+        else:
+            if propname is None:
+                raise Exception('propname must be given for a single solution')
+            solns, propnames = [soln], [propname]
+        t = solns[0].t
+        for i in range(len(t)):
+            self.add_step(t[i], {k: np.asarray(x[:, i])
+                                 for k, x in zip(propnames, solns)})
+
+    def callback(self, propnames):
+        r"""
+        Returns a function that writes each time step during integration
+
+        Parameters
+        ----------
+        propnames : str or list[str]
+            The propname under which the solution is written. For
+            multiphysics algorithms, whose solution combines the variables
+            of each algorithm, a list with one propname per algorithm
+            should be given in the same order.
+
+        Returns
+        -------
+        callback : callable
+            A function with the signature ``callback(t, x)`` to be passed
+            to the ``run`` method of transient algorithms
+
+        """
+        if isinstance(propnames, str):
+            propnames = [propnames]
+
+        def callback(t, x):
+            x = np.asarray(x).reshape(len(propnames), -1)
+            self.add_step(t, dict(zip(propnames, x)))
+
+        return callback
+
+    def close(self):
+        r"""
+        Closes the HDF5 file, after which no more steps can be added
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Closes the temporal collection, and is overwritten by each new grid
+    _tail = b'</Grid></Domain></Xdmf>'
+
+    def _write_head(self):
+        r"""
+        Writes the static definitions and an empty time series to the
+        ``.xmf`` file
+        """
+        hdf_loc = self._fname_hdf + ":coordinates"
+        geo_data = create_data_item(value=hdf_loc,
+                                    Dimensions=f'{self._Np} 3',
+                                    Format='HDF', DataType="Float")
+        geo = create_geometry(GeometryType="XYZ")
+        geo.append(geo_data)
+        hdf_loc = self._fname_hdf + ":connections"
+        topo_data = create_data_item(value=hdf_loc,
+                                     Dimensions=f'{self._Nt} 2',
+                                     Format="HDF", NumberType="Int")
+        topo = create_topology(TopologyType="Polyline",
+                               NodesPerElement=str(2),
+                               NumberOfElements=str(self._Nt))
+        topo.append(topo_data)
+        elements = [topo, geo]
+        for i, (name, loc, shape) in enumerate(self._static):
+            dims = ' '.join([str(i) for i in shape])
+            elements.append(create_data_item(value=self._fname_hdf + ":" + loc,
+                                             Dimensions=dims, Format='HDF',
+                                             Precision='8', DataType='Float',
+                                             Name=f'static_{i}'))
+        t_grid = create_grid(Name="TimeSeries", GridType="Collection",
+                             CollectionType="Temporal")
+        # Leave the collection open so that grids can be appended to it
+        t_grid = ET.tostring(t_grid, short_empty_elements=False)
+        t_grid = t_grid[:-len(b'</Grid>')]
+        with open(self._path, 'wb') as file:
+            file.write(XDMF._header.encode("utf-8"))
+            file.write(b'<Xdmf><Domain>')
+            for el in elements:
+                file.write(ET.tostring(el))
+            file.write(t_grid)
+            self._grids_start = file.tell()
+            # Without any steps the static data is written as time 0
+            file.write(self._grid_to_bytes(0, 0.0, []))
+            file.write(self._tail)
+
+    def _append_grid(self, i, t, items):
+        r"""
+        Adds the grid of a time step to the end of the ``.xmf`` file,
+        replacing the placeholder grid written before the first step
+        """
+        with open(self._path, 'r+b') as file:
+            if i == 0:
+                file.seek(self._grids_start)
+            else:
+                file.seek(-len(self._tail), 2)
+            file.write(self._grid_to_bytes(i, t, items))
+            file.write(self._tail)
+            file.truncate()
+
+    def _grid_to_bytes(self, i, t, items):
+        r"""
+        Returns the grid of a time step, which refers to the static
+        topology, geometry and data defined at the top of the file
+        """
+        grid = create_grid(Name=str(i), GridType="Uniform")
+        grid.append(create_time(mode='Single', Value=repr(t)))
+        for j, (name, loc, shape) in enumerate(self._static):
+            attr = ET.Element('DataItem', Reference="XML")
+            attr.text = f'/Xdmf/Domain/DataItem[@Name="static_{j}"]'
+            grid.append(self._attribute(name, attr))
+        for name, loc, shape in items:
+            dims = ' '.join([str(i) for i in shape])
+            attr = create_data_item(value=self._fname_hdf + ":" + loc,
+                                    Dimensions=dims, Format='HDF',
+                                    Precision='8', DataType='Float')
+            grid.append(self._attribute(name, attr))
+        grid.append(ET.Element('Topology', Reference='/Xdmf/Domain/Topology[1]'))
+        grid.append(ET.Element('Geometry', Reference='/Xdmf/Domain/Geometry[1]'))
+        return ET.tostring(grid)
+
+    @staticmethod
+    def _attribute(name, data_item):
+        Center = "Cell" if 'throat' in name else "Node"
+        el_attr = create_attribute(Name=name, Center=Center,
+                                   AttributeType='Scalar')
+        el_attr.append(data_item)
+        return el_attr
+
+
 def create_root(Name):
     return ET.Element(Name)
 
@@ -6,8 +6,17 @@ Collection of pore-scale models for manipulating data
 
 
 # The following bits are to initialize some boilerplate docstrings
+import inspect as _inspect
 from openpnm.utils import Docorator as _doc
-from matplotlib.docstring import Substitution as _sub
+
+
+def _sub(**params):
+    # Performs %-substitution on docstrings, like matplotlib's Substitution
+    def decorator(func):
+        if func.__doc__:
+            func.__doc__ = _inspect.cleandoc(func.__doc__) % params
+        return func
+    return decorator
 
 
 _docstr = _doc()
@@ -50,29 +50,26 @@ def from_neighbor_throats(target, prop, mode='min', ignore_nans=True):
     boss = prj.find_full_domain(target)
     data = boss[prop]
     nans = np.isnan(data)
-    im = network.create_incidence_matrix()
+    Ps = boss.pores(target.name)
+    # The neighboring throats of each pore, as a ragged array
+    neighbors = network.neighbors_csr(pores=Ps, element='throat')
     if mode == 'min':
         if ignore_nans:
-            data[nans] = np.inf
-        values = np.ones((network.Np, ))*np.inf
-        np.minimum.at(values, im.row, data[im.col])
+            data = np.where(nans, np.inf, data)
+        values = neighbors.reduce(np.minimum, data, fill=np.inf)
     if mode == 'max':
         if ignore_nans:
-            data[nans] = -np.inf
-        values = np.ones((network.Np, ))*-np.inf
-        np.maximum.at(values, im.row, data[im.col])
+            data = np.where(nans, -np.inf, data)
+        values = neighbors.reduce(np.maximum, data, fill=-np.inf)
     if mode == 'mean':
         if ignore_nans:
-            data[nans] = 0
-        values = np.zeros((network.Np, ))
-        np.add.at(values, im.row, data[im.col])
-        counts = np.zeros((network.Np, ))
-        np.add.at(counts, im.row, np.ones((network.Nt, ))[im.col])
+            data = np.where(nans, 0, data)
+        values = neighbors.reduce(np.add, data, fill=0)
+        counts = neighbors.counts
         if ignore_nans:
-            np.subtract.at(counts, im.row, nans[im.col])
+            counts = counts - neighbors.reduce(np.add, nans, fill=0)
         values = values/counts
-    Ps = boss.pores(target.name)
-    return np.array(values)[Ps]
+    return np.array(values)
 
 
 def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
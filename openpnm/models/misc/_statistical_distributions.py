@@ -1,6 +1,5 @@
 import logging
 import numpy as np
-import scipy.stats as spts
 from openpnm.utils import Docorator
 
 
@@ -63,6 +62,7 @@ def weibull(target, seeds, shape, scale, loc):
        plt.show()
 
     """
+    import scipy.stats as spts
     seeds = target[seeds]
     value = spts.weibull_min.ppf(q=seeds, c=shape, scale=scale, loc=loc)
     return value
@@ -109,6 +109,7 @@ def normal(target, seeds, mean=None, stddev=None, scale=None, loc=None):
     """
     scale = stddev if stddev is not None else scale
     loc = mean if mean is not None else loc
+    import scipy.stats as spts
     seeds = target[seeds]
     value = spts.norm.ppf(q=seeds, scale=scale, loc=loc)
     return value
@@ -135,15 +135,10 @@ def count_coincident_pores(target, thresh=1e-6):
     """
     # This needs to be a bit complicated because it cannot be assumed
     # the coincident pores are topologically connected
-    import scipy.spatial as sptl
     net = target.network
-    coords = net.coords
-    tree = sptl.KDTree(coords)
-    hits = tree.query_pairs(r=thresh)
-    arr = np.array(list(hits)).flatten()
-    v, n = np.unique(arr, return_counts=True)
-    values = np.zeros(net.Np, dtype=int)
-    values[v.astype(int)] = n
+    tree = net.get_kdtree()
+    hits = tree.query_pairs(r=thresh, output_type='ndarray')
+    values = np.bincount(hits.flatten(), minlength=net.Np)
     return values
 
 
@@ -168,18 +163,13 @@ def find_coincident_pores(target, thresh=1e-6):
     """
     # This needs to be a bit complicated because it cannot be assumed
     # the coincident pores are topologically connected
-    import scipy.spatial as sptl
     network = target.network
-    coords = network['pore.coords']
-    tree = sptl.KDTree(coords)
-    a = tree.sparse_distance_matrix(tree, max_distance=thresh,
-                                    output_type='coo_matrix')
-    a.data += 1.0
-    a.setdiag(0)
-    a.eliminate_zeros()
-    a.data -= 1.0
-    a = a.tolil()
-    return a.rows
+    hits = network.query_pores(network['pore.coords'], r=thresh)
+    hits = hits.compress(hits.indices != hits.rows)
+    values = np.empty(network.Np, dtype=object)
+    for i, row in enumerate(hits):
+        values[i] = row.tolist()
+    return values
 
 
 def bidirectional_throats(target):
@@ -75,10 +75,9 @@ def distance_to_nearest_pore(target):
     Find distance to and index of nearest pore even if not topologically
     connected
     """
-    import scipy.spatial as sptl
     net = target.network
     coords = net.coords
-    tree = sptl.KDTree(coords)
+    tree = net.get_kdtree()
     ds, ids = tree.query(coords, k=2)
     values = ds[:, 1]
     return values
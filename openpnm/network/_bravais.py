@@ -1,6 +1,7 @@
 import logging
 import numpy as np
 from openpnm import topotools
+from openpnm.topotools import generators
 from openpnm.network import GenericNetwork, Cubic
 from openpnm.utils import Workspace
 
@@ -116,74 +117,27 @@ class Bravais(GenericNetwork):
             raise Exception('Bravais lattice networks must have at least 2 '
                             'pores in all directions')
         if mode == 'bcc':
-            # Make a basic cubic for the coner pores
-            net1 = Cubic(shape=shape)
-            net1['pore.net1'] = True
-            # Create a smaller cubic for the body pores, and shift it
-            net2 = Cubic(shape=shape-1)
-            net2['pore.net2'] = True
-            net2['pore.coords'] += 0.5
-            # Stitch them together
-            topotools.stitch(net1, net2, net1.Ps, net2.Ps, len_max=0.99)
-            self.update(net1)
-            ws.close_project(net1.project)
-
+            net = generators.bcc(shape=shape - 1)
+            Nc = np.prod(shape)
+            self._set_generated(net)
             # Deal with labels
-            Ps1 = self['pore.net2']
-            self.clear(mode='labels')
-            self['pore.corner_sites'] = ~Ps1
-            self['pore.body_sites'] = Ps1
-            Ts = self.find_neighbor_throats(pores=self.pores('body_sites'),
-                                            mode='exclusive_or')
-            self['throat.corner_to_body'] = False
-            self['throat.corner_to_body'][Ts] = True
-            Ts = self.find_neighbor_throats(pores=self.pores('corner_sites'),
-                                            mode='xnor')
-            self['throat.corner_to_corner'] = False
-            self['throat.corner_to_corner'][Ts] = True
-            Ts = self.find_neighbor_throats(pores=self.pores('body_sites'),
-                                            mode='xnor')
-            self['throat.body_to_body'] = False
-            self['throat.body_to_body'][Ts] = True
+            self['pore.corner_sites'] = self.Ps < Nc
+            self['pore.body_sites'] = self.Ps >= Nc
+            body = self['throat.conns'] >= Nc
+            self['throat.corner_to_body'] = body[:, 0] != body[:, 1]
+            self['throat.corner_to_corner'] = ~np.any(body, axis=1)
+            self['throat.body_to_body'] = np.all(body, axis=1)
 
         elif mode == 'fcc':
-            shape = np.array(shape)
-            # Create base cubic network of corner sites
-            net1 = Cubic(shape=shape)
-            # Create 3 networks to become face sites
-            net2 = Cubic(shape=shape - [1, 1, 0])
-            net3 = Cubic(shape=shape - [1, 0, 1])
-            net4 = Cubic(shape=shape - [0, 1, 1])
-            net2['pore.coords'] += np.array([0.5, 0.5, 0])
-            net3['pore.coords'] += np.array([0.5, 0, 0.5])
-            net4['pore.coords'] += np.array([0, 0.5, 0.5])
-            # Remove throats from net2 (trim doesn't work when removing ALL)
-            for n in [net2, net3, net4]:
-                n.clear(element='throat', mode='all')
-                n.update({'throat.all': np.array([], dtype=bool)})
-                n.update({'throat.conns': np.ndarray([0, 2], dtype=bool)})
-            # Join networks 2, 3 and 4 into one with all face sites
-            topotools.stitch(net2, net3, net2.Ps, net3.Ps, method='radius',
-                             len_max=0.75)
-            topotools.stitch(net2, net4, net2.Ps, net4.Ps, method='radius',
-                             len_max=0.75)
-            # Join face sites network with the corner sites network
-            topotools.stitch(net1, net2, net1.Ps, net2.Ps, method='radius',
-                             len_max=0.75)
-            self.update(net1)
-            ws.close_project(net1.project)
+            net = generators.fcc(shape=shape - 1)
+            Nc = np.prod(shape)
+            self._set_generated(net)
             # Deal with labels
-            self.clear(mode='labels')
-            Ps = np.any(np.mod(self['pore.coords'], 1) == 0, axis=1)
-            self['pore.face_sites'] = Ps
-            self['pore.corner_sites'] = ~Ps
-            Ts = self.find_neighbor_throats(pores=self.pores('corner_sites'),
-                                            mode='xnor')
-            self['throat.corner_to_corner'] = False
-            self['throat.corner_to_corner'][Ts] = True
-            Ts = self.find_neighbor_throats(pores=self.pores('face_sites'))
-            self['throat.corner_to_face'] = False
-            self['throat.corner_to_face'][Ts] = True
+            self['pore.face_sites'] = self.Ps >= Nc
+            self['pore.corner_sites'] = self.Ps < Nc
+            face = np.any(self['throat.conns'] >= Nc, axis=1)
+            self['throat.corner_to_corner'] = ~face
+            self['throat.corner_to_face'] = face
 
         elif mode == 'hcp':
             raise NotImplementedError('hcp is not implemented yet')
@@ -199,6 +153,10 @@ class Bravais(GenericNetwork):
         else:
             raise Exception('Unrecognized lattice type: ' + mode)
 
+        # The lattice sites on the surface lie exactly on its bounding box
+        crds = self['pore.coords']
+        surf = (crds == crds.min(axis=0)) | (crds == crds.max(axis=0))
+        self['pore.surface'] = np.any(surf, axis=1)
         # Finally scale network to specified spacing
         topotools.label_faces(self)
         Ps = self.pores(['left', 'right', 'top', 'bottom', 'front', 'back'])
@@ -206,6 +164,18 @@ class Bravais(GenericNetwork):
         self['pore.surface'] = Ps
         self['pore.coords'] *= np.array(spacing)
 
+    def _set_generated(self, net):
+        r"""
+        Adopts the vertices and edges of a network dictionary produced by
+        one of the lattice generators
+        """
+        coords = net.pop('vert.coords')
+        conns = net.pop('edge.conns')
+        self['pore.all'] = np.ones(coords.shape[0], dtype=bool)
+        self['throat.all'] = np.ones(conns.shape[0], dtype=bool)
+        self['pore.coords'] = coords
+        self['throat.conns'] = conns
+
     def add_boundary_pores(self, labels, spacing):
         r"""
         Add boundary pores to the specified faces of the network
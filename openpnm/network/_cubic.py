@@ -1,8 +1,11 @@
+import copy
 import logging
 import numpy as np
+import scipy.sparse as sprs
+from scipy.sparse.linalg import LinearOperator
 from openpnm.network import GenericNetwork
 from openpnm import topotools
-from openpnm.utils import Docorator
+from openpnm.utils import Docorator, LazyArray
 
 docstr = Docorator()
 logger = logging.getLogger(__name__)
@@ -49,6 +52,12 @@ class Cubic(GenericNetwork):
         can specify 14 or 18, then use ``openpnm.topotools.trim`` to remove
         the face-to-face connections, which can be identified by looking
         for throats with a length equal to the network spacing.
+    lazy : bool, optional
+        If ``True`` the coordinates, connections and labels are computed
+        from the lattice indices when first accessed, rather than being
+        stored when the network is created. The default is ``False``. In
+        either case ``create_laplacian_operator`` can be used to apply the
+        Laplacian of the lattice without building 'throat.conns'.
 
     %(GenericNetwork.parameters)s
 
@@ -72,7 +81,8 @@ class Cubic(GenericNetwork):
 
     """
 
-    def __init__(self, shape, spacing=[1, 1, 1], connectivity=6, **kwargs):
+    def __init__(self, shape, spacing=[1, 1, 1], connectivity=6, lazy=False,
+                 **kwargs):
         super().__init__(**kwargs)
 
         # Take care of 1D/2D networks
@@ -80,80 +90,78 @@ class Cubic(GenericNetwork):
         shape = np.concatenate((shape, [1] * (3 - shape.size))).astype(int)
         shape = np.maximum(shape, [1, 1, 1])
 
-        arr = np.atleast_3d(np.empty(shape))
-
         spacing = np.float64(spacing)
         if spacing.size == 2:
             spacing = np.concatenate((spacing, [1]))
         spacing = np.ones(3, dtype=float) * np.array(spacing, ndmin=1)
 
-        z = np.tile(np.arange(shape[2]), shape[0] * shape[1])
-        y = np.tile(np.repeat(np.arange(shape[1]), shape[2]), shape[0])
-        x = np.repeat(np.arange(shape[0]), shape[1] * shape[2])
-        points = (np.vstack([x, y, z]).T).astype(float) + 0.5
-
-        idx = np.arange(arr.size).reshape(arr.shape)
-
-        face_joints = [(idx[:, :, :-1], idx[:, :, 1:]),
-                       (idx[:, :-1], idx[:, 1:]),
-                       (idx[:-1], idx[1:])]
-
-        corner_joints = [(idx[:-1, :-1, :-1], idx[1:, 1:, 1:]),
-                         (idx[:-1, :-1, 1:], idx[1:, 1:, :-1]),
-                         (idx[:-1, 1:, :-1], idx[1:, :-1, 1:]),
-                         (idx[1:, :-1, :-1], idx[:-1, 1:, 1:])]
-
-        edge_joints = [(idx[:, :-1, :-1], idx[:, 1:, 1:]),
-                       (idx[:, :-1, 1:], idx[:, 1:, :-1]),
-                       (idx[:-1, :, :-1], idx[1:, :, 1:]),
-                       (idx[1:, :, :-1], idx[:-1, :, 1:]),
-                       (idx[1:, 1:, :], idx[:-1, :-1, :]),
-                       (idx[1:, :-1, :], idx[:-1, 1:, :])]
-
-        if connectivity == 6:
-            joints = face_joints
-        elif connectivity == 6 + 8:
-            joints = face_joints + corner_joints
-        elif connectivity == 6 + 12:
-            joints = face_joints + edge_joints
-        elif connectivity == 12 + 8:
-            joints = edge_joints + corner_joints
-        elif connectivity == 6 + 8 + 12:
-            joints = face_joints + corner_joints + edge_joints
+        lattice = _CubicLattice(shape=shape, spacing=spacing,
+                                connectivity=connectivity)
+        idx = np.dtype(self.project.settings.index_dtype)
+        arrays = lattice.arrays(index_dtype=idx)
+        self["pore.all"] = np.ones([lattice.Np, ], dtype=bool)
+        self["throat.all"] = np.ones([lattice.Nt, ], dtype=bool)
+        if lazy:  # Computed from the lattice when first accessed
+            self.update({k: LazyArray(v) for k, v in arrays.items()})
         else:
-            raise Exception("Invalid connectivity. Must be 6, 14, 18, 20 or 26.")
+            for k, v in arrays.items():
+                self[k] = v[()]
+        self._lattice = lattice
+        self._lattice_version = self._topology_version
+
+    def create_laplacian_operator(self, weights):
+        r"""
+        Generates a matrix-free Laplacian operator for the lattice, using
+        the given throat values as weights
 
-        tails, heads = np.array([], dtype=int), np.array([], dtype=int)
-        for T, H in joints:
-            tails = np.concatenate((tails, T.flatten()))
-            heads = np.concatenate((heads, H.flatten()))
-        pairs = np.vstack([tails, heads]).T
-
-        self["pore.all"] = np.ones([points.shape[0], ], dtype=bool)
-        self["throat.all"] = np.ones([pairs.shape[0], ], dtype=bool)
-        self["pore.coords"] = points
-        self["throat.conns"] = pairs
-        self["pore.internal"] = True
-        self["throat.internal"] = True
-        self._label_surface_pores()
-        topotools.label_faces(network=self)
-        Ps = self["pore.surface"]
-        self["throat.surface"] = np.all(Ps[self["throat.conns"]], axis=1)
-        # Scale network to requested spacing
-        self["pore.coords"] *= spacing
-
-    def _label_surface_pores(self):
+        Parameters
+        ----------
+        weights : array_like
+            An Nt-long array containing the throat values, such as
+            conductances, in the same order as 'throat.conns'
+
+        Returns
+        -------
+        operator : LinearOperator
+            A ``scipy.sparse.linalg.LinearOperator`` whose action equals
+            ``scipy.sparse.csgraph.laplacian`` of the weighted adjacency
+            matrix. It also offers ``diagonal`` and ``setdiag`` so that
+            source terms can be added like for a sparse matrix.
+
+        Notes
+        -----
+        The product with a vector is computed by shifting the vector,
+        reshaped to the lattice shape, against itself once per direction
+        of the stencil, so neither 'throat.conns' nor a sparse matrix
+        is created. This requires the topology of the network to be that
+        of the original lattice, so an ``Exception`` is raised if throats or
+        pores have been added or removed since the network was created.
+
+        """
+        self._check_lattice()
+        weights = np.array(weights, dtype=float, ndmin=1)
+        if weights.size == 1:
+            weights = np.full(self.Nt, weights[0])
+        if weights.shape != (self.Nt, ):
+            raise Exception('weights must be an Nt-long array')
+        return _StencilLaplacian(lattice=self._lattice, weights=weights)
+
+    def _check_lattice(self):
         r"""
+        Ensures the topology still matches the lattice it was created from
         """
-        hits = np.zeros_like(self.Ps, dtype=bool)
-        dims = topotools.dimensionality(self)
-        mn = np.amin(self["pore.coords"], axis=0)
-        mx = np.amax(self["pore.coords"], axis=0)
-        for ax in [0, 1, 2]:
-            if dims[ax]:
-                hits += self["pore.coords"][:, ax] <= mn[ax]
-                hits += self["pore.coords"][:, ax] >= mx[ax]
-        self["pore.surface"] = hits
+        lattice = getattr(self, '_lattice', None)
+        if lattice is None:
+            raise Exception('The lattice of this network is not available')
+        self._check_topology()
+        if self._lattice_version == self._topology_version:
+            return
+        conns = dict.get(self, 'throat.conns')
+        if (self.Np != lattice.Np) or (self.Nt != lattice.Nt) or \
+                not np.array_equal(conns, lattice.arrays()['throat.conns'][()]):
+            raise Exception('The topology of this network no longer matches '
+                            'its lattice')
+        self._lattice_version = self._topology_version
 
     def add_boundary_pores(self, labels=["top", "bottom", "front",
                                          "back", "left", "right"],
@@ -214,3 +222,223 @@ class Cubic(GenericNetwork):
             except KeyError:
                 logger.warning("No pores labelled " + label
                                + " were found, skipping boundary addition")
+
+
+class _CubicLattice:
+    r"""
+    Index arithmetic for a simple cubic lattice, from which the coordinates,
+    connections and labels of ``Cubic`` can be computed for any subset of
+    pores or throats without storing them
+    """
+
+    _steps = {
+        'face': [(0, 0, 1), (0, 1, 0), (1, 0, 0)],
+        'corner': [(1, 1, 1), (1, 1, -1), (1, -1, 1), (-1, 1, 1)],
+        'edge': [(0, 1, 1), (0, 1, -1), (1, 0, 1), (-1, 0, 1), (-1, -1, 0),
+                 (-1, 1, 0)],
+    }
+    _joints = {6: ['face'], 14: ['face', 'corner'], 18: ['face', 'edge'],
+               20: ['edge', 'corner'], 26: ['face', 'corner', 'edge']}
+
+    def __init__(self, shape, spacing, connectivity):
+        if connectivity not in self._joints.keys():
+            raise Exception("Invalid connectivity. Must be 6, 14, 18, 20 or 26.")
+        self.shape = np.array(shape, dtype=int)
+        self.spacing = np.array(spacing, dtype=float)
+        self.dims = self.shape > 1
+        strides = np.array([self.shape[1]*self.shape[2], self.shape[2], 1])
+        self.steps = [np.array(d) for j in self._joints[connectivity]
+                      for d in self._steps[j]]
+        # Each step joins a block of tail pores to the pores at +step
+        self.lo = [np.maximum(0, -d) for d in self.steps]
+        self.blocks = [np.maximum(self.shape - np.abs(d), 0)
+                       for d in self.steps]
+        self.offsets = [int(d @ strides) for d in self.steps]
+        sizes = [int(np.prod(b)) for b in self.blocks]
+        self.starts = np.concatenate(([0], np.cumsum(sizes))).astype(int)
+        self.Np = int(np.prod(self.shape))
+        self.Nt = int(self.starts[-1])
+
+    def slices(self, i):
+        r"""
+        Returns the slices of the tail and head pores of block ``i``
+        """
+        lo, n, d = self.lo[i], self.blocks[i], self.steps[i]
+        tails = tuple(slice(a, a + b) for a, b in zip(lo, n))
+        heads = tuple(slice(a + s, a + s + b) for a, s, b in zip(lo, d, n))
+        return tails, heads
+
+    def ijk(self, pores):
+        r"""
+        Returns the lattice indices of the given pores
+        """
+        return np.unravel_index(pores, self.shape)
+
+    def coords(self, pores):
+        ijk = np.vstack(self.ijk(pores)).T
+        return (ijk.astype(float) + 0.5) * self.spacing
+
+    def conns(self, throats, dtype=int):
+        throats = np.asarray(throats)
+        conns = np.empty((throats.size, 2), dtype=dtype)
+        block = np.searchsorted(self.starts, throats, side='right') - 1
+        for i in np.unique(block):
+            hits = block == i
+            local = np.unravel_index(throats[hits] - self.starts[i],
+                                     self.blocks[i])
+            tails = np.ravel_multi_index(tuple(a + b for a, b in
+                                               zip(local, self.lo[i])),
+                                         self.shape)
+            # List the lower index first, as done by GenericNetwork
+            d = self.offsets[i]
+            conns[hits, 0] = tails + min(d, 0)
+            conns[hits, 1] = tails + max(d, 0)
+        return conns
+
+    def face(self, pores, axis, end):
+        ijk = self.ijk(pores)[axis]
+        return ijk == (0 if end == 0 else self.shape[axis] - 1)
+
+    def surface(self, pores):
+        hits = np.zeros(np.shape(pores), dtype=bool)
+        for ax in np.where(self.dims)[0]:
+            hits |= self.face(pores, ax, 0) | self.face(pores, ax, -1)
+        return hits
+
+    def arrays(self, index_dtype=int):
+        r"""
+        Returns a dictionary of sources for ``LazyArray``, one for each
+        of the arrays defining a ``Cubic`` network
+        """
+        P = ('pore', self.Np)
+        T = ('throat', self.Nt)
+        funcs = {
+            'pore.coords': (P, (3, ), float, self.coords),
+            'throat.conns': (T, (2, ), index_dtype,
+                             lambda Ts: self.conns(Ts, dtype=index_dtype)),
+            'pore.internal': (P, (), bool, lambda Ps: np.ones(Ps.size, bool)),
+            'throat.internal': (T, (), bool, lambda Ts: np.ones(Ts.size, bool)),
+            'pore.surface': (P, (), bool, self.surface),
+        }
+        faces = [('left', 0, 0), ('right', 0, -1), ('front', 1, 0),
+                 ('back', 1, -1), ('top', 2, -1), ('bottom', 2, 0)]
+        for label, ax, end in faces:
+            if self.dims[ax]:
+                funcs['pore.' + label] = \
+                    (P, (), bool, lambda Ps, ax=ax, end=end: self.face(Ps, ax, end))
+        funcs['throat.surface'] = \
+            (T, (), bool, lambda Ts: np.all(self.surface(self.conns(Ts)), axis=1))
+        return {k: _LatticeArray(self, n, tail, dtype, f)
+                for k, ((_, n), tail, dtype, f) in funcs.items()}
+
+
+class _LatticeArray:
+    r"""
+    An array whose values are computed from a lattice when indexed, for use
+    as the source of a ``LazyArray``
+    """
+
+    def __init__(self, lattice, length, tail, dtype, func):
+        self.lattice = lattice
+        self.shape = (length, ) + tail
+        self.dtype = np.dtype(dtype)
+        self._func = func
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple) and (len(key) == 0):
+            key = slice(None)
+        rows = np.arange(self.shape[0])[key]
+        if np.ndim(rows) == 0:
+            return self._func(np.atleast_1d(rows))[0]
+        return self._func(rows).astype(self.dtype, copy=False)
+
+
+class _StencilLaplacian(LinearOperator):
+    r"""
+    The weighted graph Laplacian of a cubic lattice, applied with a stencil
+    rather than stored as a sparse matrix
+    """
+
+    def __init__(self, lattice, weights):
+        super().__init__(dtype=float, shape=(lattice.Np, lattice.Np))
+        self._lattice = lattice
+        self._weights = weights
+        self._g = [weights[i:j].reshape(n) for i, j, n in
+                   zip(lattice.starts[:-1], lattice.starts[1:], lattice.blocks)]
+        self._slices = [lattice.slices(i) for i in range(len(self._g))]
+        self._keep = None
+        # The diagonal holds the sum of the weights of each pore's throats
+        diag = np.zeros(lattice.shape)
+        for g, (tails, heads) in zip(self._g, self._slices):
+            diag[tails] += g
+            diag[heads] += g
+        self._diag = diag.ravel()
+
+    def _matvec(self, x):
+        shape = x.shape
+        x = np.ravel(x)
+        x3 = x.reshape(self._lattice.shape)
+        if self._keep is not None:
+            x3 = x3*self._keep
+        y3 = np.zeros_like(x3, dtype=np.result_type(x3, float))
+        for g, (tails, heads) in zip(self._g, self._slices):
+            y3[tails] -= g*x3[heads]
+            y3[heads] -= g*x3[tails]
+        if self._keep is not None:
+            y3 *= self._keep
+        y = y3.ravel() + self._diag*x
+        return y.reshape(shape)
+
+    def _rmatvec(self, x):
+        return self._matvec(x)
+
+    def _adjoint(self):
+        return self
+
+    @property
+    def data(self):
+        r"""The stored coefficients, being the weights and the diagonal"""
+        return np.concatenate((self._weights, self._diag))
+
+    def diagonal(self):
+        r"""Returns a copy of the diagonal"""
+        return self._diag.copy()
+
+    def setdiag(self, values):
+        r"""Sets the diagonal to the given value(s)"""
+        self._diag = np.broadcast_to(values, (self.shape[0], )).astype(float)
+
+    def drop_connections(self, pores):
+        r"""
+        Removes the off-diagonal terms in the rows and columns of the given
+        pores, which is how fixed value boundary conditions are applied
+        """
+        keep = np.ones(self.shape[0], dtype=bool) if self._keep is None \
+            else self._keep.ravel().copy()
+        keep[pores] = False
+        self._keep = keep.reshape(self._lattice.shape)
+
+    def copy(self):
+        r"""Returns a copy which shares the weights but not the diagonal"""
+        new = copy.copy(self)
+        new._diag = self._diag.copy()
+        return new
+
+    def tocsr(self):
+        r"""Assembles the operator as a sparse matrix in CSR format"""
+        rows, cols, vals = [], [], []
+        idx = np.arange(self.shape[0]).reshape(self._lattice.shape)
+        keep = np.ones(self._lattice.shape, dtype=bool) if self._keep is None \
+            else self._keep
+        for g, (tails, heads) in zip(self._g, self._slices):
+            mask = keep[tails] & keep[heads]
+            T, H, w = idx[tails][mask], idx[heads][mask], -g[mask]
+            rows.extend([T, H])
+            cols.extend([H, T])
+            vals.extend([w, w])
+        rows.append(idx.ravel())
+        cols.append(idx.ravel())
+        vals.append(self._diag)
+        am = sprs.coo_matrix((np.concatenate(vals), (np.concatenate(rows),
+                              np.concatenate(cols))), shape=self.shape)
+        return am.tocsr()
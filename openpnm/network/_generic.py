@@ -1,11 +1,12 @@
 import logging
+import itertools
 import numpy as np
 import scipy.sparse as sprs
 import scipy.spatial as sptl
 from openpnm.core import Base, ModelsMixin, LabelMixin, ParamMixin
 from openpnm import topotools
 from openpnm.utils import Docorator, SettingsAttr
-from openpnm.utils import Workspace
+from openpnm.utils import Workspace, RaggedArray
 import openpnm.models.network as mods
 logger = logging.getLogger(__name__)
 ws = Workspace()
@@ -95,6 +96,9 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
         super().__init__(settings=self.settings, **kwargs)
         self._am = {}
         self._im = {}
+        self._csr = {}
+        self._kdtree = None
+        self._topology_version = 0
         if coords is not None:
             Np = np.shape(coords)[0]
             self['pore.all'] = np.ones(Np, dtype=bool)
@@ -120,6 +124,104 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
                     logger.debug('Converting throat.conns to be upper triangular')
                     value = np.sort(value, axis=1)
         super().__setitem__(key, value)
+        if key in ['throat.conns', 'pore.coords']:
+            self._invalidate_topology()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        if key in ['throat.conns', 'pore.coords']:
+            self._invalidate_topology()
+
+    def _invalidate_topology(self):
+        r"""
+        Increments the topology version and clears all cached matrices.
+
+        This is called whenever 'throat.conns' or 'pore.coords' is written,
+        and by ``_check_topology`` when 'throat.conns' was changed in place.
+        """
+        # Attributes may not exist yet, such as while unpickling
+        self._topology_version = getattr(self, '_topology_version', 0) + 1
+        self._am, self._im, self._csr = {}, {}, {}
+        self._kdtree = None
+
+    def _check_topology(self):
+        r"""
+        Invalidates the cached matrices if 'throat.conns' has been changed
+        in place, such as by ``pn['throat.conns'][0] = [1, 2]``, since this
+        does not go through ``__setitem__``.
+        """
+        conns = dict.get(self, 'throat.conns')
+        # Arrays still on disk or in a lattice cannot have been changed
+        if not isinstance(conns, np.ndarray):
+            return
+        cached = self._csr.get('conns')
+        # Comparing the conns is much cheaper than rebuilding the matrices
+        if (cached is not None) and np.array_equal(cached, conns):
+            return
+        if cached is not None:
+            self._invalidate_topology()
+        self._csr['conns'] = np.array(conns, copy=True)
+
+    def _get_csr_structure(self, kind='am'):
+        r"""
+        Returns the sparsity structure of the adjacency (``'am'``) or the
+        incidence (``'im'``) matrix in canonical CSR form
+
+        Returns
+        -------
+        indptr, indices : ndarray
+            The row pointers and column indices of the CSR matrix
+        order : ndarray
+            The permutation which sorts the 2*Nt matrix entries into CSR
+            order, with the entries ordered as in ``create_adjacency_matrix``
+            and ``create_incidence_matrix``, that is the heads of all
+            throats followed by their tails.
+        starts : ndarray or None
+            The position in the sorted entries at which each non-zero begins.
+            This is ``None`` unless two or more entries share a location, as
+            happens with duplicate throats, in which case their values are
+            summed.
+
+        Notes
+        -----
+        The structure is computed once per topology version, and again if
+        'throat.conns' has been changed in place, so that
+        building a weighted matrix is reduced to gathering the weights
+        into place, with no sorting or format conversion.
+
+        """
+        self._check_topology()
+        cached = self._csr.get(kind)
+        if (cached is not None) and (cached[0] == self._topology_version):
+            return cached[1:]
+        conns = self['throat.conns']
+        row = np.hstack((conns[:, 0], conns[:, 1]))
+        if kind == 'am':
+            col = np.hstack((conns[:, 1], conns[:, 0]))
+        else:
+            col = np.tile(np.arange(self.Nt), 2)
+        order = np.lexsort((col, row))
+        row, col = row[order], col[order]
+        new = np.ones(row.size, dtype=bool)
+        new[1:] = (row[1:] != row[:-1]) | (col[1:] != col[:-1])
+        starts = None if np.all(new) else np.flatnonzero(new)
+        # Use the same index type as scipy to avoid conversions later
+        idx = np.int32 if 2*self.Nt < np.iinfo(np.int32).max else np.int64
+        indptr = np.zeros(self.Np + 1, dtype=idx)
+        np.cumsum(np.bincount(row[new], minlength=self.Np), out=indptr[1:])
+        structure = (indptr, col[new].astype(idx), order, starts)
+        self._csr[kind] = (self._topology_version, ) + structure
+        return structure
+
+    def _fill_csr(self, kind, weights, shape):
+        r"""
+        Builds a CSR matrix from the cached structure and 2*Nt weights
+        """
+        indptr, indices, order, starts = self._get_csr_structure(kind=kind)
+        data = weights.take(order)
+        if starts is not None:
+            data = np.add.reduceat(data, starts)
+        return sprs.csr_matrix((data, indices, indptr), shape=shape, copy=True)
 
     def __getitem__(self, key):
         # If the key is a just a numerical value, the kick it directly back
@@ -181,6 +283,7 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
 
         """
         # Retrieve existing matrix if available
+        self._check_topology()
         if fmt in self._am.keys():
             am = self._am[fmt]
         else:
@@ -213,6 +316,7 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
         non-zero location use ``create_incidence_matrix``.
 
         """
+        self._check_topology()
         if fmt in self._im.keys():
             im = self._im[fmt]
         elif self._im.keys():
@@ -295,11 +399,22 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
             raise Exception('Received weights are of incorrect length')
         weights = np.array(weights)
 
+        # Scatter weights into the cached CSR structure when possible
+        if (fmt in ['csr', 'lil', 'dok']) and not triu:
+            if weights.shape == (self.Nt, 2):
+                weights = weights.flatten(order='F')
+            elif weights.shape == (self.Nt, ):
+                weights = np.append(weights, weights)
+            temp = self._fill_csr('am', weights, (self.Np, self.Np))
+            if drop_zeros:
+                temp.eliminate_zeros()
+            return temp if fmt == 'csr' else temp.asformat(fmt)
+
         # Append row & col to each other, and data to itself
         conn = self['throat.conns']
         row = conn[:, 0]
         col = conn[:, 1]
-        if weights.shape == (2 * self.Nt):
+        if weights.shape == (2 * self.Nt, ):
             # The flip is necessary since we want [conns.T, reverse(conns).T].T
             row = np.append(row, conn[:, 1])
             col = np.append(col, conn[:, 0])
@@ -386,6 +501,15 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
             weights = np.ones((self.Nt,), dtype=int)
         elif np.shape(weights)[0] != self.Nt:
             raise Exception('Received dataset of incorrect length')
+        weights = np.asarray(weights)
+
+        # Scatter weights into the cached CSR structure when possible
+        if fmt in ['csr', 'lil', 'dok']:
+            weights = np.append(weights, weights)
+            temp = self._fill_csr('im', weights, (self.Np, self.Nt))
+            if drop_zeros:
+                temp.eliminate_zeros()
+            return temp if fmt == 'csr' else temp.asformat(fmt)
 
         conn = self['throat.conns']
         row = conn[:, 0]
@@ -600,11 +724,9 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
         pores = self._parse_indices(pores)
         if np.size(pores) == 0:
             return np.array([], ndmin=1, dtype=int)
-        if 'lil' not in self._am.keys():
-            self.get_adjacency_matrix(fmt='lil')
+        am = self.get_adjacency_matrix(fmt='csr')
         neighbors = topotools.find_neighbor_sites(sites=pores, logic=mode,
-                                                  am=self._am['lil'],
-                                                  flatten=flatten,
+                                                  am=am, flatten=flatten,
                                                   include_input=include_input)
         if asmask is False:
             return neighbors
@@ -686,16 +808,9 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
         pores = self._parse_indices(pores)
         if np.size(pores) == 0:
             return np.array([], ndmin=1, dtype=int)
-        if flatten is False:
-            if 'lil' not in self._im.keys():
-                self.get_incidence_matrix(fmt='lil')
-            neighbors = topotools.find_neighbor_bonds(sites=pores, logic=mode,
-                                                      im=self._im['lil'],
-                                                      flatten=flatten)
-        else:
-            am = self.create_adjacency_matrix(fmt='coo', triu=True)
-            neighbors = topotools.find_neighbor_bonds(sites=pores, logic=mode,
-                                                      am=am, flatten=True)
+        im = self.get_incidence_matrix(fmt='csr')
+        neighbors = topotools.find_neighbor_bonds(sites=pores, logic=mode,
+                                                  im=im, flatten=flatten)
         if asmask is False:
             return neighbors
         elif flatten is True:
@@ -704,6 +819,61 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
         else:
             raise Exception('Cannot create mask on an unflattened output')
 
+    def neighbors_csr(self, pores=None, element='pore'):
+        r"""
+        Returns the neighboring pores or throats of each given pore as a
+        ragged array
+
+        Parameters
+        ----------
+        pores : array_like, optional
+            Indices of the pores whose neighbors are sought. If not given,
+            the neighbors of all pores are returned.
+        element : str
+            Whether to return neighboring 'pore' (default) or 'throat'
+            indices
+
+        Returns
+        -------
+        neighbors : RaggedArray
+            The neighbors of each pore, such that ``neighbors[i]`` is an
+            array of the pores (or throats) connected to ``pores[i]``,
+            sorted by index. The ``indptr`` and ``indices`` attributes hold
+            the same result in compressed sparse row form.
+
+        Notes
+        -----
+        This is a faster alternative to ``find_neighbor_pores`` and
+        ``find_neighbor_throats`` with ``flatten=False``. The result is
+        taken directly from the cached CSR adjacency or incidence matrix,
+        so the cost is proportional to the number of neighbors found, and
+        no Python objects are created for each pore.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[5, 5, 5])
+        >>> Ps = pn.neighbors_csr(pores=[0, 2])
+        >>> print(Ps[1])
+        [ 1  3  7 27]
+        >>> print(Ps.indptr)
+        [0 3 7]
+        >>> Ts = pn.neighbors_csr(pores=[0, 1], element='throat')
+        >>> print(Ts.indices)
+        [  0 100 200   0   1 101 201]
+
+        """
+        element = self._parse_element(element=element, single=True)
+        if element == 'pore':
+            m = self.get_adjacency_matrix(fmt='csr')
+        else:
+            m = self.get_incidence_matrix(fmt='csr')
+        neighbors = RaggedArray(indptr=m.indptr, indices=m.indices)
+        if pores is not None:
+            neighbors = neighbors[self._parse_indices(pores)]
+        neighbors.indices = neighbors.indices.astype(np.int64, copy=False)
+        return neighbors
+
     def _find_neighbors(self, pores, element, **kwargs):
         element = self._parse_element(element=element, single=True)
         if np.size(pores) == 0:
@@ -844,32 +1014,110 @@ class GenericNetwork(ParamMixin, Base, ModelsMixin, LabelMixin):
             return np.array([], dtype=np.int64)
         if r <= 0:
             raise Exception('Provided distances should be greater than 0')
-        # Create kdTree objects
-        kd = sptl.cKDTree(self['pore.coords'])
-        kd_pores = sptl.cKDTree(self['pore.coords'][pores])
-        # Perform search
-        Ps_within_r = kd_pores.query_ball_tree(kd, r=r)
-        # Remove self from each list
-        for i, P in enumerate(Ps_within_r):
-            Ps_within_r[i].remove(pores[i])
-        # Convert to flattened list by default
-        temp = np.concatenate((Ps_within_r))
-        Pn = np.unique(temp).astype(np.int64)
-        # Remove inputs if necessary
+        nearby = self.query_pores(self['pore.coords'][pores], r=r)
+        # Remove self from each row, and the inputs if necessary
+        keep = nearby.indices != pores[nearby.rows]
         if include_input is False:
-            Pn = Pn[~np.in1d(Pn, pores)]
-        # Convert list of lists to a list of ndarrays
-        if flatten is False:
-            if len(Pn) == 0:  # Deal with no nearby neighbors
-                Pn = [np.array([], dtype=np.int64) for i in pores]
-            else:
-                mask = np.zeros(shape=np.amax((Pn.max(), pores.max())) + 1, dtype=bool)
-                mask[Pn] = True
-                temp = []
-                for item in Ps_within_r:
-                    temp.append(np.array(item, dtype=np.int64)[mask[item]])
-                Pn = temp
-        return Pn
+            keep &= ~np.isin(nearby.indices, pores)
+        nearby = nearby.compress(keep)
+        if flatten:
+            return np.unique(nearby.indices)
+        return nearby.tolist()
+
+    def get_kdtree(self):
+        r"""
+        Returns a k-d tree of the pore coordinates for spatial queries
+
+        Notes
+        -----
+        The tree is stored for future use, and is rebuilt automatically
+        when 'pore.coords' has been changed, including in-place.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[3, 3, 3])
+        >>> tree = pn.get_kdtree()
+        >>> tree.n
+        27
+
+        """
+        coords = self['pore.coords']
+        tree = self._kdtree
+        # Comparing the coordinates is much cheaper than rebuilding the tree
+        if (tree is None) or not np.array_equal(tree.data, coords):
+            tree = sptl.cKDTree(coords, copy_data=True)
+            self._kdtree = tree
+        return tree
+
+    def query_pores(self, coords, r=None, k=None, pores=None):
+        r"""
+        Finds the pores lying near each of the given points
+
+        Parameters
+        ----------
+        coords : array_like
+            An N-by-3 array of the points to query
+        r : scalar, optional
+            The search radius. If ``k`` is not given then all pores within
+            this distance of each point are found.
+        k : int, optional
+            The number of nearest pores to find for each point. If ``r`` is
+            also given then only pores within this distance are returned,
+            so some points may have fewer than ``k`` neighbors.
+        pores : array_like, optional
+            The pores to consider in the search. If not given all pores are
+            searched using the stored k-d tree (see ``get_kdtree``),
+            otherwise a tree is built for the given pores only.
+
+        Returns
+        -------
+        nearby : RaggedArray
+            An N-long ragged array in CSR form listing the pores near each
+            point. Rows are sorted by pore index for radius searches, and by
+            distance for nearest neighbor searches.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[3, 3, 3])
+        >>> nearby = pn.query_pores([[0.5, 0.5, 0.5], [1.5, 0.5, 0.5]], r=1)
+        >>> print(nearby[0])
+        [0 1 3 9]
+        >>> print(pn.query_pores([[0.5, 0.5, 1.4]], k=2).indices)
+        [1 0]
+
+        """
+        coords = np.array(coords, dtype=float, ndmin=2)
+        if pores is not None:
+            pores = self._parse_indices(pores)
+            if np.array_equal(pores, self.Ps):
+                pores = None
+        if pores is None:
+            tree = self.get_kdtree()
+        else:
+            tree = sptl.cKDTree(self['pore.coords'][pores])
+        if k is None:
+            if r is None:
+                raise Exception('Either r or k must be given')
+            hits = tree.query_ball_point(coords, r=r, return_sorted=True)
+            counts = np.fromiter(map(len, hits), dtype=np.int64,
+                                 count=len(hits))
+            indices = np.fromiter(itertools.chain.from_iterable(hits),
+                                  dtype=np.int64, count=counts.sum())
+        else:
+            # The bound is exclusive so nudge it to match radius searches
+            r = np.inf if r is None else np.nextafter(r, np.inf)
+            hits = tree.query(coords, k=[k] if k == 1 else k,
+                              distance_upper_bound=r)[1].reshape(-1, k)
+            found = hits < tree.n
+            counts = found.sum(axis=1)
+            indices = hits[found].astype(np.int64)
+        if pores is not None:
+            indices = pores[indices]
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return RaggedArray(indptr=indptr, indices=indices)
 
     @property
     def conns(self):
@@ -35,7 +35,7 @@ class IterativeSolver(BaseSolver):
             ``norm(A*x-b)`` <= ``atol``
 
         """
-        return norm(self.b) * self.tol
+        return norm(b) * self.tol
 
     def _get_rtol(self, x0):
         r"""
@@ -1,5 +1,5 @@
-from pypardiso import spsolve
 from openpnm.solvers import DirectSolver
+from openpnm.utils import profiled
 from scipy.sparse import csr_matrix, csc_matrix
 
 __all__ = ['PardisoSpsolve']
@@ -8,8 +8,10 @@ __all__ = ['PardisoSpsolve']
 class PardisoSpsolve(DirectSolver):
     """Brief description of 'PardisoSpsolve'"""
 
+    @profiled('solver')
     def solve(self, A, b, **kwargs):
         """Brief description of 'solve'"""
+        from pypardiso import spsolve
         if not isinstance(A, (csr_matrix, csc_matrix)):
             A = A.tocsr()
         # TODO: solver.solve should return (x, info) not just x
@@ -4,6 +4,7 @@ import numpy as np
 import scipy as sp
 import scipy.sparse
 from openpnm.solvers import IterativeSolver
+from openpnm.utils import profiled
 logger = logging.getLogger(__name__)
 try:
     import petsc4py
@@ -157,6 +158,7 @@ class PETScLinearSolver(IterativeSolver):
         # Define the petsc rhs vector from the numpy one
         PETSc.Vec.setArray(self.petsc_b, self.b[self.Istart: self.Iend])
 
+    @profiled('solver')
     def solve(self, A, b, x0=None, solver_type='cg', precondioner='jacobi',
               maxiter=None, atol=None, rtol=None):
         r"""
@@ -1,15 +1,45 @@
+from inspect import signature
 from scipy.sparse import csr_matrix, csc_matrix
-from scipy.sparse.linalg import spsolve
-from openpnm.solvers import DirectSolver
+from scipy.sparse.linalg import spsolve, cg, LinearOperator
+from openpnm.solvers import DirectSolver, IterativeSolver
+from openpnm.utils import profiled
 
-__all__ = ['ScipySpsolve']
+__all__ = ['ScipySpsolve', 'ScipyCG']
 
 
 class ScipySpsolve(DirectSolver):
     """Brief description of 'ScipySpsolve'"""
 
+    @profiled('solver')
     def solve(self, A, b, **kwargs):
         """Brief description of 'solve'"""
         if not isinstance(A, (csr_matrix, csc_matrix)):
             A = A.tocsr()
         return (spsolve(A, b), 0)
+
+
+class ScipyCG(IterativeSolver):
+    r"""
+    Solves symmetric positive definite systems using the conjugate gradient
+    method of ``scipy.sparse.linalg.cg`` with a Jacobi preconditioner.
+
+    Notes
+    -----
+    Besides sparse matrices, ``A`` can be any ``LinearOperator`` that has a
+    ``diagonal`` method, such as the matrix-free operators produced by
+    ``Cubic.create_laplacian_operator``.
+
+    """
+
+    @profiled('solver')
+    def solve(self, A, b, x0=None, **kwargs):
+        """Brief description of 'solve'"""
+        d = A.diagonal()
+        M = LinearOperator(shape=A.shape, matvec=lambda x: x.ravel() / d,
+                           dtype=float)
+        # Stop on the absolute tolerance only. The relative tolerance was
+        # renamed from 'tol' to 'rtol' in scipy 1.12, and 'tol' is removed
+        # in scipy 1.14.
+        rtol = 'rtol' if 'rtol' in signature(cg).parameters else 'tol'
+        return cg(A, b, x0=x0, atol=self._get_atol(b=b), maxiter=self.maxiter,
+                  M=M, **{rtol: 0})
@@ -11,4 +11,6 @@ from ._topotools import *
 from ._perctools import *
 from ._graphtools import *
 from ._plottools import *
+from ._transaction import *
+from ._partition import *
 from . import generators
@@ -2,7 +2,7 @@ import logging
 import warnings
 import numpy as np
 import scipy.sparse as sprs
-from openpnm.utils import Workspace
+from openpnm.utils import Workspace, RaggedArray
 
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,39 @@ __all__ = [
 ]
 
 
+def _csr_rows(m):
+    r"""
+    Returns the column indices of the non-zeros in each row of a sparse
+    matrix as a ``RaggedArray``, without copying if ``m`` is already in
+    canonical CSR format
+    """
+    if m.format != 'csr':
+        m = m.tocsr()
+    if not m.has_canonical_format:
+        m = m.copy()
+        m.sum_duplicates()
+    return RaggedArray(indptr=m.indptr, indices=m.indices)
+
+
+def _apply_logic(neighbors, logic, n_sites):
+    r"""
+    Filters the combined neighbors of ``n_sites`` unique sites, where each
+    site contributes each of its neighbors once
+    """
+    if logic in ['or', 'union', 'any']:
+        return np.unique(neighbors)
+    vals, counts = np.unique(neighbors, return_counts=True)
+    if logic in ['xor', 'exclusive_or']:
+        neighbors = vals[counts == 1]
+    elif logic in ['xnor', 'nxor', 'shared']:
+        neighbors = vals[counts > 1]
+    elif logic in ['and', 'all', 'intersection']:
+        neighbors = vals[counts == n_sites]
+    else:
+        raise Exception('Specified logic is not implemented')
+    return neighbors
+
+
 def find_neighbor_sites(sites, am, flatten=True, include_input=False,
                         logic='or'):
     r"""
@@ -88,45 +121,23 @@ def find_neighbor_sites(sites, am, flatten=True, include_input=False,
     sites are considered.
 
     """
-    if am.format != 'lil':
-        am = am.tolil(copy=False)
-    sites = np.array(sites, ndmin=1)
+    sites = np.array(sites, ndmin=1, dtype=np.int64)
     if len(sites) == 0:
         return []
-    am_coo = am.tocoo()
-    n_sites = am.shape[0]
-    rows = am.rows[sites].tolist()
-    if len(rows) == 0:
-        return []
-    neighbors = am_coo.col[np.in1d(am_coo.row, sites)]
-    if logic in ['or', 'union', 'any']:
-        neighbors = np.unique(neighbors)
-    elif logic in ['xor', 'exclusive_or']:
-        neighbors = np.unique(np.where(np.bincount(neighbors) == 1)[0])
-    elif logic in ['xnor', 'nxor']:
-        neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
-    elif logic in ['and', 'all', 'intersection']:
-        neighbors = set(neighbors)
-        [neighbors.intersection_update(i) for i in rows]
-        neighbors = np.array(list(neighbors), dtype=np.int64, ndmin=1)
-    else:
-        raise Exception('Specified logic is not implemented')
+    rows = _csr_rows(am)
+    unique = np.unique(sites)
+    neighbors = _apply_logic(rows[unique].indices, logic=logic,
+                             n_sites=len(unique))
     # Deal with removing inputs or not
-    mask = np.zeros(shape=n_sites, dtype=bool)
-    mask[neighbors] = True
     if not include_input:
-        mask[sites] = False
+        neighbors = neighbors[~np.isin(neighbors, sites)]
     # Finally flatten or not
     if flatten:
-        neighbors = np.where(mask)[0]
+        neighbors = neighbors.astype(np.int64)
     else:
-        if neighbors.size > 0:
-            for i in range(len(rows)):
-                vals = np.array(rows[i], dtype=np.int64)
-                rows[i] = vals[mask[vals]]
-            neighbors = rows
-        else:
-            neighbors = [np.array([], dtype=int) for i in range(len(sites))]
+        rows = rows[sites]
+        rows = rows.compress(np.isin(rows.indices, neighbors))
+        neighbors = [vals.astype(np.int64) for vals in rows.tolist()]
     return neighbors
 
 
@@ -197,35 +208,19 @@ def find_neighbor_bonds(sites, im=None, am=None, flatten=True, logic='or'):
 
     """
     if im is not None:
-        if im.format != 'lil':
-            im = im.tolil(copy=False)
-        rows = [im.rows[i] for i in np.array(sites, ndmin=1, dtype=np.int64)]
-        if len(rows) == 0:
+        sites = np.array(sites, ndmin=1, dtype=np.int64)
+        if len(sites) == 0:
             return []
-        neighbors = np.hstack(rows).astype(np.int64)
-        n_bonds = int(im.nnz / 2)
-        if logic in ['or', 'union', 'any']:
-            neighbors = np.unique(neighbors)
-        elif logic in ['xor', 'exclusive_or']:
-            neighbors = np.unique(np.where(np.bincount(neighbors) == 1)[0])
-        elif logic in ['xnor', 'shared']:
-            neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
-        elif logic in ['and', 'all', 'intersection']:
-            neighbors = set(neighbors)
-            [neighbors.intersection_update(i) for i in rows]
-            neighbors = np.array(list(neighbors), dtype=int, ndmin=1)
+        rows = _csr_rows(im)
+        unique = np.unique(sites)
+        neighbors = _apply_logic(rows[unique].indices, logic=logic,
+                                 n_sites=len(unique))
+        if flatten:
+            neighbors = neighbors.astype(np.int64)
         else:
-            raise Exception('Specified logic is not implemented')
-        if (flatten is False):
-            if (neighbors.size > 0):
-                mask = np.zeros(shape=n_bonds, dtype=bool)
-                mask[neighbors] = True
-                for i in range(len(rows)):
-                    vals = np.array(rows[i], dtype=np.int64)
-                    rows[i] = vals[mask[vals]]
-                neighbors = rows
-            else:
-                neighbors = [np.array([], dtype=np.int64) for i in range(len(sites))]
+            rows = rows[sites]
+            rows = rows.compress(np.isin(rows.indices, neighbors))
+            neighbors = [vals.astype(np.int64) for vals in rows.tolist()]
         return neighbors
     elif am is not None:
         if am.format != 'coo':
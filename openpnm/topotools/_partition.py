@@ -0,0 +1,196 @@
+import logging
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+__all__ = [
+    'partition',
+]
+
+
+def partition(network, parts=2, weights=None, refine=True, tol=0.03,
+              max_iter=20, geometries=False):
+    r"""
+    Splits the network into partitions of about equal size, with as few
+    throats as possible between them
+
+    Parameters
+    ----------
+    network : GenericNetwork
+        The network to be partitioned
+    parts : int
+        The number of partitions, which need not be a power of 2
+    weights : array_like, optional
+        The computational load of each pore, such as its number of
+        neighbors. Partitions are balanced by the sum of the weights of
+        their pores. If not given all pores have a weight of 1.
+    refine : bool
+        If ``True`` (default) the boundaries between partitions are moved
+        to reduce the number of throats cut, as described in the Notes
+    tol : float
+        The fraction by which the weight of a partition may exceed the
+        mean during the refinement. The default is 0.03.
+    max_iter : int
+        The maximum number of refinement passes. The default is 20.
+    geometries : bool
+        If ``True`` a ``GenericGeometry`` is created for each partition,
+        with each throat assigned to the partition of the first pore in
+        its 'throat.conns' row. This fails if the network already has
+        geometries. The default is ``False``.
+
+    Returns
+    -------
+    labels : ndarray
+        The partition to which each pore belongs, numbered from 0
+    throats : ndarray
+        The indices of the throats connecting pores in different partitions
+
+    Notes
+    -----
+    The initial partitions are found by recursive coordinate bisection:
+    the pores are split at the weighted median of the coordinate along
+    which they are most spread out, with the two halves receiving numbers
+    of partitions proportional to their weights, and the process is
+    repeated on each half. This is fast and gives compact partitions, but
+    takes no account of the throats.
+
+    The refinement then repeatedly moves pores on the boundaries into the
+    neighboring partition with which they share the most throats,
+    provided this reduces the number of throats cut and keeps the weights
+    within ``tol`` of the mean. Moves of neighboring pores that could
+    cancel out are resolved in favor of the larger gain, so the number of
+    throats cut never increases. All steps are vectorized over the pores,
+    so the run time grows linearly with the size of the network.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import openpnm as op
+    >>> pn = op.network.Cubic(shape=[12, 12, 12])
+    >>> labels, Ts = op.topotools.partition(network=pn, parts=4)
+    >>> np.bincount(labels)
+    array([432, 432, 432, 432])
+    >>> Ts.size
+    288
+
+    """
+    Np = network.Np
+    coords = network['pore.coords']
+    conns = network['throat.conns']
+    if weights is None:
+        weights = np.ones(Np)
+    weights = np.array(weights, dtype=float, ndmin=1)
+    if weights.size != Np:
+        raise Exception('weights must have one value per pore')
+    parts = int(parts)
+    if (parts < 1) or (parts > Np):
+        raise Exception('parts must be between 1 and the number of pores')
+    labels = _bisect(coords, weights, parts)
+    if refine and (parts > 1):
+        labels = _refine(labels, conns, weights, parts, tol, max_iter)
+    Ts = np.where(labels[conns[:, 0]] != labels[conns[:, 1]])[0]
+    if geometries:
+        from openpnm.geometry import GenericGeometry
+        tlabels = labels[conns[:, 0]]
+        for i in range(parts):
+            GenericGeometry(network=network, pores=labels == i,
+                            throats=tlabels == i)
+    return labels, Ts
+
+
+def _bisect(coords, weights, parts):
+    r"""
+    Assigns the points to ``parts`` groups by recursive coordinate
+    bisection
+    """
+    labels = np.zeros(coords.shape[0], dtype=int)
+    # Each entry holds the points in a group, and the first label and
+    # number of partitions assigned to it
+    stack = [(np.arange(coords.shape[0]), 0, parts)]
+    while stack:
+        inds, first, k = stack.pop()
+        if k == 1:
+            labels[inds] = first
+            continue
+        pts = coords[inds]
+        axis = np.argmax(pts.max(axis=0) - pts.min(axis=0))
+        inds = inds[np.argsort(pts[:, axis], kind='stable')]
+        k1 = k // 2
+        w = np.cumsum(weights[inds])
+        n = np.searchsorted(w, w[-1] * k1 / k)
+        # Leave at least k1 points on the left and k - k1 on the right
+        n = min(max(n, k1), inds.size - (k - k1))
+        stack.append((inds[n:], first + k1, k - k1))
+        stack.append((inds[:n], first, k1))
+    return labels
+
+
+def _refine(labels, conns, weights, parts, tol, max_iter):
+    r"""
+    Moves boundary points between groups to reduce the number of edges
+    cut, while keeping the weight of each group below ``1 + tol`` times
+    the mean
+    """
+    labels = labels.copy()
+    Np = labels.size
+    cap = (1 + tol) * weights.sum() / parts
+    floor = (1 - tol) * weights.sum() / parts
+    ends = np.vstack((conns, conns[:, ::-1]))
+    for _ in range(max_iter):
+        load = np.bincount(labels, weights=weights, minlength=parts)
+        same = labels[ends[:, 0]] == labels[ends[:, 1]]
+        internal = np.bincount(ends[same, 0], minlength=Np)
+        # Count the edges from each boundary point to each other group
+        cut = ends[~same]
+        if cut.size == 0:
+            break
+        key = cut[:, 0] * parts + labels[cut[:, 1]]
+        key, count = np.unique(key, return_counts=True)
+        pore, dest = np.divmod(key, parts)
+        gain = count - internal[pore]
+        # Keep the best destination of each point, if it reduces the cut
+        order = np.lexsort((-gain, pore))
+        pore, dest, gain = pore[order], dest[order], gain[order]
+        first = np.ones(pore.size, dtype=bool)
+        first[1:] = pore[1:] != pore[:-1]
+        keep = first & (gain > 0)
+        pore, dest, gain = pore[keep], dest[keep], gain[keep]
+        if pore.size == 0:
+            break
+        # Neighboring points moving between different groups may undo
+        # each other's gains, so only the better of each such pair moves
+        move = np.full(Np, -1)
+        move[pore] = dest
+        rank = np.zeros(Np)
+        rank[pore] = gain + 0.5 * pore / Np
+        a, b = conns[:, 0], conns[:, 1]
+        clash = (move[a] >= 0) & (move[b] >= 0) \
+            & ((move[a] != move[b]) | (labels[a] != labels[b]))
+        lose = np.where(rank[a[clash]] < rank[b[clash]], a[clash], b[clash])
+        move[lose] = -1
+        keep = move[pore] >= 0
+        pore, dest, gain = pore[keep], dest[keep], gain[keep]
+        # Take the largest gains first, within the allowed weights
+        src = labels[pore]
+        w = weights[pore]
+        ok = np.ones(pore.size, dtype=bool)
+        for group, limit in [(dest, cap - load), (src, load - floor)]:
+            order = np.lexsort((-gain, group))
+            total = _grouped_cumsum(w[order], group[order])
+            ok[order[total > limit[group[order]]]] = False
+        if not np.any(ok):
+            break
+        labels[pore[ok]] = dest[ok]
+    return labels
+
+
+def _grouped_cumsum(vals, groups):
+    r"""
+    Returns the running sum of ``vals`` restarting at each new value in
+    the sorted ``groups``
+    """
+    total = np.cumsum(vals)
+    start = np.ones(groups.size, dtype=bool)
+    start[1:] = groups[1:] != groups[:-1]
+    offset = np.maximum.accumulate(np.where(start, total - vals, 0))
+    return total - offset
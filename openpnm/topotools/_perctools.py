@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 import numpy as np
 import scipy.sparse as sprs
 from scipy.sparse import csgraph
@@ -299,7 +300,8 @@ def _bond_percolation(network, tmask):
     return (p_clusters, t_clusters)
 
 
-def find_path(network, pore_pairs, weights=None):
+def find_path(network, pore_pairs, weights=None, limit=np.inf,
+              chunk_size=None):
     r"""
     Find the shortest path between pairs of pores.
 
@@ -317,19 +319,45 @@ def find_path(network, pore_pairs, weights=None):
         would be the throat lengths, but could also be used to represent
         the phase configuration.  If no weights are given then the
         standard topological connections of the Network are used.
+        Different weights in each direction can be given as an Nt x 2
+        array or a 2*Nt-long list, as in ``create_adjacency_matrix``, where
+        the first column or Nt values are for the direction from the first
+        to the second pore in 'throat.conns'.
+
+    limit : float, optional
+        The largest path length to search. Pores beyond this distance from
+        a source are not visited, which makes the search much faster when
+        the pairs are close together. The default is no limit.
+
+    chunk_size : int, optional
+        The number of source pores searched at once. The search stores two
+        arrays of size ``chunk_size`` by Np, so this sets the memory used.
+        If not given, chunks of up to about 32 million entries are used.
 
     Returns
     -------
-    A dictionary containing both the pores and throats that define the
-    shortest path connecting each pair of input pores.
+    A dictionary containing the pores and throats that define the
+    shortest path connecting each pair of input pores, and the length of
+    each path under 'distance'.
 
     Notes
     -----
     The shortest path is found using Dijkstra's algorithm included in the
-    scipy.sparse.csgraph module
-
-    TODO: The returned throat path contains the correct values, but not
-    necessarily in the true order
+    scipy.sparse.csgraph module. The search is run once for each distinct
+    pore from which paths are traced, choosing the pore of each pair which
+    is shared with the most other pairs, such as an inlet pore.
+    The throats are returned in the order in which they are traversed along
+    the path. Where two consecutive pores are joined by more than one
+    throat, the throat with the lowest weight is used. When the weights
+    differ between directions the search is run from the first pore of
+    each pair.
+
+    The paths are traced back through the predecessors found by the search
+    in a compiled loop, with the throats looked up in the adjacency matrix
+    of the network, so that the cost per path is proportional to its
+    length. If a pair is not connected, or is farther apart than
+    ``limit``, its pores and throats are empty and its distance is
+    ``inf``.
 
     Examples
     --------
@@ -340,27 +368,116 @@ def find_path(network, pore_pairs, weights=None):
     [array([0, 1, 4]), array([ 0,  1, 10])]
     >>> a['throats']
     [array([ 0, 19]), array([ 0, 37])]
+    >>> a['distance']
+    array([2., 2.])
     """
-    Ps = np.array(pore_pairs, ndmin=2)
+    Ps = np.array(pore_pairs, dtype=int, ndmin=2).reshape(-1, 2)
+    Nt = network.Nt
     if weights is None:
         weights = np.ones_like(network.Ts)
+    weights = np.asarray(weights)
+    # Put the weights of both directions in the order of the matrix entries
+    if weights.shape == (Nt, ):
+        entries = np.append(weights, weights)
+    elif weights.shape == (Nt, 2):
+        entries = weights.flatten(order='F')
+    elif weights.shape == (2*Nt, ):
+        entries = weights
+    else:
+        raise Exception('weights must be of shape (Nt, ), (Nt, 2) or (2*Nt, )')
     graph = network.create_adjacency_matrix(weights=weights, fmt='csr',
                                             drop_zeros=False)
-    paths = csgraph.dijkstra(csgraph=graph, indices=Ps[:, 0],
-                             return_predecessors=True)[1]
-    pores = []
-    throats = []
-    for row in range(0, np.shape(Ps)[0]):
-        j = Ps[row][1]
-        ans = []
-        while paths[row][j] > -9999:
-            ans.append(j)
-            j = paths[row][j]
-        ans.append(Ps[row][0])
-        ans.reverse()
-        pores.append(np.array(ans, dtype=int))
-        Ts = network.find_neighbor_throats(pores=ans, mode='xnor')
-        throats.append(np.array(Ts, dtype=int))
+    # Find the lowest weight throat joining each pair of neighboring pores
+    indptr, indices, order, starts = network._get_csr_structure(kind='am')
+    tids = order % max(Nt, 1)
+    if starts is not None:
+        group = np.zeros(order.size, dtype=int)
+        group[starts] = 1
+        group = np.cumsum(group) - 1
+        tids = tids[np.lexsort((entries[order], group))][starts]
+    if chunk_size is None:
+        chunk_size = max(1, 2**25 // max(network.Np, 1))
+    # If the paths are the same in both directions, search from whichever
+    # pore of each pair is shared by the most pairs
+    counts = np.bincount(Ps.flatten(), minlength=network.Np)
+    flip = counts[Ps[:, 1]] > counts[Ps[:, 0]]
+    if not np.array_equal(entries[:Nt], entries[Nt:]):
+        flip[:] = False
+    Ps = np.where(flip[:, None], Ps[:, ::-1], Ps)
+    sources, rows = np.unique(Ps[:, 0], return_inverse=True)
+    kernel = _trace_paths_kernel()
+    pores = [None]*Ps.shape[0]
+    throats = [None]*Ps.shape[0]
+    distance = np.full(Ps.shape[0], np.inf)
+    for first in range(0, sources.size, chunk_size):
+        hits = np.where((rows >= first) & (rows < first + chunk_size))[0]
+        dist, pred = csgraph.dijkstra(csgraph=graph, limit=limit,
+                                      indices=sources[first:first+chunk_size],
+                                      return_predecessors=True)
+        distance[hits] = dist[rows[hits] - first, Ps[hits, 1]]
+        p_ptr, p_flat, t_ptr, t_flat = kernel(
+            pred, rows[hits] - first, Ps[hits, 0], Ps[hits, 1],
+            indptr, indices, tids)
+        for i, hit in enumerate(hits):
+            step = -1 if flip[hit] else 1
+            pores[hit] = p_flat[p_ptr[i]:p_ptr[i+1]][::step]
+            throats[hit] = t_flat[t_ptr[i]:t_ptr[i+1]][::step]
     pdict = PrintableDict
-    dict_ = pdict(**{'pores': pores, 'throats': throats})
+    dict_ = pdict(**{'pores': pores, 'throats': throats,
+                     'distance': distance})
     return dict_
+
+
+@lru_cache(maxsize=None)
+def _trace_paths_kernel():
+    r"""
+    Returns the compiled function which traces each path back from its
+    target through the predecessor matrix
+
+    Notes
+    -----
+    The function is compiled on first use, which avoids importing numba
+    when OpenPNM is imported.
+
+    """
+    from numba import njit
+
+    @njit
+    def trace(pred, rows, srcs, dsts, indptr, indices, tids):
+        n = rows.size
+        p_ptr = np.zeros(n + 1, dtype=np.int64)
+        t_ptr = np.zeros(n + 1, dtype=np.int64)
+        # Count the pores on each path, leaving unreachable targets empty
+        for i in range(n):
+            j = dsts[i]
+            count = 0
+            if (j == srcs[i]) or (pred[rows[i], j] >= 0):
+                count = 1
+                while j != srcs[i]:
+                    j = pred[rows[i], j]
+                    count += 1
+            p_ptr[i+1] = p_ptr[i] + count
+            t_ptr[i+1] = t_ptr[i] + max(count - 1, 0)
+        pores = np.empty(p_ptr[n], dtype=np.int64)
+        throats = np.empty(t_ptr[n], dtype=np.int64)
+        # Fill each path from its end, finding the throats along the way
+        for i in range(n):
+            k = p_ptr[i+1] - 1
+            if k < p_ptr[i]:
+                continue
+            m = t_ptr[i+1] - 1
+            j = dsts[i]
+            pores[k] = j
+            while k > p_ptr[i]:
+                a = pred[rows[i], j]
+                for e in range(indptr[a], indptr[a+1]):
+                    if indices[e] == j:
+                        throats[m] = tids[e]
+                        break
+                k -= 1
+                m -= 1
+                pores[k] = a
+                j = a
+        return p_ptr, pores, t_ptr, throats
+
+    return trace
@@ -1,6 +1,5 @@
 import numpy as np
 import openpnm as op
-from tqdm import tqdm
 
 
 __all__ = [
@@ -770,6 +769,7 @@ def _generate_voxel_image(network, pore_shape, throat_shape, max_dim=200):
     solid phase, pores, and throats respectively.
 
     """
+    from tqdm import tqdm
     from skimage.morphology import cube, ball
     from porespy.tools import overlay, insert_cylinder
     xyz = network["pore.coords"]
@@ -1,11 +1,11 @@
 import logging
 import numpy as np
-import scipy as sp
 import scipy.ndimage as spim
 from scipy.spatial import cKDTree
 from scipy.sparse import csgraph
 from scipy.spatial import ConvexHull
 from openpnm.utils import Workspace, prettify_logger_message
+from ._transaction import TopologyTransaction
 
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,7 @@ __all__ = [
     'subdivide',
     'trim_occluded_throats',
     'merge_pores',
+    'reorder',
     'hull_centroid',
     'template_sphere_shell',
     'template_cylinder_annulus',
@@ -232,6 +233,12 @@ def trim(network, pores=[], throats=[]):
         The indices of the of the pores or throats to be removed from the
         network.
 
+    Notes
+    -----
+    When several trims or extensions are to be performed in a row, it is
+    more efficient to queue them in a ``TopologyTransaction`` so that the
+    data is only processed once.
+
     Examples
     --------
     >>> import openpnm as op
@@ -249,66 +256,8 @@ def trim(network, pores=[], throats=[]):
     """
     pores = network._parse_indices(pores)
     throats = network._parse_indices(throats)
-    Pkeep = np.copy(network['pore.all'])
-    Tkeep = np.copy(network['throat.all'])
-    if np.size(pores) > 0:
-        Pkeep[pores] = False
-        if not np.any(Pkeep):
-            raise Exception('Cannot delete ALL pores')
-        # # Performing customized find_neighbor_throats which is much faster, but
-        # # not general for other types of queries
-        # temp = np.in1d(network['throat.conns'].flatten(), pores)
-        # temp = np.reshape(temp, (network.Nt, 2))
-        # Ts = np.any(temp, axis=1)
-        # Ts = network.Ts[Ts]
-        Ts = network.find_neighbor_throats(pores=~Pkeep, mode='union')
-        if len(Ts) > 0:
-            Tkeep[Ts] = False
-    if np.size(throats) > 0:
-        Tkeep[throats] = False
-        # The following IF catches the special case of deleting ALL throats
-        # It removes all throat props, adds 'all', and skips rest of function
-        if not np.any(Tkeep):
-            logger.info('Removing ALL throats from network')
-            for item in list(network.keys()):
-                if item.split('.')[0] == 'throat':
-                    del network[item]
-            network['throat.all'] = np.array([], ndmin=1)
-            return
-
-    # Temporarily store throat conns and pore map for processing later
-    Np_old = network.Np
-    Nt_old = network.Nt
-    Pkeep_inds = np.where(Pkeep)[0]
-    Tkeep_inds = np.where(Tkeep)[0]
-    Pmap = np.ones((network.Np,), dtype=int)*-1
-    tpore1 = network['throat.conns'][:, 0]
-    tpore2 = network['throat.conns'][:, 1]
-
-    # Delete specified pores and throats from all objects
-    for obj in network.project[::-1]:
-        if (obj.Np == Np_old) and (obj.Nt == Nt_old):
-            Ps = Pkeep_inds
-            Ts = Tkeep_inds
-        else:  # If subdomain object then Np/Nt < Np/Nt_old
-            Ps = obj.to_local(pores=Pkeep_inds, missing_vals=None)
-            Ts = obj.to_local(throats=Tkeep_inds, missing_vals=None)
-        for key in list(obj.keys()):
-            temp = obj.pop(key)
-            if key.split('.')[0] == 'throat':
-                obj.update({key: temp[Ts]})
-            if key.split('.')[0] == 'pore':
-                obj.update({key: temp[Ps]})
-
-    # Remap throat connections
-    Pmap[Pkeep] = np.arange(0, np.sum(Pkeep))
-    Tnew1 = Pmap[tpore1[Tkeep]]
-    Tnew2 = Pmap[tpore2[Tkeep]]
-    network.update({'throat.conns': np.vstack((Tnew1, Tnew2)).T})
-
-    # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
+    with TopologyTransaction(network) as t:
+        t.trim(pores=pores, throats=throats)
 
 
 def extend(network, coords=[], conns=[], labels=[], **kwargs):
@@ -395,8 +344,7 @@ def extend(network, coords=[], conns=[], labels=[], **kwargs):
                 network['throat.'+label][Ts] = True
 
     # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
+    network._invalidate_topology()
 
 
 def label_faces(network, tol=0.0, label='surface'):
@@ -624,8 +572,7 @@ def clone_pores(network, pores, labels=['clone'], mode='parents'):
         network.set_label(label=item, throats=range(Nt, Ntnew))
 
     # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
+    network._invalidate_topology()
 
 
 def merge_networks(network, donor=[]):
@@ -715,8 +662,7 @@ def merge_networks(network, donor=[]):
                     network[key][-s:] = donor[key]
 
     # Clear adjacency and incidence matrices which will be out of date now
-    network._am.clear()
-    network._im.clear()
+    network._invalidate_topology()
 
 
 def stitch(network, donor, P_network, P_donor, method='nearest',
@@ -787,24 +733,28 @@ def stitch(network, donor, P_network, P_donor, method='nearest',
     N_init = {}
     N_init['pore'] = network.Np
     N_init['throat'] = network.Nt
+    P1 = np.array(P_network, ndmin=1)
+    P2 = np.array(P_donor, ndmin=1) + N_init['pore']  # Increment donor pores
+    C2 = donor['pore.coords'][P_donor]
+    # Find the network pores near each donor pore using a k-d tree rather
+    # than the full matrix of distances between the two sets
     if method == 'nearest':
-        P1 = P_network
-        P2 = P_donor + N_init['pore']  # Increment pores on donor
-        C1 = network['pore.coords'][P_network]
-        C2 = donor['pore.coords'][P_donor]
-        D = sp.spatial.distance.cdist(C1, C2)
-        [P1_ind, P2_ind] = np.where(D == D.min(axis=0))
-        conns = np.vstack((P1[P1_ind], P2[P2_ind])).T
+        # Search a few neighbors so that equally near pores are all found
+        near = network.query_pores(C2, k=min(8, P1.size), pores=P1)
+        D = np.linalg.norm(network['pore.coords'][near.indices]
+                           - C2[near.rows], axis=1)
+        Dmin = np.minimum.reduceat(D, near.indptr[:-1]) if D.size else D
+        near = near.compress(D == Dmin[near.rows])
     elif method == 'radius':
-        P1 = P_network
-        P2 = P_donor + N_init['pore']  # Increment pores on donor
-        C1 = network['pore.coords'][P_network]
-        C2 = donor['pore.coords'][P_donor]
-        D = sp.spatial.distance.cdist(C1, C2)
-        [P1_ind, P2_ind] = np.where(D <= len_max)
-        conns = np.vstack((P1[P1_ind], P2[P2_ind])).T
+        near = network.query_pores(C2, r=len_max, pores=P1)
     else:
         raise Exception('<{}> method not supported'.format(method))
+    # Order the new throats by the position of their pores in P_network,
+    # then in P_donor
+    sorter = np.argsort(P1, kind='stable')
+    pos = sorter[np.searchsorted(P1, near.indices, sorter=sorter)]
+    order = np.lexsort((near.rows, pos))
+    conns = np.vstack((near.indices[order], P2[near.rows[order]])).T
 
     merge_networks(network, donor)
 
@@ -1195,44 +1145,177 @@ def merge_pores(network, pores, labels=['merged']):
     32
 
     """
-    # Assert that `pores` is list of lists
-    try:
-        len(pores[0])
-    except (TypeError, IndexError):
-        pores = [pores]
-
-    N = len(pores)
-    NBs, XYZs = [], []
-
-    for Ps in pores:
-        temp = network.find_neighbor_pores(pores=Ps, mode='union', flatten=True,
-                                           include_input=False)
-        NBs.append(temp)
-        points = np.concatenate((temp, Ps))
-        XYZs.append(hull_centroid(network["pore.coords"][points]))
-
-    extend(network, pore_coords=XYZs, labels=labels)
-    Pnew = network.Ps[-N::]
-
-    # Possible throats between new pores: This only happens when running in
-    # batch mode, i.e. multiple groups of pores are to be merged. In case
-    # some of these groups share elements, possible throats between the
-    # intersecting elements is not captured and must be added manually.
-    pores_set = [set(items) for items in pores]
-    NBs_set = [set(items) for items in NBs]
-    ps1, ps2 = [], []
-    from itertools import combinations
-    for i, j in combinations(range(N), 2):
-        if not NBs_set[i].isdisjoint(pores_set[j]):
-            ps1.append([network.Ps[-N+i]])
-            ps2.append([network.Ps[-N+j]])
-
-    # Add (possible) connections between the new pores
-    connect_pores(network, pores1=ps1, pores2=ps2, labels=labels)
-    # Add connections between the new pores and the rest of the network
-    connect_pores(network, pores2=np.split(Pnew, N), pores1=NBs, labels=labels)
-    # Trim merged pores from the network
-    trim(network=network, pores=np.concatenate(pores))
+    with TopologyTransaction(network) as t:
+        t.merge_pores(pores=pores, labels=labels)
+
+
+def reorder(network, method='rcm'):
+    r"""
+    Renumbers the pores and throats of the network so that neighboring
+    pores have nearby indices, which improves memory locality and reduces
+    the fill-in of direct solvers
+
+    Parameters
+    ----------
+    network : GenericNetwork
+        The network whose pores and throats are to be renumbered. All
+        pore and throat arrays on every object in its project are permuted
+        consistently.
+    method : str
+        The ordering to use. Options are:
+
+        ===========  =====================================================
+        method       meaning
+        ===========  =====================================================
+        'rcm'        Reverse Cuthill-McKee ordering of the adjacency
+                     matrix, which minimizes its bandwidth (default)
+        'hilbert'    Order of the pore coordinates along a Hilbert curve
+        'morton'     Order of the pore coordinates along a Morton
+                     (z-order) curve, which is faster to compute than the
+                     Hilbert curve but less local
+        ===========  =====================================================
+
+    Notes
+    -----
+    The throats are sorted by the new indices of the pores they connect.
+    Where the ends of a throat change places in 'throat.conns' the paired
+    values at its ends, such as 'throat.conduit_lengths.pore1' and
+    'throat.conduit_lengths.pore2', are swapped to match.
+    The original index of each pore and throat is stored on the network
+    in 'pore.original_index' and 'throat.original_index', so that a
+    result ``x`` can be returned to the original order with
+    ``x_orig[net['pore.original_index']] = x``. These arrays are permuted
+    like all others, so they refer to the first ordering even after
+    several calls.
+
+    The space-filling curves only use the coordinates, so they work for
+    any network, while 'rcm' only uses the connectivity.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import openpnm as op
+    >>> pn = op.network.Cubic(shape=[10, 10, 10])
+    >>> np.random.seed(0)
+    >>> shuffled = np.random.permutation(pn.Np)
+    >>> pn['pore.coords'] = pn['pore.coords'][shuffled]
+    >>> pn['throat.conns'] = np.argsort(shuffled)[pn['throat.conns']]
+    >>> am = pn.create_adjacency_matrix(fmt='coo')
+    >>> int(np.abs(am.row - am.col).max())
+    987
+    >>> op.topotools.reorder(network=pn, method='rcm')
+    >>> am = pn.create_adjacency_matrix(fmt='coo')
+    >>> int(np.abs(am.row - am.col).max())
+    80
+
+    """
+    project = network.project
+    if method == 'rcm':
+        am = network.create_adjacency_matrix(fmt='csr')
+        Pnew = csgraph.reverse_cuthill_mckee(am, symmetric_mode=True)
+    elif method in ['hilbert', 'morton']:
+        coords = network['pore.coords']
+        dims = dimensionality(network)
+        keys = _curve_keys(coords[:, dims], method=method)
+        Pnew = np.argsort(keys, kind='stable')
+    else:
+        raise Exception(f'Unrecognized ordering method: {method}')
+    Pnew = Pnew.astype(np.int64)
+    Pmap = np.empty_like(Pnew)
+    Pmap[Pnew] = np.arange(Pnew.size)
+    conns = Pmap[network['throat.conns']].astype(network['throat.conns'].dtype)
+    # Throats whose ends change places when 'throat.conns' is resorted
+    flipped = conns[:, 0] > conns[:, 1]
+    conns = np.sort(conns, axis=1)
+    Tnew = np.lexsort((conns[:, 1], conns[:, 0]))
+    Tmap = np.empty_like(Tnew)
+    Tmap[Tnew] = np.arange(Tnew.size)
+    for element, new in [('pore', Pnew), ('throat', Tnew)]:
+        if element + '.original_index' not in network.keys():
+            network[element + '.original_index'] = np.arange(new.size)
+    order = {'pore': Pnew, 'throat': Tnew}
+    # Map subdomain locations before any arrays are changed
+    local = {}
+    for obj in project:
+        if obj._isa('geometry') or obj._isa('physics'):
+            local[obj.name] = {
+                'pore': np.argsort(Pmap[obj.to_global(pores=obj.Ps)]),
+                'throat': np.argsort(Tmap[obj.to_global(throats=obj.Ts)]),
+                'flipped': flipped[obj.to_global(throats=obj.Ts)]}
+    for obj in project:
+        # Swap the values at either end of the flipped throats
+        hits = local[obj.name]['flipped'] if obj.name in local else flipped
+        swapped = {}
+        for key in obj.keys():
+            for a, b in [('.pore1', '.pore2'), ('.head', '.tail')]:
+                if key.startswith('throat.') and key.endswith(a):
+                    partner = key[:-len(a)] + b
+                    if partner in obj.keys():
+                        mask = hits.reshape((-1, ) + (1, )*(obj[key].ndim - 1))
+                        swapped[key] = np.where(mask, obj[partner], obj[key])
+                        swapped[partner] = np.where(mask, obj[key], obj[partner])
+        for key in list(obj.keys()):
+            element = key.split('.')[0]
+            if obj.name in local:
+                new = local[obj.name][element]
+            else:
+                new = order[element]
+            if (obj is network) and (key == 'throat.conns'):
+                temp = conns[Tnew]
+            else:
+                temp = np.take(swapped.get(key, obj[key]), new, axis=0)
+            temp = project._to_storage(obj, key, temp)
+            obj.update({key: temp})
+        # Discard any coefficient matrices built in the old numbering
+        if hasattr(obj, '_pure_A'):
+            obj._pure_A = obj._A = None
+            obj._pure_b = obj._b = None
+    network._invalidate_topology()
+
+
+def _curve_keys(coords, method='hilbert', bits=21):
+    r"""
+    Returns the position of each point along a Hilbert or Morton curve
+    through a grid of ``2**bits`` cells in each direction covering the
+    points
+    """
+    coords = np.asarray(coords, dtype=float)
+    n = coords.shape[1]
+    if n == 0:
+        return np.zeros(coords.shape[0], dtype=np.uint64)
+    lo, hi = coords.min(axis=0), coords.max(axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    X = ((coords - lo) / span * (2**bits - 1)).astype(np.uint64)
+    if method == 'hilbert':
+        # Transpose the coordinates into Hilbert order, following Skilling
+        # (2004) Programming the Hilbert curve, AIP Conf. Proc. 707, 381
+        M = np.uint64(1 << (bits - 1))
+        Q = M
+        while Q > 1:
+            P = Q - np.uint64(1)
+            for i in range(n):
+                hit = (X[:, i] & Q) != 0
+                X[hit, 0] ^= P
+                t = (X[:, 0] ^ X[:, i]) & P
+                t[hit] = 0
+                X[:, 0] ^= t
+                X[:, i] ^= t
+            Q >>= np.uint64(1)
+        for i in range(1, n):
+            X[:, i] ^= X[:, i-1]
+        t = np.zeros(X.shape[0], dtype=np.uint64)
+        Q = M
+        while Q > 1:
+            t[(X[:, n-1] & Q) != 0] ^= Q - np.uint64(1)
+            Q >>= np.uint64(1)
+        X ^= t[:, None]
+    # Interleave the bits of each axis, with the first axis most significant
+    keys = np.zeros(X.shape[0], dtype=np.uint64)
+    one = np.uint64(1)
+    for b in range(bits - 1, -1, -1):
+        for i in range(n):
+            keys = (keys << one) | ((X[:, i] >> np.uint64(b)) & one)
+    return keys
 
 
 def hull_centroid(points):
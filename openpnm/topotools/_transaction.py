@@ -0,0 +1,341 @@
+import logging
+from itertools import combinations
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+__all__ = [
+    'TopologyTransaction',
+]
+
+
+class TopologyTransaction:
+    r"""
+    Queues several changes to the topology of a network and applies them
+    all in a single pass over the data
+
+    Parameters
+    ----------
+    network : GenericNetwork
+        The network to be edited
+    in_place : bool
+        If ``True`` the arrays on each object are compacted within their
+        existing memory and then resized, so that the peak memory use stays
+        close to the size of the data. Any references to the old arrays
+        held elsewhere will see overwritten values. The default is
+        ``False``, which writes the results to new arrays.
+
+    Notes
+    -----
+    Calling ``trim`` or ``extend`` repeatedly, such as when removing
+    isolated clusters and then boundary pores from an extracted network,
+    copies every array on every object at each step. A transaction instead
+    records the requested operations, then removes and appends elements
+    in one pass per array, using a single remap of the pore and throat
+    indices.
+
+    All indices given to the queued operations refer to the network as it
+    was when the transaction was started. Pores and throats added by
+    ``extend`` or ``merge_pores`` are numbered after the existing ones in
+    the order they were queued, and their indices are returned so they can
+    be used in subsequent operations, such as connecting new pores.
+
+    The transaction is applied when the ``with`` block exits without an
+    error, or by calling ``apply``.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> pn = op.network.Cubic(shape=[5, 5, 5])
+    >>> with op.topotools.TopologyTransaction(pn) as t:
+    ...     t.trim(pores=[0, 1])
+    ...     Ps, Ts = t.extend(coords=[[0.5, 0.5, 5.5]], labels='new')
+    ...     Ps, Ts = t.extend(conns=[[4, Ps[0]]], labels='new')
+    >>> pn.Np, pn.Nt
+    (124, 295)
+    >>> pn.pores('new')
+    array([123])
+    >>> pn['throat.conns'][pn.throats('new')]
+    array([[  2, 123]])
+
+    """
+
+    def __init__(self, network, in_place=False):
+        self.network = network
+        self.in_place = in_place
+        self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.apply()
+
+    def _reset(self):
+        self._Np = self.network.Np
+        self._Nt = self.network.Nt
+        self._coords = []
+        self._conns = []
+        self._labels = {'pore': {}, 'throat': {}}
+        self._drop = {'pore': [], 'throat': []}
+
+    @property
+    def Np(self):
+        r"""The number of pores once all pending additions are applied"""
+        return self._Np + sum([len(i) for i in self._coords])
+
+    @property
+    def Nt(self):
+        r"""The number of throats once all pending additions are applied"""
+        return self._Nt + sum([len(i) for i in self._conns])
+
+    def _parse(self, inds, element):
+        inds = np.array(inds, ndmin=1)
+        if inds.dtype == bool:
+            inds = np.where(inds)[0]
+        inds = inds.astype(np.int64)
+        N = self.Np if element == 'pore' else self.Nt
+        if np.any(inds >= N) or np.any(inds < -N):
+            raise Exception(f'Some {element} indices are out of range')
+        return inds % max(N, 1)
+
+    def trim(self, pores=[], throats=[]):
+        r"""
+        Queues the removal of pores or throats
+
+        Parameters
+        ----------
+        pores (or throats) : array_like
+            The indices of the pores or throats to remove, or boolean
+            masks. Any throats connected to removed pores are also removed.
+
+        """
+        self._drop['pore'].append(self._parse(pores, 'pore'))
+        self._drop['throat'].append(self._parse(throats, 'throat'))
+
+    def extend(self, coords=[], conns=[], labels=[]):
+        r"""
+        Queues the addition of pores or throats
+
+        Parameters
+        ----------
+        coords : array_like
+            The N-by-3 coordinates of the pores to add
+        conns : array_like
+            The N-by-2 connections of the throats to add, which may point
+            to pores added earlier in the transaction
+        labels : str, or list[str], optional
+            A list of labels to apply to the new pores and throats
+
+        Returns
+        -------
+        pores, throats : ndarray
+            The indices of the new pores and throats, numbered as if all
+            queued additions were applied before any removals
+
+        """
+        coords = np.array(coords, dtype=float, ndmin=2).reshape(-1, 3)
+        conns = np.array(conns, dtype=np.int64, ndmin=2).reshape(-1, 2)
+        Ps = np.arange(self.Np, self.Np + coords.shape[0])
+        self._coords.append(coords)
+        if np.any(conns >= self.Np) or np.any(conns < 0):
+            raise Exception('Some throat conns point to non-existent pores')
+        Ts = np.arange(self.Nt, self.Nt + conns.shape[0])
+        self._conns.append(np.sort(conns, axis=1))
+        if isinstance(labels, str):
+            labels = [labels]
+        for label in labels:
+            label = label.split('.')[-1]
+            for element, inds in [('pore', Ps), ('throat', Ts)]:
+                if inds.size > 0:
+                    self._labels[element].setdefault(label, []).append(inds)
+        return Ps, Ts
+
+    def merge_pores(self, pores, labels=['merged']):
+        r"""
+        Queues the replacement of groups of pores by a single pore at their
+        centroid, connected to all of their neighbors
+
+        Parameters
+        ----------
+        pores : array_like
+            The pores to merge, or a list of such arrays to merge several
+            groups. These must be pores that existed when the transaction
+            was started.
+        labels : str or list[str]
+            The labels to apply to the new pores and throats
+
+        Returns
+        -------
+        pores : ndarray
+            The indices of the new pores
+
+        See Also
+        --------
+        openpnm.topotools.merge_pores
+
+        """
+        from openpnm.topotools import hull_centroid
+        network = self.network
+        try:
+            len(pores[0])
+        except (TypeError, IndexError):
+            pores = [pores]
+        N = len(pores)
+        NBs, XYZs = [], []
+        for Ps in pores:
+            temp = network.find_neighbor_pores(pores=Ps, mode='union',
+                                               flatten=True,
+                                               include_input=False)
+            NBs.append(temp)
+            points = np.concatenate((temp, Ps))
+            XYZs.append(hull_centroid(network["pore.coords"][points]))
+        Pnew = self.extend(coords=XYZs, labels=labels)[0]
+        # Connect new pores whose groups neighbor each other
+        pores_set = [set(items) for items in pores]
+        NBs_set = [set(items) for items in NBs]
+        conns = [[Pnew[i], Pnew[j]] for i, j in combinations(range(N), 2)
+                 if not NBs_set[i].isdisjoint(pores_set[j])]
+        # Connect the new pores to the rest of the network
+        conns.extend([[P, Pnew[i]] for i in range(N) for P in NBs[i]])
+        self.extend(conns=conns, labels=labels)
+        self.trim(pores=np.concatenate(pores))
+        return Pnew
+
+    def apply(self):
+        r"""
+        Applies all queued operations to the network and all other objects
+        in its project, after which new operations can be queued
+        """
+        network = self.network
+        project = network.project
+        if (network.Np != self._Np) or (network.Nt != self._Nt):
+            raise Exception('The network was changed outside of the transaction')
+        new_coords = np.vstack([np.empty((0, 3))] + self._coords)
+        new_conns = np.vstack([np.empty((0, 2), dtype=np.int64)] + self._conns)
+        # Find which pores and throats to keep, including new ones
+        Pkeep = np.ones(self.Np, dtype=bool)
+        Pkeep[np.concatenate(self._drop['pore'])] = False
+        if not np.any(Pkeep):
+            raise Exception('Cannot delete ALL pores')
+        Tkeep = np.ones(self.Nt, dtype=bool)
+        Tkeep[np.concatenate(self._drop['throat'])] = False
+        conns = network['throat.conns']
+        for c, mask in [(conns, Tkeep[:self._Nt]),
+                        (new_conns, Tkeep[self._Nt:])]:
+            mask &= Pkeep[c[:, 0]] & Pkeep[c[:, 1]]
+        keep = {'pore': Pkeep, 'throat': Tkeep}
+        N_old = {'pore': self._Np, 'throat': self._Nt}
+        # Map subdomain locations before any arrays are changed
+        local = {}
+        for obj in project:
+            if obj._isa('geometry') or obj._isa('physics'):
+                local[obj.name] = {
+                    'pore': Pkeep[obj.to_global(pores=obj.Ps)],
+                    'throat': Tkeep[obj.to_global(throats=obj.Ts)]}
+        Pmap = np.cumsum(Pkeep, dtype=conns.dtype) - 1
+        del conns  # Holding a reference would prevent resizing in place
+        # Remove and append elements on every object in one pass per array
+        for obj in project[::-1]:
+            for key in list(obj.keys()):
+                element = key.split('.')[0]
+                if obj.name in local:
+                    mask, tail = local[obj.name][element], None
+                else:
+                    mask = keep[element][:N_old[element]]
+                    n = np.count_nonzero(keep[element][N_old[element]:])
+                    if (obj is network) and (key == 'throat.conns'):
+                        tail = Pmap[new_conns[Tkeep[self._Nt:]]]
+                    elif (obj is network) and (key == 'pore.coords'):
+                        tail = new_coords[Pkeep[self._Np:]]
+                    elif key.split('.')[-1] == 'all':
+                        tail = np.ones(n, dtype=bool)
+                    elif n > 0:
+                        tail = self._fill(dict.__getitem__(obj, key), n)
+                    else:
+                        tail = None
+                temp = self._compact(obj, key, mask, tail=tail)
+                if (obj is network) and (key == 'throat.conns'):
+                    # Existing conns stay sorted since the map is monotonic
+                    n = np.count_nonzero(mask)
+                    for i in range(0, n, self._chunk(temp)):
+                        j = i + self._chunk(temp)
+                        temp[i:min(j, n)] = Pmap[temp[i:min(j, n)]]
+                temp = project._to_storage(obj, key, temp)
+                obj.update({key: temp})
+        # Label the new pores and throats which were kept
+        Tmap = np.cumsum(Tkeep) - 1
+        for element, emap in [('pore', Pmap), ('throat', Tmap)]:
+            for label, inds in self._labels[element].items():
+                inds = np.concatenate(inds)
+                inds = emap[inds[keep[element][inds]]]
+                if element + '.' + label not in network.keys():
+                    network[element + '.' + label] = False
+                network[element + '.' + label][inds] = True
+        # Clear adjacency and incidence matrices which will be out of date now
+        network._invalidate_topology()
+        # Regenerate models on phases to fill in the new elements
+        if len(Pmap) > self._Np or len(Tmap) > self._Nt:
+            for obj in project.phases().values():
+                obj.regenerate_models()
+        self._reset()
+
+    @staticmethod
+    def _fill(arr, n):
+        r"""
+        Returns values for n new elements of the given array, which are
+        ``False`` for labels and ``nan`` otherwise
+        """
+        shape = (n, *arr.shape[1:])
+        if arr.dtype == bool:
+            return np.zeros(shape, dtype=bool)
+        if arr.dtype.kind in 'fcO':
+            return np.full(shape, np.nan, dtype=arr.dtype)
+        return np.full(shape, np.nan, dtype=float)
+
+    @staticmethod
+    def _chunk(arr, nbytes=2**20):
+        r"""
+        Returns the number of rows of ``arr`` in a block of about 1 MB
+        """
+        return max(1, nbytes // max(1, arr[:1].nbytes))
+
+    def _compact(self, obj, key, mask, tail=None):
+        r"""
+        Removes the array ``key`` from ``obj`` and returns its rows where
+        ``mask`` is ``True``, followed by the rows of ``tail``, reusing the
+        memory of the array when working in place
+        """
+        # Popping here leaves this function holding the only reference,
+        # which is required for resizing the array in place
+        arr = obj.pop(key)
+        n = np.count_nonzero(mask)
+        if tail is None:  # Avoid taking a view, which would block resizing
+            tail = np.empty((0, *arr.shape[1:]), dtype=arr.dtype)
+        dtype = np.result_type(arr, tail)
+        total = n + len(tail)
+        shape = (total, *arr.shape[1:])
+        # Only C-ordered arrays can be resized, others are copied
+        in_place = self.in_place and (type(arr) is np.ndarray) \
+            and (arr.dtype == dtype) and arr.flags.c_contiguous \
+            and arr.flags.writeable and arr.flags.owndata
+        out = None if in_place else np.empty(shape, dtype=dtype)
+        # Copy the kept rows in blocks to limit the size of temporary arrays.
+        # When working in place the rows only ever move down, so each block
+        # can be written after all earlier blocks have been read.
+        start = 0
+        chunk = self._chunk(arr)
+        for i in range(0, arr.shape[0], chunk):
+            rows = arr[i:i+chunk][mask[i:i+chunk]]
+            (arr if in_place else out)[start:start + len(rows)] = rows
+            start += len(rows)
+        if in_place:
+            try:
+                arr.resize(shape, refcheck=True)
+                out = arr
+            except ValueError:  # Other references exist, so make a copy
+                out = np.empty(shape, dtype=dtype)
+                out[:n] = arr[:n]
+        out[n:] = tail
+        return out
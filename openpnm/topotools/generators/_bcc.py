@@ -1,11 +1,10 @@
-import scipy.spatial as sptl
-import scipy.sparse as sprs
-from openpnm.topotools.generators import cubic
-from openpnm.topotools import tri_to_am
+import warnings
+import itertools
 import numpy as np
+from openpnm.topotools.generators.tools import _sublattice_network
 
 
-def bcc(shape, spacing=1, mode='kdtree'):
+def bcc(shape, spacing=1, mode=None):
     r"""
     Generate a body-centered cubic lattice
 
@@ -18,14 +17,10 @@ def bcc(shape, spacing=1, mode='kdtree'):
         The size of a unit cell in each direction. If an scalar is given it is
         applied in all 3 directions.
     mode : str
-        Dictate how neighbors are found.  Options are:
-            ===============  =====================================================
-            mode             meaning
-            ===============  =====================================================
-            'kdtree'         Uses ``scipy.spatial.KDTree`` to find all neighbors
-                             within the unit cell.
-            'triangulation'  Uses ``scipy.spatial.Delaunay`` to find all neighbors.
-            ===============  =====================================================
+        This argument is deprecated and ignored. Neighbors used to be found
+        with ``scipy.spatial.KDTree`` or ``scipy.spatial.Delaunay``, but are
+        now found formulaically.
+
     Returns
     -------
     network : dict
@@ -33,44 +28,24 @@ def bcc(shape, spacing=1, mode='kdtree'):
 
     Notes
     -----
-    It is not clear whether KDTree of Delaunay are faster. In fact it is
-    surely possible to find the neighbors formulaically but this is not
-    implemented yet.
+    The corner sites and the body sites are each connected to their 6
+    cubic neighbors, and each body site is connected to the 8 corners of
+    its cell. The corner sites come first, followed by the body sites.
 
-    """
-    shape = np.array(shape)
-    spacing = np.array(spacing)
-    net1 = cubic(shape=shape+1, spacing=1)
-    net2 = cubic(shape=shape, spacing=1)
-    net2['vert.coords'] += 0.5
-    crds = np.concatenate((net1['vert.coords'], net2['vert.coords']))
-    if mode.startswith('tri'):
-        tri = sptl.Delaunay(points=crds)
-        am = tri_to_am(tri)
-        conns = np.vstack((am.row, am.col)).T
-        # Trim diagonal connections between cubic pores
-        L = np.sqrt(np.sum(np.diff(crds[conns], axis=1)**2, axis=2)).flatten()
-        conns = conns[L <= 1]
-    elif mode.startswith('kd'):
-        tree1 = sptl.KDTree(crds)
-        # Method 1
-        hits = tree1.query_ball_point(crds, r=1)
-        # Method 2: Not sure which is faster
-        # tree2 = sptl.KDTree(crds)
-        # hits = tree1.query_ball_tree(tree1, r=1)
-        indices = np.hstack(hits)
-        # Convert to CSR matrix
-        indptr = [len(i) for i in hits]
-        indptr.insert(0, 0)
-        indptr = np.cumsum(indptr)
-        am = sprs.csr_matrix((np.ones_like(indices), indices, indptr))
-        am = sprs.triu(am, k=1)
-        am = am.tocoo()
-        conns = np.vstack((am.row, am.col)).T
+    The connections are found by index arithmetic between the two
+    sublattices, so the time and memory needed grow linearly with the
+    number of unit cells.
 
-    d = {}
-    d['vert.coords'] = crds*spacing
-    d['edge.conns'] = conns
+    """
+    if mode is not None:
+        warnings.warn("'mode' has been deprecated, neighbors are now found "
+                      "formulaically", DeprecationWarning)
+    offsets = [[0, 0, 0], [1, 1, 1]]
+    cubic = np.eye(3, dtype=int)*2
+    corners = list(itertools.product([-1, 1], repeat=3))
+    joints = [(0, 0, cubic), (0, 1, corners), (1, 1, cubic)]
+    d = _sublattice_network(shape=shape, offsets=offsets, joints=joints)
+    d['vert.coords'] = d['vert.coords']*spacing
     return d
 
 
@@ -78,7 +53,7 @@ if __name__ == '__main__':
     import openpnm as op
     import matplotlib.pyplot as plt
     pn = op.network.GenericNetwork()
-    net = bcc([3, 3, 3], 1, mode='tri')
+    net = bcc([3, 3, 3], 1)
     net['pore.coords'] = net.pop('vert.coords')
     net['throat.conns'] = net.pop('edge.conns')
     pn.update(net)
@@ -1,18 +1,10 @@
-import scipy.spatial as sptl
-import scipy.sparse as sprs
-from openpnm.topotools.generators import cubic
-from openpnm.topotools import tri_to_am
+import warnings
+import itertools
 import numpy as np
-from numba import njit
+from openpnm.topotools.generators.tools import _sublattice_network
 
 
-@njit
-def len_lil(lil):
-    indptr = [len(i) for i in lil]
-    return indptr
-
-
-def fcc(shape, spacing=1, mode='kdtree'):
+def fcc(shape, spacing=1, mode=None):
     r"""
     Generate a face-centered cubic lattice
 
@@ -25,15 +17,9 @@ def fcc(shape, spacing=1, mode='kdtree'):
         The size of a unit cell in each direction. If an scalar is given it is
         applied in all 3 directions.
     mode : str
-        Dictate how neighbors are found.  Options are:
-
-            ===============  =====================================================
-            mode             meaning
-            ===============  =====================================================
-            'kdtree'         Uses ``scipy.spatial.KDTree`` to find all neighbors
-                             within the unit cell.
-            'triangulation'  Uses ``scipy.spatial.Delaunay`` to find all neighbors.
-            ===============  =====================================================
+        This argument is deprecated and ignored. Neighbors used to be found
+        with ``scipy.spatial.KDTree`` or ``scipy.spatial.Delaunay``, but are
+        now found formulaically.
 
     Returns
     -------
@@ -42,61 +28,35 @@ def fcc(shape, spacing=1, mode='kdtree'):
 
     Notes
     -----
-    It is not clear whether KDTree of Delaunay are faster. In fact it is
-    surely possible to find the neighbors formulaically but this is not
-    implemented yet.
+    The corner sites are connected to their 6 cubic neighbors, and each
+    face site is connected to its 12 nearest neighbors, which are the 4
+    corners of its face and the 8 face sites of the adjacent faces. The
+    corner sites come first, followed by the face sites normal to the z, y
+    and x directions.
 
-    """
-    shape = np.array(shape) + 1
-    # Create base cubic network of corner sites
-    net1 = cubic(shape=shape)
-    # Create 3 networks to become face sites
-    net2 = cubic(shape=shape - [1, 1, 0])
-    net3 = cubic(shape=shape - [1, 0, 1])
-    net4 = cubic(shape=shape - [0, 1, 1])
-    # Offset pore coords by 1/2 a unit cell
-    net2['vert.coords'] += np.array([0.5, 0.5, 0])
-    net3['vert.coords'] += np.array([0.5, 0, 0.5])
-    net4['vert.coords'] += np.array([0, 0.5, 0.5])
-    crds = np.concatenate((net1['vert.coords'],
-                           net2['vert.coords'],
-                           net3['vert.coords'],
-                           net4['vert.coords']))
-    if mode.startswith('tri'):
-        tri = sptl.Delaunay(points=crds)
-        am = tri_to_am(tri)
-        conns = np.vstack((am.row, am.col)).T
-        # Trim diagonal connections between cubic pores
-        L = np.sqrt(np.sum(np.diff(crds[conns], axis=1)**2, axis=2)).flatten()
-        conns = conns[L <= 0.75]
-    elif mode.startswith('kd'):
-        tree1 = sptl.KDTree(crds)
-        # Method 1
-        hits = tree1.query_ball_point(crds, r=.75)
-        # Method 2: Not sure which is faster
-        # tree2 = sptl.KDTree(crds)
-        # hits = tree1.query_ball_tree(tree1, r=1)
-        indices = np.hstack(hits)
-        # Convert to CSR matrix
-        indptr = [len(i) for i in hits]
-        indptr.insert(0, 0)
-        indptr = np.cumsum(indptr)
-        am = sprs.csr_matrix((np.ones_like(indices), indices, indptr))
-        am = sprs.triu(am, k=1)
-        am = am.tocoo()
-        conns = np.vstack((am.row, am.col)).T
-    conns = np.vstack((net1['edge.conns'], conns))
+    The connections are found by index arithmetic between the four
+    sublattices, so the time and memory needed grow linearly with the
+    number of unit cells.
 
-    d = {}
-    d['vert.coords'] = crds*spacing
-    d['edge.conns'] = conns
+    """
+    if mode is not None:
+        warnings.warn("'mode' has been deprecated, neighbors are now found "
+                      "formulaically", DeprecationWarning)
+    offsets = [[0, 0, 0], [1, 1, 0], [1, 0, 1], [0, 1, 1]]
+    # The 12 nearest neighbors lie half a cell away along two axes
+    nearest = [s for s in itertools.product([-1, 0, 1], repeat=3)
+               if np.count_nonzero(s) == 2]
+    joints = [(0, 0, np.eye(3, dtype=int)*2)]
+    joints += [(a, b, nearest) for a, b in itertools.combinations(range(4), 2)]
+    d = _sublattice_network(shape=shape, offsets=offsets, joints=joints)
+    d['vert.coords'] = d['vert.coords']*spacing
     return d
 
 
 if __name__ == '__main__':
     import openpnm as op
     import matplotlib.pyplot as plt
-    net = fcc([3, 3, 3], 1, mode='tri')
+    net = fcc([3, 3, 3], 1)
     net['pore.coords'] = net.pop('vert.coords')
     net['throat.conns'] = net.pop('edge.conns')
     pn = op.network.GenericNetwork()
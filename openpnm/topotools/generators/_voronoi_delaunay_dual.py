@@ -1,5 +1,5 @@
+from itertools import chain
 import scipy.spatial as sptl
-import scipy.sparse as sprs
 import numpy as np
 
 
@@ -28,7 +28,7 @@ def voronoi_delaunay_dual(points, shape, crop=False):
         The Delaunay triangulation object produced ``scipy.spatial.Delaunay``
 
     """
-    from openpnm.topotools import isoutside, conns_to_am
+    from openpnm.topotools import isoutside
     from openpnm.topotools.generators import tools
     # Generate a set of base points if number was given
     points = tools.parse_points(points=points, shape=shape)
@@ -40,37 +40,9 @@ def voronoi_delaunay_dual(points, shape, crop=False):
 
     # Combine points
     pts_all = np.vstack((vor.points, vor.vertices))
-    Nall = np.shape(pts_all)[0]
-
-    # Create adjacency matrix in lil format for quick construction
-    am = sprs.lil_matrix((Nall, Nall))
-    for ridge in vor.ridge_dict.keys():
-        # Make Delaunay-to-Delaunay connections
-        for i in ridge:
-            am.rows[i].extend([ridge[0], ridge[1]])
-        # Get Voronoi vertices for current ridge
-        row = vor.ridge_dict[ridge].copy()
-        # Index Voronoi vertex numbers by number of Delaunay points
-        row = [i + vor.npoints for i in row if i > -1]
-        # Make Voronoi-to-Delaunay connections
-        for i in ridge:
-            am.rows[i].extend(row)
-        # Make Voronoi-to-Voronoi connections
-        row.append(row[0])
-        for i in range(len(row)-1):
-            am.rows[row[i]].append(row[i+1])
-
-    # Finalize adjacency matrix by assigning data values
-    am.data = am.rows  # Values don't matter, only shape, so use 'rows'
-    # Convert to COO format for direct acces to row and col
-    am = am.tocoo()
-    # Extract rows and cols
-    conns = np.vstack((am.row, am.col)).T
-
-    # Convert to sanitized adjacency matrix
-    am = conns_to_am(conns)
-    # Finally, retrieve conns back from am
-    conns = np.vstack((am.row, am.col)).T
+
+    # Expand the ridges into sanitized connections
+    conns = _dual_conns(vor)
 
     # Convert coords to 3D by adding col of 0's if necessary
     coords = np.around(pts_all, decimals=10)
@@ -94,6 +66,64 @@ def voronoi_delaunay_dual(points, shape, crop=False):
     return network, vor, tri
 
 
+def _dual_conns(vor):
+    r"""
+    Expands the ridges of a Voronoi tessellation into the connections of
+    the dual Voronoi-Delaunay network
+
+    Parameters
+    ----------
+    vor : Voronoi object
+        The tessellation produced by ``scipy.spatial.Voronoi``
+
+    Returns
+    -------
+    conns : ndarray
+        The unique connections, sorted by row then column and with the
+        lower index first. The Voronoi vertices are numbered after the
+        ``vor.npoints`` base points, and the array is ``int32`` unless the
+        number of nodes requires ``int64``.
+
+    Notes
+    -----
+    Each ridge connects its two base points to each other and to each of
+    its finite vertices, and connects its finite vertices in a closed ring.
+    The ragged list of vertices on each ridge is flattened with its row
+    offsets so the whole expansion is done with array operations.
+
+    """
+    Np = vor.npoints
+    N = Np + vor.vertices.shape[0]
+    rp = np.asarray(vor.ridge_points, dtype=np.int64)
+    counts = np.fromiter(map(len, vor.ridge_vertices), dtype=np.int64,
+                         count=len(vor.ridge_vertices))
+    verts = np.fromiter(chain.from_iterable(vor.ridge_vertices),
+                        dtype=np.int64, count=counts.sum())
+    ridge = np.repeat(np.arange(counts.size), counts)
+    # Drop the vertices at infinity and number the rest after the points
+    keep = verts > -1
+    verts, ridge = verts[keep] + Np, ridge[keep]
+    # Pair each vertex with the next one on its ridge, closing the ring
+    new = np.ones(ridge.size + 1, dtype=bool)
+    new[1:-1] = ridge[1:] != ridge[:-1]
+    nxt = np.arange(1, ridge.size + 1)
+    nxt[new[1:]] = np.flatnonzero(new[:-1])
+    conns = np.concatenate((
+        rp,                                         # Delaunay-to-Delaunay
+        np.column_stack((rp[ridge, 0], verts)),     # Voronoi-to-Delaunay
+        np.column_stack((rp[ridge, 1], verts)),
+        np.column_stack((verts, verts[nxt])),       # Voronoi-to-Voronoi
+    ))
+    # Sanitize: upper triangular, no self-connections and no duplicates
+    conns.sort(axis=1)
+    conns = conns[conns[:, 0] != conns[:, 1]]
+    keys = np.unique(conns[:, 0]*N + conns[:, 1])
+    dtype = np.int32 if N <= np.iinfo(np.int32).max else np.int64
+    conns = np.empty((keys.size, 2), dtype=dtype)
+    conns[:, 0], conns[:, 1] = np.divmod(keys, N)
+    return conns
+
+
 if __name__ == "__main__":
     dvd, vor, tri = voronoi_delaunay_dual(points=50, shape=[1, 0, 1])
     print(dvd.keys())
@@ -55,8 +55,9 @@ def trim(network, vert_ids=None, edge_ids=None):
         edges = np.any(np.isin(network['edge.conns'], vert_ids), axis=1)
         network = trim(network, edge_ids=edges)
         # Renumber throat conns
-        remapping = np.cumsum(keep) - 1
-        network['edge.conns'] = remapping[network['edge.conns']]
+        conns = network['edge.conns']
+        remapping = (np.cumsum(keep) - 1).astype(conns.dtype, copy=False)
+        network['edge.conns'] = remapping[conns]
     return network
 
 
@@ -270,3 +271,74 @@ def crop(network, shape, mode='full'):
         network['vert.outside'] = np.zeros(network['vert.coords'].shape[0], dtype=bool)
         network['vert.outside'][Pdrop] = True
     return network
+
+
+def _sublattice_network(shape, offsets, joints):
+    r"""
+    Generates interpenetrating cubic sublattices and their connections
+    from index arithmetic alone
+
+    Parameters
+    ----------
+    shape : array_like
+        The number of unit cells in each direction
+    offsets : list of array_like
+        The position of each sublattice within the unit cell in half-cell
+        units, either 0 or 1 in each direction. A sublattice with offset
+        ``p`` has ``shape + 1 - p`` sites and they are numbered in this
+        order, with each sublattice in the same order as ``cubic``.
+    joints : list of tuples
+        Each tuple ``(a, b, steps)`` connects every site of sublattice
+        ``a`` to the site of sublattice ``b`` found at each displacement
+        in ``steps``, given in half-cell units. Displacements that do not
+        land on sublattice ``b`` are skipped. To list each connection once
+        ``a`` must not exceed ``b``, and if they are equal each step must
+        point along a positive axis.
+
+    Returns
+    -------
+    network : dict
+        A dictionary containing 'vert.coords' and 'edge.conns'
+
+    Notes
+    -----
+    The neighbors of each site are found by shifting slices of the index
+    array of one sublattice against another, as done in ``cubic``, so no
+    spatial search is needed and the memory use is linear in the number of
+    connections. The lower index of each connection is listed first.
+
+    """
+    cells = np.array(shape, dtype=int)
+    offsets = [np.array(p, dtype=int) for p in offsets]
+    shapes = [cells + 1 - p for p in offsets]
+    sizes = [np.prod(s) for s in shapes]
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+    idx = [np.arange(starts[i], starts[i+1]).reshape(shapes[i])
+           for i in range(len(shapes))]
+    # Find the overlapping slices for each displacement before filling
+    blocks = []
+    for a, b, steps in joints:
+        for step in steps:
+            shift = offsets[a] + np.array(step) - offsets[b]
+            if np.any(shift % 2):
+                continue
+            shift = shift // 2
+            lo = np.maximum(0, -shift)
+            hi = np.minimum(shapes[a], shapes[b] - shift)
+            if np.any(hi <= lo):
+                continue
+            tails = tuple(slice(i, j) for i, j in zip(lo, hi))
+            heads = tuple(slice(i, j) for i, j in zip(lo + shift, hi + shift))
+            blocks.append((idx[a][tails], idx[b][heads]))
+    n = [T.size for T, H in blocks]
+    bounds = np.concatenate(([0], np.cumsum(n, dtype=int)))
+    conns = np.empty((bounds[-1], 2), dtype=int)
+    for (T, H), i, j in zip(blocks, bounds[:-1], bounds[1:]):
+        conns[i:j, 0] = T.ravel()
+        conns[i:j, 1] = H.ravel()
+    coords = [np.indices(s).reshape(3, -1).T + 0.5 + p/2
+              for s, p in zip(shapes, offsets)]
+    d = {}
+    d['vert.coords'] = np.concatenate(coords)
+    d['edge.conns'] = conns
+    return d
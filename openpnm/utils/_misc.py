@@ -17,6 +17,8 @@ __all__ = [
     'SubDict',
     'NestedDict',
     'HealthDict',
+    'LazyArray',
+    'RaggedArray',
     'tic',
     'toc',
     'unique_list',
@@ -234,6 +236,212 @@ class HealthDict(PrintableDict):
     health = property(fget=_get_health)
 
 
+class LazyArray:
+    r"""
+    A placeholder for an array stored on disk, such as an HDF5 dataset,
+    that is only read into memory when needed.
+
+    When stored on an OpenPNM object the full array is read and put in its
+    place the first time it is accessed. Indexing a ``LazyArray`` directly
+    reads only the requested values from disk.
+
+    Parameters
+    ----------
+    source : array_like
+        Any object with ``shape`` and ``dtype`` attributes that supports
+        indexing with slices and sorted integer indices, such as an
+        ``h5py.Dataset``.
+    index : array_like, optional
+        Sorted indices of the rows of ``source`` to include, so that only a
+        subset of the stored array is represented.
+
+    """
+
+    def __init__(self, source, index=None):
+        self._source = source
+        self._index = None if index is None else np.asarray(index)
+
+    def _get_shape(self):
+        if self._index is None:
+            return tuple(self._source.shape)
+        return (len(self._index), ) + tuple(self._source.shape[1:])
+
+    shape = property(_get_shape)
+    dtype = property(lambda self: self._source.dtype)
+    ndim = property(lambda self: len(self.shape))
+    size = property(lambda self: int(np.prod(self.shape)))
+    nbytes = property(lambda self: self.size*self.dtype.itemsize)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f'LazyArray(shape={self.shape}, dtype={self.dtype})'
+
+    def __getitem__(self, key):
+        if isinstance(key, (list, np.ndarray)):
+            key = np.asarray(key)
+            if key.dtype == bool:
+                key = np.where(key)[0]
+            key = np.where(key < 0, key + len(self), key)
+        if self._index is not None:
+            key = self._index[key]
+        if isinstance(key, np.ndarray):
+            if key.size == 0:
+                return np.zeros((0, ) + self.shape[1:], dtype=self.dtype)
+            # Disk-based sources usually only accept sorted, unique indices
+            locs, inv = np.unique(key, return_inverse=True)
+            return np.asarray(self._source[locs])[inv.flatten()]
+        return np.asarray(self._source[key])
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.load()
+        return arr if dtype is None else arr.astype(dtype)
+
+    def __deepcopy__(self, memo):
+        return self.load()
+
+    def __reduce__(self):
+        return (np.asarray, (self.load(), ))
+
+    def load(self):
+        r"""
+        Reads and returns the full array
+        """
+        if self._index is None:
+            return np.asarray(self._source[()])
+        return self[:]
+
+
+class RaggedArray:
+    r"""
+    A list of integer arrays of differing lengths, stored in compressed
+    sparse row (CSR) form.
+
+    The values of all rows are stored back to back in a single ``indices``
+    array, and row ``i`` holds ``indices[indptr[i]:indptr[i+1]]``. This is
+    the layout of the ``indptr`` and ``indices`` attributes of
+    ``scipy.sparse.csr_matrix``, so the rows of a CSR matrix can be wrapped
+    without copying. Selecting several rows returns a new ``RaggedArray``
+    and is done without creating any per-row Python objects.
+
+    Parameters
+    ----------
+    indptr : array_like
+        The locations in ``indices`` where each row starts, with one extra
+        value at the end giving the total length
+    indices : array_like
+        The values of all rows, concatenated
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from openpnm.utils import RaggedArray
+    >>> r = RaggedArray(indptr=[0, 2, 2, 5], indices=[4, 7, 1, 2, 3])
+    >>> len(r)
+    3
+    >>> r[2]
+    array([1, 2, 3])
+    >>> r[[2, 0]].indices
+    array([1, 2, 3, 4, 7])
+    >>> r.counts
+    array([2, 0, 3])
+
+    """
+
+    def __init__(self, indptr, indices):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __repr__(self):
+        return f'RaggedArray(rows={len(self)}, size={self.indptr[-1]})'
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            return self.indices[self.indptr[key]:self.indptr[key+1]]
+        rows = np.arange(len(self))[key]
+        starts = self.indptr[rows]
+        counts = self.indptr[rows + 1] - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        # Shift the location of each value from its new row to its old one
+        locs = np.arange(indptr[-1]) + np.repeat(starts - indptr[:-1], counts)
+        return RaggedArray(indptr=indptr, indices=self.indices[locs])
+
+    @property
+    def counts(self):
+        r"""
+        The number of values in each row
+        """
+        return np.diff(self.indptr)
+
+    @property
+    def rows(self):
+        r"""
+        The row of each value in ``indices``
+        """
+        return np.repeat(np.arange(len(self)), self.counts)
+
+    def compress(self, mask):
+        r"""
+        Returns a new ``RaggedArray`` keeping only the values where ``mask``
+        is ``True``
+
+        Parameters
+        ----------
+        mask : ndarray
+            A boolean array the same length as ``indices``
+        """
+        counts = np.bincount(self.rows[mask], minlength=len(self))
+        indptr = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return RaggedArray(indptr=indptr, indices=self.indices[mask])
+
+    def reduce(self, ufunc, values, fill=np.nan):
+        r"""
+        Applies ``ufunc.reduce`` to the values found at the indices of each
+        row
+
+        Parameters
+        ----------
+        ufunc : numpy.ufunc
+            The function used to reduce the values, such as ``np.add`` or
+            ``np.minimum``
+        values : ndarray
+            The array indexed by ``indices``
+        fill : scalar
+            The result for empty rows. The default is ``nan``.
+
+        Returns
+        -------
+        result : ndarray
+            An array with one value per row
+        """
+        values = np.asarray(values)[self.indices]
+        counts = self.counts
+        result = np.full(len(self), fill, dtype=np.result_type(values, fill))
+        full = counts > 0
+        if np.any(full):
+            result[full] = ufunc.reduceat(values, self.indptr[:-1][full])
+        return result
+
+    def tolist(self):
+        r"""
+        Returns the rows as a list of arrays
+        """
+        if len(self) == 0:
+            return []
+        return np.split(self.indices, self.indptr[1:-1])
+
+
 """
 BSD 3-Clause License
 
@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import logging
+import functools
+import threading
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['Profiler', 'ProfileReport', 'profiled']
+
+
+class ProfileReport(dict):
+    r"""
+    A dictionary of aggregated timings, keyed by ``'category: name'``, that
+    prints as a table sorted by total time.
+    """
+
+    def __str__(self):
+        hr = '―'*78
+        fmt = '{0:<38} {1:>7} {2:>10} {3:>10} {4:>10}'
+        lines = [hr]
+        lines.append(fmt.format('Event', 'Calls', 'Total (s)',
+                                'Mean (s)', 'Out (MB)'))
+        lines.append(hr)
+        items = sorted(self.items(), key=lambda x: -x[1]['total_time'])
+        for key, v in items:
+            name = key if len(key) <= 38 else key[:35] + '...'
+            lines.append(fmt.format(name, v['calls'],
+                                    f"{v['total_time']:.4g}",
+                                    f"{v['mean_time']:.4g}",
+                                    f"{v['output_bytes']/1e6:.4g}"))
+        lines.append(hr)
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Profiler:
+    r"""
+    Records the call count, wall time, and size of the outputs of the
+    instrumented parts of OpenPNM, namely pore-scale models, the assembly
+    and solution steps of transport algorithms, and the io exporters.
+
+    This class is a singleton so the same instance is obtained wherever it
+    is instantiated. Recording is off by default, and the instrumented
+    functions only check a single flag when it is off.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> prof = op.utils.Profiler()
+    >>> pn = op.network.Cubic(shape=[5, 5, 5])
+    >>> with prof:
+    ...     geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps,
+    ...                                           throats=pn.Ts)
+    >>> report = pn.project.profile_report()
+    >>> report['model: pore.diameter']['calls']
+    1
+    >>> prof.clear()
+
+    """
+
+    __instance__ = None
+
+    def __new__(cls, *args, **kwargs):
+        if Profiler.__instance__ is None:
+            Profiler.__instance__ = object.__new__(cls)
+            Profiler.__instance__.enabled = False
+            Profiler.__instance__.records = []
+            Profiler.__instance__._local = threading.local()
+        return Profiler.__instance__
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.disable()
+
+    def enable(self):
+        r"""Starts recording events"""
+        self.enabled = True
+
+    def disable(self):
+        r"""Stops recording events, but keeps those recorded so far"""
+        self.enabled = False
+
+    def clear(self):
+        r"""Removes all recorded events"""
+        self.records.clear()
+
+    def _get_stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _select(self, project=None):
+        if project is None:
+            return self.records
+        name = project if isinstance(project, str) else project.name
+        return [r for r in self.records if r['project'] == name]
+
+    def report(self, project=None):
+        r"""
+        Aggregates the recorded events by category and name
+
+        Parameters
+        ----------
+        project : Project or str, optional
+            If given, only the events associated with this project are
+            included.
+
+        Returns
+        -------
+        report : ProfileReport
+            A dictionary with one entry per distinct event, containing the
+            number of calls, the total and mean wall time in seconds, the
+            total size in bytes of the outputs, and the last seen input and
+            output shapes.
+
+        """
+        report = ProfileReport()
+        for r in self._select(project):
+            key = r['cat'] + ': ' + r['name']
+            if key not in report:
+                report[key] = {'calls': 0, 'total_time': 0.0,
+                               'mean_time': 0.0, 'output_bytes': 0}
+            v = report[key]
+            v['calls'] += 1
+            v['total_time'] += r['dur']
+            v['output_bytes'] += r['output_bytes']
+            v['input_shapes'] = r['input_shapes']
+            v['output_shapes'] = r['output_shapes']
+        for v in report.values():
+            v['mean_time'] = v['total_time']/v['calls']
+        return report
+
+    def to_json(self, filename, project=None):
+        r"""
+        Writes the raw list of recorded events to a json file
+
+        Parameters
+        ----------
+        filename : str or path object
+            The name of the file to write
+        project : Project or str, optional
+            If given, only the events associated with this project are
+            written.
+
+        """
+        with open(filename, 'w') as f:
+            json.dump(self._select(project), f, indent=1)
+
+    def to_chrome_trace(self, filename, project=None):
+        r"""
+        Writes the recorded events in the Trace Event Format, which can be
+        opened with ``chrome://tracing`` or `Perfetto <https://ui.perfetto.dev>`_
+
+        Parameters
+        ----------
+        filename : str or path object
+            The name of the file to write
+        project : Project or str, optional
+            If given, only the events associated with this project are
+            written.
+
+        """
+        events = []
+        for r in self._select(project):
+            args = {k: r[k] for k in ['project', 'object', 'output_bytes',
+                                      'input_shapes', 'output_shapes']}
+            events.append({'name': r['name'], 'cat': r['cat'], 'ph': 'X',
+                           'ts': r['ts']*1e6, 'dur': r['dur']*1e6,
+                           'pid': r['pid'], 'tid': r['tid'], 'args': args})
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+_profiler = Profiler()
+
+
+def _shape(arr):
+    if hasattr(arr, 'shape'):
+        return list(np.shape(arr))
+    if isinstance(arr, dict):
+        return {k: _shape(v) for k, v in arr.items()}
+    if isinstance(arr, (list, tuple)):
+        return [_shape(v) for v in arr]
+    return None
+
+
+def _nbytes(arr):
+    if isinstance(arr, np.ndarray):
+        return arr.nbytes
+    if hasattr(arr, 'data') and hasattr(arr, 'nnz'):  # Sparse matrices
+        return sum([getattr(arr, a).nbytes for a in
+                    ['data', 'indices', 'indptr', 'row', 'col']
+                    if hasattr(arr, a)])
+    if isinstance(arr, dict):
+        return sum([_nbytes(v) for v in arr.values()])
+    if isinstance(arr, (list, tuple)):
+        return sum([_nbytes(v) for v in arr])
+    return getattr(arr, 'nbytes', 0)
+
+
+def _find_obj(args, kwargs):
+    for item in list(args) + list(kwargs.values()):
+        if isinstance(item, (list, tuple)) and len(item):
+            item = item[0]
+        if hasattr(item, '_isa') or hasattr(item, 'network'):
+            return item
+    return None
+
+
+def profiled(category, name=None, output=None):
+    r"""
+    Decorator that records calls to the wrapped function on the
+    ``Profiler`` when it is enabled.
+
+    Parameters
+    ----------
+    category : str
+        The category under which the calls are recorded, such as 'model'
+        or 'io'.
+    name : callable, optional
+        Receives the arguments of the wrapped function and returns the name
+        of the event. If not given the qualified name of the wrapped
+        function is used.
+    output : callable, optional
+        Receives the arguments of the wrapped function after it has
+        returned and fetches its output, for functions that store their
+        result rather than returning it. If not given the returned value
+        is used.
+
+    Notes
+    -----
+    The shapes of any array arguments are recorded as the input shapes,
+    and the event is associated with the project of the first OpenPNM
+    object found in the arguments, or else with that of the enclosing
+    event.
+
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _profiler.enabled:
+                return function(*args, **kwargs)
+            stack = _profiler._get_stack()
+            obj = _find_obj(args, kwargs)
+            if obj is None:
+                project, objname = stack[-1] if stack else (None, None)
+            elif hasattr(obj, '_isa'):
+                project, objname = obj.project.name, obj.name
+            else:  # Received a Project
+                project, objname = obj.name, None
+            stack.append((project, objname))
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                stop = time.perf_counter()
+                stack.pop()
+            out = result if output is None else output(*args, **kwargs)
+            inputs = [_shape(a) for a in list(args) + list(kwargs.values())
+                      if hasattr(a, 'shape')]
+            _profiler.records.append({
+                'cat': category,
+                'name': function.__qualname__ if name is None
+                else name(*args, **kwargs),
+                'project': project,
+                'object': objname,
+                'ts': start,
+                'dur': stop - start,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'input_shapes': inputs,
+                'output_shapes': _shape(out),
+                'output_bytes': _nbytes(out),
+            })
+            return result
+        return wrapper
+    return decorator
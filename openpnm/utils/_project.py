@@ -1,12 +1,17 @@
+import os
+import shutil
 import logging
+import tempfile
 import time
 import uuid
+import weakref
 import openpnm
 import numpy as np
 from copy import deepcopy
 from openpnm.utils import HealthDict, Workspace
 from openpnm.utils import SettingsAttr
 from ._grid import Tableist
+from ._profiler import Profiler
 
 
 ws = Workspace()
@@ -19,8 +24,32 @@ class ProjectSettings(SettingsAttr):
     r"""
     uuid : str
         A universally unique identifier for the object to keep things straight
+    index_dtype : str
+        The integer type of ``'throat.conns'`` and of the pore and throat ids,
+        either 'int64' or 'int32'. The default is taken from the Workspace
+        settings. If the values do not fit in 'int32' they are left as 'int64'.
+    float32_props : list[str]
+        The properties that are stored in single precision when written to
+        any object in the Project. The default is taken from the Workspace
+        settings.
+    storage : str
+        Either 'memory' or 'memmap'. In the latter case arrays are written to
+        memory-mapped files in a scratch directory, and are only paged into
+        RAM as they are accessed. The default is taken from the Workspace
+        settings.
+    scratch_dir : str
+        The parent directory of the project's scratch directory, which is
+        deleted along with the project. If empty the system's temporary
+        directory is used.
+    memmap_threshold : int
+        Arrays smaller than this number of bytes are kept in memory.
     """
     uuid = ''
+    index_dtype = 'int64'
+    float32_props = []
+    storage = 'memory'
+    scratch_dir = ''
+    memmap_threshold = 2**20
 
 
 class Project(list):
@@ -53,6 +82,12 @@ class Project(list):
         name = kwargs.pop('name', None)
         super().__init__(*args, **kwargs)
         self.settings = ProjectSettings()
+        self.settings.index_dtype = ws.settings.index_dtype
+        self.settings.float32_props = list(ws.settings.float32_props)
+        self.settings.storage = ws.settings.storage
+        self.settings.scratch_dir = ws.settings.scratch_dir
+        self.settings.memmap_threshold = ws.settings.memmap_threshold
+        self._scratch = None
         ws[name] = self  # Register self with workspace
         self.settings['uuid'] = str(uuid.uuid4())
 
@@ -167,9 +202,9 @@ class Project(list):
                 except KeyError:
                     pass
 
-    def copy(self, name=None):
+    def copy(self, name=None, mode='deep'):
         r"""
-        Creates a deep copy of the current project
+        Creates a copy of the current project
 
         A deep copy means that new, unique versions of all the objects are
         created but with identical data and properties.
@@ -179,6 +214,19 @@ class Project(list):
         name : str
             The name to give to the new project. If not supplied, a name
             is automatically generated.
+        mode : str
+            Controls how the data arrays are copied. Options are:
+
+            =========== =====================================================
+            mode        meaning
+            =========== =====================================================
+            'deep'      (default) All arrays are duplicated.
+            'cow'       Copy-on-write. The numerical arrays of the new
+                        objects are read-only views of the original ones, so
+                        no data are duplicated. Writing a property with
+                        ``obj[key] = value`` gives the new object its own
+                        array while the original remains unchanged.
+            =========== =====================================================
 
         Returns
         -------
@@ -191,16 +239,67 @@ class Project(list):
         (``obj.settings['_uuid']``), but the uuid of the original object
         is also stored (``obj.settings['_uuid_old']``) for reference.
 
+        In ``'cow'`` mode labels and algorithms are still duplicated, since
+        they are typically altered in place, and the models of each object
+        are shallow copies which share their parameter values. Modifying a
+        shared array in place, such as ``pn['pore.coords'] += 1`` on the
+        copy, raises an error, so the full array must be reassigned
+        instead. The original project should not be modified in place while
+        its copies are in use.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[3, 3, 3])
+        >>> proj = pn.project.copy(mode='cow')
+        >>> pn2 = proj.network
+        >>> pn2['pore.coords'].base is pn['pore.coords']
+        True
+        >>> pn2['pore.coords'] = pn2['pore.coords'] * 2
+        >>> pn2['pore.coords'].base is pn['pore.coords']
+        False
+
         """
         if name is None:
             name = ws._gen_name()
-        proj = deepcopy(self)
+        if mode == 'deep':
+            memo = {}
+        elif mode == 'cow':
+            memo = self._cow_memo()
+        else:
+            raise Exception(f'Unrecognized mode: {mode}')
+        proj = deepcopy(self, memo)
+        proj._scratch = None
         for item in proj:
             item.settings['_uuid'] = str(uuid.uuid4())
         self.settings['_uuid'] = str(uuid.uuid4())
         ws[name] = proj
         return proj
 
+    def _cow_memo(self):
+        r"""
+        Returns a ``deepcopy`` memo which substitutes the numerical arrays
+        of each object with read-only views, and the models with shallow
+        copies.
+        """
+        memo = {}
+        for obj in self:
+            if obj._isa('algorithm'):
+                continue
+            for arr in dict.values(obj):
+                if (type(arr) not in [np.ndarray, np.memmap]) or \
+                        (arr.dtype == bool) or arr.dtype.hasobject:
+                    continue
+                view = arr.view()
+                view.flags.writeable = False
+                memo[id(arr)] = view
+            if hasattr(obj, 'models'):
+                models = obj.models.__class__()
+                for key, mod in obj.models.items():
+                    dict.__setitem__(models, key, mod.__class__(mod))
+                memo[id(obj.models)] = models
+        return memo
+
     @property
     def workspace(self):
         return ws
@@ -666,6 +765,125 @@ class Project(list):
     def __repr__(self):
         return self.__str__()
 
+    def _cast_to_policy(self, key, value):
+        r"""
+        Casts the given array to the dtype required by the project settings,
+        or returns it unchanged if the policy does not apply to ``key``.
+        """
+        if key in ['throat.conns', 'pore._id', 'throat._id']:
+            dtype = np.dtype(self.settings.index_dtype)
+            if (value.dtype == dtype) or (value.dtype.kind not in 'iu'):
+                return value
+            if value.size and (value.max() > np.iinfo(dtype).max):
+                logger.warning(f'Values in {key} exceed the range of {dtype}'
+                               + ', so it will be stored as int64')
+                return value.astype(np.int64)
+            return value.astype(dtype)
+        if (key in self.settings.float32_props) and \
+                (value.dtype.kind == 'f') and (value.dtype != np.float32):
+            return value.astype(np.float32)
+        return value
+
+    def _get_scratch(self):
+        r"""
+        Returns the project's scratch directory, creating it if needed. The
+        directory and its contents are deleted when the project is.
+        """
+        path = getattr(self, '_scratch', None)
+        if (path is None) or not os.path.isdir(path):
+            parent = self.settings.scratch_dir or None
+            path = tempfile.mkdtemp(prefix='openpnm_', dir=parent)
+            weakref.finalize(self, shutil.rmtree, path, True)
+            self._scratch = path
+        return path
+
+    def _to_storage(self, obj, key, value):
+        r"""
+        Copies the given array into a memory-mapped file in the scratch
+        directory if the project settings call for it, otherwise returns it
+        unchanged. The file holding the previous values of ``key`` on
+        ``obj``, if any, is deleted.
+
+        The arrays of algorithms are always kept in memory since they are
+        used directly by the solvers.
+        """
+        s = self.settings
+        if (s.storage != 'memmap') or (value.nbytes < s.memmap_threshold):
+            return value
+        if obj._isa('algorithm'):
+            return value
+        if (type(value) not in [np.ndarray, np.memmap]) or \
+                (value.dtype.hasobject):
+            return value
+        fname = os.path.join(self._get_scratch(), uuid.uuid4().hex + '.npy')
+        arr = np.lib.format.open_memmap(fname, mode='w+', dtype=value.dtype,
+                                        shape=value.shape)
+        arr[:] = value
+        old = dict.get(obj, key, None)
+        if isinstance(old, np.memmap) and (old.filename is not None) and \
+                (os.path.dirname(old.filename) == self._scratch):
+            try:
+                os.remove(old.filename)
+            except OSError:  # File is still mapped on some platforms
+                pass
+        return arr
+
+    def apply_dtype_policy(self):
+        r"""
+        Casts the arrays already stored on all objects in the project to the
+        dtypes given by ``index_dtype`` and ``float32_props`` in the project
+        settings.
+
+        Notes
+        -----
+        Arrays written after the settings are changed are cast automatically,
+        so this is only needed for data that already exist.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[3, 3, 3])
+        >>> pn['throat.conns'].dtype
+        dtype('int64')
+        >>> pn.project.settings.index_dtype = 'int32'
+        >>> pn.project.apply_dtype_policy()
+        >>> pn['throat.conns'].dtype
+        dtype('int32')
+
+        """
+        for obj in self:
+            for key in list(obj.keys(mode='all')):
+                value = dict.__getitem__(obj, key)
+                new = self._cast_to_policy(key, value)
+                if new is not value:
+                    dict.__setitem__(obj, key, new)
+        if self.network is not None:
+            self.network._invalidate_topology()
+
+    def profile_report(self):
+        r"""
+        Returns the call counts and timings recorded for this project by
+        the ``Profiler``
+
+        Returns
+        -------
+        report : ProfileReport
+            A dictionary of aggregated timings for each event, which prints
+            as a table.
+
+        See Also
+        --------
+        Profiler
+
+        Notes
+        -----
+        Recording is off by default, and must be started with
+        ``op.utils.Profiler().enable()`` before running the steps to be
+        profiled.
+
+        """
+        return Profiler().report(project=self)
+
     def check_geometry_health(self):
         r"""
         Performs a check to find pores with overlapping or undefined
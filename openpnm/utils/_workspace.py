@@ -29,8 +29,31 @@ class WorkspaceSettings(SettingsAttr):
         50      CRITICAL: A serious error, indicating that the program itself
                 may be unable to continue running.
         ======= ==============================================================
+    index_dtype : str
+        The integer type used by new Projects for ``'throat.conns'`` and the
+        pore and throat ids. Can be 'int64' (default) or 'int32', which
+        halves the memory used by the topology of large networks.
+    float32_props : list[str]
+        The properties which new Projects store in single precision, such as
+        ``['pore.diameter', 'throat.diameter']``.  These are cast back to
+        double precision when the coefficient matrices are built.
+    storage : str
+        Where new Projects keep their arrays. Options are 'memory' (default)
+        or 'memmap', which stores them in memory-mapped files so that
+        networks larger than the available RAM can be handled.
+    scratch_dir : str
+        The directory in which the memory-mapped files are created. If not
+        given the system's temporary directory is used.
+    memmap_threshold : int
+        Arrays smaller than this number of bytes are kept in memory even
+        when ``storage`` is 'memmap'.
     """
     default_solver = 'PardisoSpsolve'
+    index_dtype = 'int64'
+    float32_props = []
+    storage = 'memory'
+    scratch_dir = ''
+    memmap_threshold = 2**20
 
     @property
     def loglevel(self):
@@ -110,7 +133,7 @@ class Workspace(dict):
     def version(self):
         return openpnm.__version__
 
-    def save_workspace(self, filename=None):
+    def save_workspace(self, filename=None, max_workers=None):
         r"""
         Saves all projects in the current workspace as a single file
 
@@ -119,6 +142,10 @@ class Workspace(dict):
         filename : str
             The filename to use when saving.  If not provided, the present
             date and time are used.
+        max_workers : int, optional
+            The number of projects that are serialized concurrently. If not
+            given the default of ``concurrent.futures.ThreadPoolExecutor``
+            is used.
 
         Notes
         -----
@@ -127,18 +154,37 @@ class Workspace(dict):
         ``pnm`` file can be loaded manually using ``load_project`` or the
         ``openpnm.io.PNM`` class.
 
+        Each project is written to an in-memory ``pnm`` file which is then
+        added to the archive, so no temporary files are created. The
+        arrays are already compressed within the ``pnm`` files so they are
+        stored in the archive without further compression.
+
         """
+        import io
         from datetime import datetime
+        from zipfile import ZipFile, ZIP_STORED
+        from concurrent.futures import ThreadPoolExecutor
+        from openpnm.io import PNM
         if filename is None:
             dt = datetime.now()
             filename = dt.strftime("%Y_%m_%d_%H_%M_%S")
-        from zipfile import ZipFile
-        with ZipFile(filename + '.wrk', 'w') as z:
-            for prj in self.values():
-                prj.save_project()
-                z.write(prj.name + '.pnm')
-
-    def load_workspace(self, filename):
+        filename = str(filename)
+        if not filename.endswith('.wrk'):
+            filename = filename + '.wrk'
+
+        def serialize(prj):
+            buffer = io.BytesIO()
+            PNM.save_project(project=prj, filename=buffer)
+            return buffer
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            with ZipFile(filename, 'w', compression=ZIP_STORED) as z:
+                projects = list(self.values())
+                buffers = executor.map(serialize, projects)
+                for prj, buffer in zip(projects, buffers):
+                    z.writestr(prj.name + '.pnm', buffer.getbuffer())
+
+    def load_workspace(self, filename, max_workers=None):
         r"""
         Loads project(s) from a saved workspace into current workspace
 
@@ -146,18 +192,38 @@ class Workspace(dict):
         ----------
         filename : str or Path
             The filename containing the saved workspace
+        max_workers : int, optional
+            The number of projects that are read concurrently. If not given
+            the default of ``concurrent.futures.ThreadPoolExecutor`` is used.
+
+        Returns
+        -------
+        projects : list[Project]
+            The loaded projects
 
         Notes
         -----
-        ??
+        The projects are read directly from the archive, without extracting
+        any files. Projects are renamed if a project of the same name is
+        already open.
 
         """
+        import io
         from zipfile import ZipFile
+        from concurrent.futures import ThreadPoolExecutor
+        from openpnm.io import PNM
+
+        def read(z, name):
+            return PNM._read_project(io.BytesIO(z.read(name)))
+
         with ZipFile(filename, 'r') as z:
-            logger.info('Loading projects contained in ' + filename)
-            files = z.filelist
-            for f in files:
-                self.load_project(f.orig_filename)
+            logger.info('Loading projects contained in ' + str(filename))
+            names = [f.filename for f in z.filelist
+                     if f.filename.endswith('.pnm')]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                contents = list(executor.map(lambda n: read(z, n), names))
+        # Objects are created serially since this modifies the Workspace
+        return [PNM._create_project(c) for c in contents]
 
     def save_project(self, project, filename=None):
         r"""
@@ -237,7 +303,7 @@ class Workspace(dict):
         """
         del self[project.name]
 
-    def copy_project(self, project, name=None):
+    def copy_project(self, project, name=None, mode='deep'):
         r"""
         Makes a copy of an existing Project
 
@@ -248,6 +314,10 @@ class Workspace(dict):
         name : str, optional
             A name for the new copy of the project. If not supplied, then
             one will be generated (e.g. 'proj_02')
+        mode : str, optional
+            Either 'deep' (default) or 'cow' for a copy-on-write copy which
+            shares the arrays of the original. See ``Project.copy`` for
+            details.
 
         Returns
         -------
@@ -255,7 +325,7 @@ class Workspace(dict):
             A handle to the new Project
 
         """
-        proj = project.copy(name)
+        proj = project.copy(name, mode=mode)
         return proj
 
     def new_project(self, name=None):
@@ -62,6 +62,37 @@ class GenericTransportTest:
         # Ensure solution object is attached to the algorithm
         assert isinstance(alg.soln[quantity], SteadyStateSolution)
 
+    def test_matrix_free(self):
+        net = op.network.Cubic(shape=[9, 7, 5], lazy=True)
+        phase = op.phase.GenericPhase(network=net)
+        np.random.seed(0)
+        phase['throat.conductance'] = np.random.rand(net.Nt) + 0.5
+        x = []
+        for matrix_free in [False, True]:
+            alg = op.algorithms.GenericTransport(network=net, phase=phase)
+            alg.settings._update({'quantity': 'pore.x',
+                                  'conductance': 'throat.conductance',
+                                  'matrix_free': matrix_free})
+            alg.set_value_BC(pores=net.pores('left'), values=1)
+            alg.set_value_BC(pores=net.pores('right'), values=0)
+            alg.set_rate_BC(pores=net.pores('top')[:3], rates=0.1)
+            alg.run()
+            x.append(alg.x)
+        nt.assert_allclose(x[0], x[1], rtol=1e-6)
+        # A direct solver assembles the operator into a sparse matrix
+        alg.run(solver=op.solvers.ScipySpsolve())
+        nt.assert_allclose(x[0], alg.x)
+        net = op.network.Cubic(shape=[9, 7, 5])
+        op.topotools.trim(network=net, pores=[0])
+        phase = op.phase.GenericPhase(network=net)
+        phase['throat.conductance'] = 1.0
+        alg = op.algorithms.GenericTransport(network=net, phase=phase)
+        alg.settings._update({'quantity': 'pore.x',
+                              'conductance': 'throat.conductance',
+                              'matrix_free': True})
+        with pytest.raises(Exception):
+            alg.A
+
     def test_two_value_conditions(self):
         alg = op.algorithms.GenericTransport(network=self.net,
                                              phase=self.phase)
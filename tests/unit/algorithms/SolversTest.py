@@ -23,6 +23,15 @@ class SolversTest:
         self.alg.set_value_BC(pores=self.net.pores('front'), values=1.0)
         self.alg.set_value_BC(pores=self.net.pores('bottom'), values=0.0)
 
+    def test_scipy_cg(self):
+        self.alg.run(solver=op.solvers.ScipySpsolve())
+        x = self.alg.x.copy()
+        self.alg.run(solver=op.solvers.ScipyCG(tol=1e-10))
+        nt.assert_allclose(self.alg.x, x, rtol=1e-6)
+        assert self.alg.soln.is_converged
+        self.alg.run(solver=op.solvers.ScipyCG(maxiter=1))
+        assert not self.alg.soln.is_converged
+
     # def test_solver_not_available(self):
     #     self.alg.settings['solver_family'] = 'not_supported_solver'
     #     with pytest.raises(Exception):
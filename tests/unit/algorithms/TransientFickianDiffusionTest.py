@@ -37,6 +37,24 @@ class TransientFickianDiffusionTest:
         actual = self.alg.x.mean()
         assert_allclose(actual, desired, rtol=1e-5)
 
+    def test_transient_fickian_diffusion_with_callback(self):
+        ts, xs = [], []
+
+        def callback(t, x):
+            ts.append(t)
+            xs.append(x.copy())
+
+        soln = self.alg.run(x0=0, tspan=(0, 10), saveat=2, callback=callback)
+        soln = soln['pore.concentration']
+        assert_allclose(ts, soln.t)
+        assert_allclose(np.array(xs).T, soln)
+        desired = 0.40803
+        assert_allclose(self.alg.x.mean(), desired, rtol=1e-5)
+        # Without saveat the callback is called after every step
+        ts.clear()
+        soln = self.alg.run(x0=0, tspan=(0, 10), callback=callback)
+        assert len(ts) == len(soln['pore.concentration'].t) > 2
+
     def teardown_class(self):
         ws = op.Workspace()
         ws.clear()
@@ -129,6 +129,31 @@ class ModelsTest:
         with pytest.raises(Exception):
             pn.models.dependency_list()
 
+    def test_dependency_list_cache_invalidation(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        const = op.models.misc.constant
+        pn.add_model(propname='pore.a', model=const, value=1.0)
+        pn.add_model(propname='pore.b', model=op.models.misc.scaled,
+                     prop='pore.c', factor=2.0, regen_mode='deferred')
+        tree = pn.models.dependency_list()
+        assert tree == pn.models.dependency_list()
+        assert 'pore.c' not in tree
+        # Adding a model must invalidate the cached order
+        pn.add_model(propname='pore.c', model=op.models.misc.scaled,
+                     prop='pore.a', factor=2.0)
+        tree = pn.models.dependency_list()
+        assert tree.index('pore.a') < tree.index('pore.c') < tree.index('pore.b')
+        # As must editing the arguments of an existing model in place
+        pn.models['pore.c']['prop'] = 'pore.b'
+        with pytest.raises(Exception):
+            pn.models.dependency_list()
+        pn.models['pore.c']['prop'] = 'pore.a'
+        pn.remove_model('pore.c', mode='model')
+        tree = pn.models.dependency_list()
+        assert 'pore.c' in tree  # Still present as a model-less prop
+        del pn['pore.c']
+        assert 'pore.c' not in pn.models.dependency_list()
+
     def test_regenerate_models_on_phase_with_deep(self):
         pn = op.network.Cubic(shape=[5, 5, 5])
         geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps, throats=pn.Ts)
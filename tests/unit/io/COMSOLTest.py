@@ -24,6 +24,20 @@ class COMSOLTest:
         op.io.to_comsol(network=self.net2d)
         assert os.path.isfile(f"{self.net2d.name}.mphtxt")
 
+    def test_export_data_2d_network_contents(self, tmpdir):
+        fname = tmpdir.join('comsol')
+        op.io.to_comsol(network=self.net2d, filename=fname)
+        with open(f"{fname}.mphtxt") as f:
+            text = f.read()
+        Np, Nt = self.net2d.Np, self.net2d.Nt
+        assert text.count('# --------- rectangle nbr') == Nt
+        assert text.count('# --------- circle nbr') == Np
+        assert text.count('3 obj\n') == Np + Nt
+        assert f'# --------- circle nbr {Np} ---------' in text
+        x, y = self.net2d['pore.coords'][-1, :2]
+        r = self.net2d['pore.diameter'][-1]/2
+        assert f'{x - r} {y} -1 NAN' in text
+
     def test_export_data_3d_network(self):
         with pytest.raises(Exception):
             op.io.to_comsol(network=self.net3d)
@@ -79,6 +79,94 @@ class HDF5Test:
         f.close()
         os.remove(fname.dirpath().join(self.net.project.name + '.hdf'))
 
+    def test_from_hdf5(self, tmpdir):
+        fname = tmpdir.join(self.net.project.name)
+        for kwargs in [{}, {'categorize_by': ['object', 'data', 'element']},
+                       {'interleave': False},
+                       {'interleave': False, 'flatten': False}]:
+            f = op.io.to_hdf5(network=[self.net],
+                              phases=[self.phase_1, self.phase_2],
+                              filename=fname, **kwargs)
+            filename = f.filename
+            f.close()
+            project = op.io.from_hdf5(filename)
+            net = project.network
+            assert np.all(net['throat.conns'] == self.net['throat.conns'])
+            assert np.all(net['pore.boo'] == 1)
+            assert np.all(project[self.phase_1.name]['throat.baz']
+                          == self.phase_1['throat.baz'])
+            assert np.all(project[self.phase_2.name]['pore.baz']
+                          == self.phase_2['pore.baz'])
+            if kwargs.get('interleave', True):
+                assert len(project) == 3
+            else:
+                assert len(project) == 9
+            ws = op.Workspace()
+            ws.close_project(project)
+            os.remove(filename)
+
+    def test_from_hdf5_lazy_subset(self, tmpdir):
+        fname = tmpdir.join(self.net.project.name)
+        f = op.io.to_hdf5(network=[self.net], phases=[self.phase_1],
+                          filename=fname)
+        filename = f.filename
+        f.close()
+        Ps = [4, 5, 6, 7]
+        Ts = self.net.find_neighbor_throats(pores=Ps, mode='xnor')
+        project = op.io.from_hdf5(filename, lazy=True, pores=Ps)
+        net = project.network
+        assert net.Np == 4
+        assert net.Nt == len(Ts)
+        assert isinstance(dict.__getitem__(net, 'pore.coords'),
+                          op.utils.LazyArray)
+        assert np.all(net['pore.coords'] == self.net['pore.coords'][Ps])
+        conns = self.net['throat.conns'][Ts] - 4
+        assert np.all(net['throat.conns'] == conns)
+        assert np.all(project[self.phase_1.name]['pore.baz'] == 12)
+        ws = op.Workspace()
+        ws.close_project(project)
+        project = op.io.from_hdf5(filename, throats=[0])
+        assert project.network.Np == 2
+        assert np.all(project.network['throat.conns'] == [[0, 1]])
+        ws.close_project(project)
+
+    def test_from_hdf5_subset_not_interleaved(self, tmpdir):
+        pn = op.network.Cubic(shape=[4, 4, 4])
+        Ps = pn.Ps < 32
+        Ts = pn.find_neighbor_throats(pores=Ps, mode='xnor')
+        geo1 = op.geometry.GenericGeometry(network=pn, pores=Ps, throats=Ts)
+        geo2 = op.geometry.GenericGeometry(network=pn, pores=~Ps,
+                                           throats=~pn.to_mask(throats=Ts))
+        air = op.phase.GenericPhase(network=pn)
+        phys1 = op.physics.GenericPhysics(network=pn, phase=air, geometry=geo1)
+        phys2 = op.physics.GenericPhysics(network=pn, phase=air, geometry=geo2)
+        for obj in [geo1, geo2, phys1, phys2]:
+            obj['pore.values'] = np.random.rand(obj.Np)
+            obj['throat.values'] = np.random.rand(obj.Nt)
+        f = op.io.to_hdf5(network=pn, phases=air, interleave=False,
+                          filename=tmpdir.join('subset'))
+        filename = f.filename
+        f.close()
+        Ps = [30, 40, 41, 42, 45]
+        Ts = pn.find_neighbor_throats(pores=Ps, mode='xnor')
+        for lazy in [False, True]:
+            project = op.io.from_hdf5(filename, lazy=lazy, pores=Ps)
+            net = project.network
+            assert net.Np == 5
+            assert net.Nt == len(Ts)
+            for obj in [geo1, geo2, phys1, phys2]:
+                new = project[obj.name]
+                assert new.Np == np.isin(Ps, obj.to_global(pores=obj.Ps)).sum()
+                for element, inds in [('pore', Ps), ('throat', Ts)]:
+                    vals = pn[element + '.values'] if obj in [geo1, geo2] \
+                        else air[element + '.values']
+                    host = net if obj in [geo1, geo2] else project[air.name]
+                    locs = host[element + '.' + obj.name]
+                    assert np.all(new[element + '.values']
+                                  == vals[inds][locs])
+            op.Workspace().close_project(project)
+        os.remove(filename)
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
@@ -176,6 +176,26 @@ class JSONGraphTest:
         assert net['throat.surface_area'] == 2.0 * \
             np.sqrt(squared_radius) * np.pi * length
 
+    def test_save_and_load(self, tmpdir):
+        filename = tmpdir.join('round_trip.json')
+        op.io.to_jsongraph(self.net, filename=filename)
+        for validate in [True, False, 3]:
+            project = op.io.from_jsongraph(filename, validate=validate)
+            net = project.network
+            assert np.array_equal(net['throat.conns'], self.net['throat.conns'])
+            assert np.allclose(net['throat.length'], self.net['throat.length'])
+            assert np.allclose(net['throat.diameter'],
+                               self.net['throat.diameter'])
+
+    def test_sampled_validation(self):
+        nodes = [{'id': str(i)} for i in range(10)]
+        json_obj = {'graph': {'nodes': nodes}}
+        sample = jgf._sample_json(json_obj, n=3)
+        assert len(sample['graph']['nodes']) == 3
+        assert len(json_obj['graph']['nodes']) == 10
+        nodes[0]['id'] = 0
+        assert not jgf._validate_json(jgf._sample_json(json_obj, n=3))
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
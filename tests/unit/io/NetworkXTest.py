@@ -1,6 +1,6 @@
 import numpy as np
 import openpnm as op
-from networkx import complete_graph, random_layout
+from networkx import Graph, complete_graph, random_layout
 from networkx import set_node_attributes, set_edge_attributes
 
 
@@ -58,6 +58,30 @@ class NetworkXTest:
         assert np.shape(net['pore.coords']) == (8, 3)
         assert np.shape(net['throat.conns']) == (12, 2)
 
+    def test_from_networkx_missing_attributes(self):
+        G = Graph()
+        G.add_edge(2, 0, length=1.0)
+        G.add_edge(1, 2, length=2.0, tag='a')
+        G.add_node(1, diameter=0.5, coords=[0, 0, 0])
+        net = op.io.from_networkx(G).network
+        assert np.all(net['throat.conns'] == [[0, 2], [1, 2]])
+        assert np.all(net['throat.length'] == [1.0, 2.0])
+        assert net['throat.tag'][0] is None
+        assert net['throat.tag'][1] == 'a'
+        assert np.all(np.isnan(net['pore.diameter'][[0, 2]]))
+        assert net['pore.diameter'][1] == 0.5
+        assert net['pore.coords'].shape == (3, 3)
+
+    def test_save_and_load_networkx_with_data(self):
+        self.net['throat.foo'] = np.arange(self.net.Nt, dtype=float)
+        G = op.io.to_networkx(network=self.net)
+        net = op.io.from_networkx(G).network
+        Ts = net.find_connecting_throat(*self.net['throat.conns'].T)
+        assert np.all(net['throat.foo'][Ts] == self.net['throat.foo'])
+        assert np.all(net['pore.coords'] == self.net['pore.coords'])
+        assert net['pore.left'].dtype == bool
+        del self.net['throat.foo']
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
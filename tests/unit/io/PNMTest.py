@@ -16,6 +16,86 @@ class PNMTest:
         ws = op.Workspace()
         ws.clear()
 
+    def test_save_and_load_compressed(self, tmpdir):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps,
+                                              throats=pn.Ts)
+        air = op.phase.Air(network=pn)
+        phys = op.physics.Basic(network=pn, phase=air, geometry=geo)
+        g = phys['throat.hydraulic_conductance']
+        for compression, level in [(None, None), ('lzf', None), ('gzip', 9)]:
+            f = os.path.join(tmpdir, 'test5.pnm')
+            op.io.PNM.save_project(project=pn.project, filename=f,
+                                   compression=compression,
+                                   compression_level=level, chunks=50)
+            proj = op.io.PNM.load_project(f)
+            net = proj.network
+            assert len(proj) == 4
+            assert np.all(net['pore.coords'] == pn['pore.coords'])
+            assert np.all(net['pore.diameter'] == pn['pore.diameter'])
+            phase = proj[air.name]
+            assert np.all(phase['throat.hydraulic_conductance'] == g)
+            assert 'throat.hydraulic_conductance' in proj[phys.name].models
+            # Topology queries need the caches, which are not saved
+            assert np.all(net.find_neighbor_pores(pores=[0, 62])
+                          == pn.find_neighbor_pores(pores=[0, 62]))
+            assert np.all(net.neighbors_csr(pores=[0, 62])[1]
+                          == pn.neighbors_csr(pores=[0, 62])[1])
+            am = net.create_adjacency_matrix(fmt='csr', weights=g)
+            assert (am != pn.create_adjacency_matrix(fmt='csr',
+                                                     weights=g)).nnz == 0
+            path = op.topotools.find_path(network=net, pore_pairs=[[0, 124]])
+            assert len(path['pores'][0]) == 13
+            assert np.all(net.get_kdtree().query(pn.coords[7])[1] == 7)
+            ws.close_project(proj)
+        with pytest.raises(Exception):
+            op.io.PNM.save_project(project=pn.project, filename=f,
+                                   compression='lzf', compression_level=4)
+
+    def test_load_lazy_and_selective(self, tmpdir):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps,
+                                              throats=pn.Ts)
+        air = op.phase.Air(network=pn)
+        phys = op.physics.Basic(network=pn, phase=air, geometry=geo)
+        f = os.path.join(tmpdir, 'test6.pnm')
+        op.io.PNM.save_project(project=pn.project, filename=f)
+        proj = op.io.PNM.load_project(f, lazy=True)
+        net = proj.network
+        assert isinstance(dict.__getitem__(net, 'pore.coords'),
+                          op.utils.LazyArray)
+        assert 'pore.coords' in net.props()
+        assert np.all(net['pore.coords'] == pn['pore.coords'])
+        assert isinstance(dict.__getitem__(net, 'pore.coords'), np.ndarray)
+        assert np.all(net['pore.diameter'] == pn['pore.diameter'])
+        assert np.all(net.find_neighbor_pores(pores=0)
+                      == pn.find_neighbor_pores(pores=0))
+        ws.close_project(proj)
+        props = ['pore.coords', 'throat.conns', 'throat.hydraulic_conductance']
+        proj = op.io.PNM.load_project(f, objects=[air.name, phys.name],
+                                      props=props)
+        assert len(proj) == 3
+        net = proj.network
+        assert sorted(net.keys()) == ['pore.all', 'pore.coords',
+                                      'throat.all', 'throat.conns']
+        assert np.all(proj[air.name]['throat.hydraulic_conductance']
+                      == phys['throat.hydraulic_conductance'])
+        ws.close_project(proj)
+
+    def test_lazy_array(self, tmpdir):
+        import h5py
+        f = os.path.join(tmpdir, 'test7.hdf5')
+        with h5py.File(f, mode='w') as root:
+            root['x'] = np.arange(10)*2
+        root = h5py.File(f, mode='r')
+        a = op.utils.LazyArray(root['x'])
+        assert a.shape == (10, )
+        assert len(a) == 10
+        assert np.all(a[2:4] == [4, 6])
+        assert np.all(a[[5, 1, 5, -1]] == [10, 2, 10, 18])
+        assert np.all(np.array(a) == np.arange(10)*2)
+        root.close()
+
     # def test_save_and_reload(self):
     #     f = 'test1.pnm'
     #     pn = op.network.Cubic(shape=[3, 3, 3])
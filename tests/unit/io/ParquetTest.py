@@ -0,0 +1,73 @@
+import os
+import py
+import pytest
+import numpy as np
+import openpnm as op
+pytest.importorskip('pyarrow')
+
+
+class ParquetTest:
+
+    def setup_class(self):
+        ws = op.Workspace()
+        ws.settings['local_data'] = True
+        self.net = op.network.Cubic(shape=[4, 3, 2])
+        self.net['pore.boo'] = np.random.rand(self.net.Np).astype(np.float32)
+        self.net['throat.vec'] = np.random.rand(self.net.Nt, 2)
+        self.net['pore.tensor'] = np.random.rand(self.net.Np, 2, 2)
+        self.phase_1 = op.phase.GenericPhase(network=self.net)
+        self.phase_1['pore.bar'] = 2
+        self.phase_1['throat.bar'] = 3
+        self.net['pore.object'] = np.ones(self.net.Np, dtype=object)
+
+    def teardown_class(self):
+        ws = op.Workspace()
+        ws.clear()
+
+    def test_save_and_load(self, tmpdir):
+        fname = os.path.join(tmpdir, 'test_parquet')
+        op.io.to_parquet(network=self.net, phases=self.phase_1,
+                         filename=fname, row_group_size=5)
+        assert os.path.isfile(fname + '_pore.parquet')
+        assert os.path.isfile(fname + '_throat.parquet')
+        proj = op.io.from_parquet(filename=fname)
+        assert len(proj) == 2
+        net = proj.network
+        assert net.name == self.net.name
+        assert np.all(net['pore.coords'] == self.net['pore.coords'])
+        assert np.all(net['throat.conns'] == self.net['throat.conns'])
+        assert net['pore.boo'].dtype == np.float32
+        assert np.all(net['throat.vec'] == self.net['throat.vec'])
+        assert np.all(net['pore.tensor'] == self.net['pore.tensor'])
+        assert net['pore.left'].dtype == bool
+        assert np.all(net['pore.left'] == self.net['pore.left'])
+        assert 'pore.object' not in net.keys()
+        phase = proj[self.phase_1.name]
+        assert np.all(phase['throat.bar'] == 3)
+
+    def test_load_zero_copy(self, tmpdir):
+        fname = os.path.join(tmpdir, 'test_parquet_2')
+        op.io.to_parquet(network=self.net, filename=fname,
+                         compression='none')
+        proj = op.io.from_parquet(filename=fname, memory_map=True)
+        coords = proj.network['pore.coords']
+        assert not coords.flags.owndata
+        assert np.all(coords == self.net['pore.coords'])
+
+    def test_load_bad_filename(self, tmpdir):
+        with pytest.raises(OSError):
+            op.io.from_parquet(filename=os.path.join(tmpdir, 'missing'))
+
+
+if __name__ == '__main__':
+    # All the tests in this file can be run with 'playing' this file
+    t = ParquetTest()
+    self = t  # For interacting with the tests at the command line
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print(f'Running test: {item}')
+            try:
+                t.__getattribute__(item)()
+            except TypeError:
+                t.__getattribute__(item)(tmpdir=py.path.local())
@@ -6,7 +6,6 @@ import openpnm as op
 from openpnm.models.misc import from_neighbor_pores
 
 
-@pytest.mark.skip(reason="'netgen' is only available on conda")
 class STLTest:
 
     def setup_class(self):
@@ -18,15 +17,51 @@ class STLTest:
         self.net["throat.length"] = 1.0
 
     def teardown_class(self):
-        os.remove(f"{self.net.name}.stl")
-        os.remove("custom_stl.stl")
+        for fname in [f"{self.net.name}.stl", "custom_stl.stl"]:
+            if os.path.isfile(fname):
+                os.remove(fname)
 
+    @pytest.mark.skip(reason="'netgen' is only available on conda")
     def test_export_data_stl(self):
         op.io.to_stl(network=self.net)
         assert os.path.isfile(f"{self.net.name}.stl")
         op.io.to_stl(network=self.net, filename="custom_stl")
         assert os.path.isfile("custom_stl.stl")
 
+    def test_export_data_stl_numpy(self, tmpdir):
+        fname = tmpdir.join('numpy_stl')
+        op.io.to_stl(network=self.net, filename=fname, mesher='numpy',
+                     resolution=8)
+        with open(f"{fname}.stl", 'rb') as f:
+            data = f.read()
+        n = np.frombuffer(data[80:84], dtype='<u4')[0]
+        assert len(data) == 84 + 50*n
+        dtype = np.dtype([('normal', '<f4', (3, )),
+                          ('vertices', '<f4', (3, 3)),
+                          ('attribute', '<u2')])
+        tris = np.frombuffer(data[84:], dtype=dtype)
+        assert len(tris) == n
+        assert np.allclose(np.linalg.norm(tris['normal'], axis=1), 1.0)
+        # The surfaces are closed and oriented outward, so the enclosed
+        # volume equals that of the (polygonal) spheres and cylinders
+        v = tris['vertices'].astype(float)
+        vol = np.einsum('ij,ij->i', v[:, 0], np.cross(v[:, 1], v[:, 2]))
+        vol = vol.sum()/6
+        Ns, Nc = 48, 32  # Number of triangles per sphere and cylinder
+        assert n == Ns*self.net.Np + Nc*self.net.Nt
+        from openpnm.io._stl import STL
+        unit_s = STL._sphere(8)
+        unit_c = STL._cylinder(8)
+        vs = np.einsum('ij,ij->i', unit_s[:, 0],
+                       np.cross(unit_s[:, 1], unit_s[:, 2])).sum()/6
+        vc = np.einsum('ij,ij->i', unit_c[:, 0],
+                       np.cross(unit_c[:, 1], unit_c[:, 2])).sum()/6
+        L = np.linalg.norm(np.diff(self.net.coords[self.net.conns], axis=1),
+                           axis=2).ravel()
+        expected = (vs*(self.net['pore.diameter']/2)**3).sum() \
+            + (vc*(self.net['throat.diameter']/2)**2*L).sum()
+        assert np.isclose(vol, expected, rtol=1e-4)
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
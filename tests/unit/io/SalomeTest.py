@@ -25,6 +25,24 @@ class SalomeTest:
         op.io.to_salome(network=self.net, filename="salome_custom")
         assert os.path.isfile("salome_custom.py")
 
+    def test_export_data_salome_contents(self, tmpdir):
+        fname = tmpdir.join('salome_contents')
+        op.io.to_salome(network=self.net, filename=fname)
+        assert 'throat.endpoints.head' not in self.net.keys()
+        with open(f"{fname}.py") as f:
+            text = f.read()
+        # Execute the part of the script defining the data
+        text = text.split('\npnm_2_salome(cylinder_head')[0]
+        d = {}
+        exec(text, d)
+        conns = self.net['throat.conns']
+        assert np.allclose(d['cylinder_head'], self.net.coords[conns[:, 0]])
+        assert np.allclose(d['cylinder_tail'], self.net.coords[conns[:, 1]])
+        assert np.allclose(d['cylinder_r'], self.net['throat.diameter']/2)
+        assert np.allclose(d['sphere_c'], self.net.coords)
+        assert np.allclose(d['sphere_r'], self.net['pore.diameter']/2)
+        assert d['explicit'] is False
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
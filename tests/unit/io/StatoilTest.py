@@ -43,6 +43,37 @@ class StatoilTest:
         assert 'pore.radius' in net.keys()
         assert np.all(net.find_neighbor_pores(pores=1000) == [221, 1214])
 
+    def test_save_and_load(self, tmpdir):
+        pn = op.network.Cubic(shape=[6, 5, 4], spacing=1e-4)
+        Np, Nt = pn.Np, pn.Nt
+        pn['pore.diameter'] = np.random.rand(pn.Np)*1e-5
+        pn['throat.diameter'] = np.random.rand(pn.Nt)*1e-5
+        pn['throat.diameter'][0] = np.nan
+        op.topotools.extend(network=pn, pore_coords=[[-1e-4, 2e-4, 1.5e-4],
+                                                     [7e-4, 2e-4, 1.5e-4]],
+                            labels=['reservoir'])
+        Pin, Pout = pn.Np - 2, pn.Np - 1
+        conns = [[P, Pin] for P in pn.pores('left')] \
+            + [[P, Pout] for P in pn.pores('right')]
+        op.topotools.extend(network=pn, throat_conns=conns,
+                            labels=['reservoir'])
+        pn['pore.shape_factor'] = 0.04
+        pn['throat.shape_factor'] = 0.04
+        op.io.to_statoil(network=pn, shape=[6e-4, 5e-4, 4e-4],
+                         prefix='test', path=tmpdir)
+        project = op.io.from_statoil(path=tmpdir, prefix='test')
+        net = project.network
+        assert net.Np == Np
+        assert net.Nt == Nt
+        assert np.all(net['throat.conns'] == pn['throat.conns'][:Nt])
+        assert np.allclose(net['pore.coords'], pn['pore.coords'][:Np])
+        assert np.allclose(net['pore.radius'], pn['pore.diameter'][:Np]/2)
+        assert net['throat.radius'][0] == 0.0
+        assert np.allclose(net['throat.radius'][1:],
+                           pn['throat.diameter'][1:Nt]/2)
+        assert np.all(net['pore.inlets'] == pn['pore.left'][:Np])
+        assert np.all(net['pore.outlets'] == pn['pore.right'][:Np])
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
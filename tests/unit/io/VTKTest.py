@@ -99,6 +99,37 @@ class VTKTest:
         assert np.shape(net['throat.conns']) == (12, 2)
         assert len(project.phases()) == 1
 
+    def test_save_and_load_binary(self, tmpdir):
+        pn = op.network.Cubic(shape=[4, 5, 6])
+        pn['pore.values'] = np.random.rand(pn.Np).astype(np.float32)
+        pn['throat.values'] = np.arange(pn.Nt)
+        for encoding in ['base64', 'raw']:
+            for compression in [None, 'zlib']:
+                fname = Path(tmpdir, f'test_{encoding}_{compression}.vtp')
+                op.io.to_vtk(network=pn, filename=fname, encoding=encoding,
+                             compression=compression)
+                project = op.io.from_vtk(filename=fname)
+                net = project.network
+                assert np.all(net['pore.coords'] == pn['pore.coords'])
+                assert np.all(net['throat.conns'] == pn['throat.conns'])
+                assert net['pore.values'].dtype == np.float32
+                assert np.all(net['pore.values'] == pn['pore.values'])
+                assert np.all(net['throat.values'] == pn['throat.values'])
+                assert np.all(net['pore.left'] == pn['pore.left'])
+                os.remove(fname)
+
+    def test_save_and_load_raw_ending_in_newline_byte(self, tmpdir):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        # This is the last array in the file, and its bytes are all 0x0A
+        pn['throat.zzz'] = np.full(pn.Nt, 10, dtype=np.uint8)
+        for compression in [None, 'zlib']:
+            fname = Path(tmpdir, f'test_newline_{compression}.vtp')
+            op.io.to_vtk(network=pn, filename=fname, encoding='raw',
+                         compression=compression)
+            net = op.io.from_vtk(filename=fname).network
+            assert net['throat.zzz'].dtype == np.uint8
+            assert np.all(net['throat.zzz'] == pn['throat.zzz'])
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
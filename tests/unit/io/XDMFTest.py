@@ -1,7 +1,9 @@
 import py
 import os
+import h5py
 import numpy as np
 import openpnm as op
+import xml.etree.ElementTree as ET
 
 
 class XDMFTest:
@@ -66,6 +68,66 @@ class XDMFTest:
         os.remove(tmpdir.join('test_file.hdf'))
         os.remove(tmpdir.join('test_file.xmf'))
 
+    def test_save_time_series(self, tmpdir):
+        fname = tmpdir.join('test_series')
+        xdmf = op.io.XDMFTimeSeries(network=self.net, phases=self.phase_1,
+                                    filename=fname)
+        x = np.arange(self.net.Np, dtype=float)
+        xmf_name = tmpdir.join('test_series.xmf')
+        old = ''
+        for t in [0, 0.5, 1]:
+            xdmf.add_step(t, {'pore.conc': x*t})
+            with open(xmf_name) as f:
+                xmf = f.read()
+            # Each step only appends its grid to the end of the file
+            tail = '</Grid></Domain></Xdmf>'
+            if t > 0:
+                assert xmf.startswith(old[:-len(tail)])
+            old = xmf
+        xdmf.close()
+        assert xdmf.times == [0, 0.5, 1]
+        with h5py.File(tmpdir.join('test_series.hdf'), 'r') as f:
+            assert len(f['time_series/pore.conc']) == 3
+            assert np.all(f['time_series/pore.conc/2'][:] == x)
+        assert xmf.count('Grid Name=') == 4
+        assert xmf.count('Time Value=') == 3
+        assert xmf.count('/time_series/pore.conc/') == 3
+        # The static data is defined once and referenced by every step
+        assert xmf.count(':coordinates') == 1
+        assert xmf.count('.hdf:/') == len(xdmf._static) + 3
+        root = ET.fromstring(xmf.split('[]>', 1)[1])
+        domain = root.find('Domain')
+        for grid in domain.find('Grid').findall('Grid'):
+            for el in grid.iter():
+                ref = el.text if el.get('Reference') == 'XML' \
+                    else el.get('Reference')
+                if ref is not None:
+                    assert domain.find(ref.replace('/Xdmf/Domain/', '')) \
+                        is not None
+
+    def test_save_time_series_during_run(self, tmpdir):
+        net = op.network.Cubic(shape=[4, 4, 1])
+        net['pore.volume'] = 1.0
+        phase = op.phase.GenericPhase(network=net)
+        phase['throat.diffusive_conductance'] = 1.0
+        alg = op.algorithms.TransientFickianDiffusion(network=net,
+                                                      phase=phase)
+        alg.set_value_BC(pores=net.pores('left'), values=1.0)
+        fname = tmpdir.join('test_run')
+        with op.io.XDMFTimeSeries(network=net, filename=fname) as xdmf:
+            soln = alg.run(x0=0, tspan=[0, 5], saveat=1,
+                           callback=xdmf.callback('pore.concentration'))
+        soln = soln['pore.concentration']
+        assert np.allclose(xdmf.times, soln.t)
+        with h5py.File(tmpdir.join('test_run.hdf'), 'r') as f:
+            for i in range(len(soln.t)):
+                x = f['time_series/pore.concentration/' + str(i)][:]
+                assert np.allclose(x, soln[:, i])
+        fname = tmpdir.join('test_soln')
+        with op.io.XDMFTimeSeries(network=net, filename=fname) as xdmf:
+            xdmf.add_solution(alg.soln)
+        assert np.allclose(xdmf.times, soln.t)
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
@@ -120,6 +120,47 @@ class CubicTest:
             with pytest.raises(Exception):
                 _ = op.network.Cubic(shape=[3, 4, 5], connectivity=x)
 
+    def test_lazy_matches_eager(self):
+        for c in [6, 14, 18, 20, 26]:
+            for shape in [[3, 4, 5], [4, 5], [1, 3, 1]]:
+                net1 = op.network.Cubic(shape=shape, connectivity=c,
+                                        spacing=[1, 2, 3])
+                net2 = op.network.Cubic(shape=shape, connectivity=c,
+                                        spacing=[1, 2, 3], lazy=True)
+                assert net1.keys() == net2.keys()
+                assert isinstance(dict.get(net2, 'throat.conns'),
+                                  op.utils.LazyArray)
+                assert net2.labels() == net1.labels()
+                for k in net1.keys():
+                    np.testing.assert_array_equal(net1[k], net2[k])
+                    assert net1[k].dtype == net2[k].dtype
+                assert not isinstance(dict.get(net2, 'throat.conns'),
+                                      op.utils.LazyArray)
+
+    def test_laplacian_operator(self):
+        from scipy.sparse.csgraph import laplacian
+        np.random.seed(0)
+        for c in [6, 14, 18, 20, 26]:
+            net = op.network.Cubic(shape=[4, 3, 5], connectivity=c, lazy=True)
+            g = np.random.rand(net.Nt)
+            A = laplacian(net.create_adjacency_matrix(weights=g))
+            L = net.create_laplacian_operator(weights=g)
+            x = np.random.rand(net.Np)
+            np.testing.assert_allclose(L @ x, A @ x)
+            np.testing.assert_allclose(L.diagonal(), A.diagonal())
+            np.testing.assert_allclose(L.tocsr().toarray(), A.toarray())
+            # Removing the connections of a pore removes its row and column
+            L.drop_connections([5])
+            B = L.tocsr().toarray()
+            assert np.count_nonzero(B[5]) == np.count_nonzero(B[:, 5]) == 1
+            np.testing.assert_allclose(L @ x, B @ x)
+        # The lattice is unaffected by the coords but not by trimming
+        net['pore.coords'] *= 2
+        net.create_laplacian_operator(weights=1.0)
+        op.topotools.trim(network=net, throats=[0])
+        with pytest.raises(Exception):
+            net.create_laplacian_operator(weights=1.0)
+
 
 if __name__ == '__main__':
 
@@ -119,6 +119,96 @@ class GenericNetworkTest:
                                            mode='exclusive_or')
         assert np.all(a == [0, 1, 2, 900, 902, 1800, 1802])
 
+    def test_neighbors_csr_pores(self):
+        a = self.net.neighbors_csr()
+        assert len(a) == self.net.Np
+        b = self.net.find_neighbor_pores(pores=self.net.Ps, flatten=False,
+                                         include_input=True)
+        assert all(np.all(i == j) for i, j in zip(a, b))
+        assert np.all(a.counts == self.net.num_neighbors(self.net.Ps))
+
+    def test_neighbors_csr_throats_subset(self):
+        a = self.net.neighbors_csr(pores=[0, 2], element='throat')
+        assert np.all(a.indptr == [0, 3, 7])
+        assert np.all(a[0] == [0, 900, 1800])
+        assert np.all(a[1] == [1, 2, 902, 1802])
+        assert np.all(a.rows == [0, 0, 0, 1, 1, 1, 1])
+
+    def test_cached_csr_matrices_match_coo(self):
+        net = op.network.Cubic(shape=[4, 4, 4])
+        op.topotools.extend(network=net, conns=[[0, 1], [5, 6]])
+        w = np.random.rand(net.Nt)
+        for f in [net.create_adjacency_matrix, net.create_incidence_matrix]:
+            a = f(weights=w, fmt='csr')
+            b = f(weights=w, fmt='coo').tocsr()
+            assert np.all(a.indptr == b.indptr)
+            assert np.all(a.indices == b.indices)
+            assert np.allclose(a.data, b.data)
+        a = net.create_adjacency_matrix(weights=np.vstack((w, 2*w)).T,
+                                        fmt='csr')
+        assert np.allclose(a[0, 1], w[0] + w[-2])
+        assert np.allclose(a[1, 0], 2*(w[0] + w[-2]))
+
+    def test_writing_conns_invalidates_cached_matrices(self):
+        net = op.network.Cubic(shape=[3, 1, 1])
+        am = net.get_adjacency_matrix(fmt='csr')
+        assert am.nnz == 4
+        version = net._topology_version
+        net['throat.conns'] = np.array([[0, 2], [0, 1]])
+        assert net._topology_version > version
+        am = net.get_adjacency_matrix(fmt='csr')
+        assert np.all(am.indices == [1, 2, 0, 0])
+        assert am[0, 2] == 0
+        im = net.get_incidence_matrix(fmt='csr')
+        assert np.all(im.indices == [0, 1, 1, 0])
+        version = net._topology_version
+        net['pore.coords'] = net['pore.coords'] * 2
+        assert net._topology_version > version
+
+    def test_editing_conns_in_place_invalidates_cached_matrices(self):
+        net = op.network.Cubic(shape=[4, 1, 1])
+        w = np.arange(net.Nt) + 1.0
+        am = net.get_adjacency_matrix(fmt='csr')
+        assert np.all(net.find_neighbor_pores(pores=0) == [1])
+        version = net._topology_version
+        net['throat.conns'][2] = [0, 3]
+        assert np.all(net.find_neighbor_pores(pores=0) == [1, 3])
+        assert net._topology_version > version
+        am = net.get_adjacency_matrix(fmt='csr')
+        assert am[0, 3] == 2
+        im = net.create_incidence_matrix(weights=w, fmt='csr')
+        assert im[0, 2] == 3
+        a = net.create_adjacency_matrix(weights=w, fmt='csr')
+        assert (a != net.create_adjacency_matrix(weights=w, fmt='coo')).nnz == 0
+        version = net._topology_version
+        net.find_neighbor_pores(pores=0)
+        assert net._topology_version == version
+
+    def test_query_pores_radius_and_nearest(self):
+        coords = [[0.5, 0.5, 0.5], [20, 20, 20], [5.5, 5.5, 5.4]]
+        a = self.net.query_pores(coords, r=1)
+        assert np.all(a.counts == [4, 0, 2])
+        assert np.all(a[0] == [0, 1, 10, 100])
+        a = self.net.query_pores(coords, k=2)
+        assert np.all(a.counts == [2, 2, 2])
+        assert a[2][0] == 555
+        a = self.net.query_pores(coords, k=2, r=1)
+        assert np.all(a.counts == [2, 0, 2])
+        a = self.net.query_pores(coords, k=1, pores=[1, 2, 3])
+        assert np.all(a.indices == [1, 3, 3])
+        with pytest.raises(Exception):
+            self.net.query_pores(coords)
+
+    def test_kdtree_is_rebuilt_when_coords_change(self):
+        net = op.network.Cubic(shape=[3, 3, 3])
+        tree = net.get_kdtree()
+        assert net.get_kdtree() is tree
+        net['pore.coords'][0] = [10, 10, 10]
+        assert net.get_kdtree() is not tree
+        assert np.all(net.query_pores([[10, 10, 10]], k=1).indices == [0])
+        net['pore.coords'] = net['pore.coords'] + 1
+        assert np.all(net.get_kdtree().data == net['pore.coords'])
+
     def test_num_neighbors_empty(self):
         a = self.net.num_neighbors(pores=[])
         assert np.size(a) == 0
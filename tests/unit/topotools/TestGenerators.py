@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import openpnm as op
 
 
@@ -22,6 +23,32 @@ class GeneratorTest:
         assert net['vert.coords'].shape[0] == 91
         assert net['edge.conns'].shape[0] == 414
 
+    def test_fcc_and_bcc_coordination(self):
+        net = op.topotools.generators.fcc([4, 4, 4], 2)
+        conns = net['edge.conns']
+        assert np.all(conns[:, 0] < conns[:, 1])
+        assert len(np.unique(conns, axis=0)) == len(conns)
+        L = np.linalg.norm(np.diff(net['vert.coords'][conns], axis=1), axis=2)
+        assert np.allclose(np.unique(L.round(10)), [np.sqrt(2), 2])
+        # Interior face sites have 12 neighbors, interior corners 6 + 12
+        z = np.bincount(conns.flatten())
+        c = net['vert.coords']
+        interior = np.all((c > 2) & (c < 8), axis=1)
+        corner = np.all(np.mod(c - 1, 2) == 0, axis=1)
+        assert np.all(z[interior & ~corner] == 12)
+        assert np.all(z[interior & corner] == 18)
+        net = op.topotools.generators.bcc([4, 4, 4], 2)
+        z = np.bincount(net['edge.conns'].flatten())
+        c = net['vert.coords']
+        interior = np.all((c > 2) & (c < 8), axis=1)
+        assert np.all(z[interior] == 14)
+
+    def test_fcc_and_bcc_mode_is_deprecated(self):
+        with pytest.warns(DeprecationWarning):
+            op.topotools.generators.fcc([2, 2, 2], mode='kdtree')
+        with pytest.warns(DeprecationWarning):
+            op.topotools.generators.bcc([2, 2, 2], mode='tri')
+
     def test_delaunay(self):
         np.random.seed(0)
         net, tri = op.topotools.generators.delaunay(points=20, shape=[1, 1, 1])
@@ -47,6 +74,28 @@ class GeneratorTest:
         assert net['vert.coords'].shape[0] == 80
         assert net['edge.conns'].shape[0] == 457
 
+    def test_voronoi_delaunay_dual_conns(self):
+        np.random.seed(0)
+        f = op.topotools.generators.voronoi_delaunay_dual
+        net, vor, tri = f(points=50, shape=[1, 1, 0])
+        conns = net['edge.conns']
+        assert conns.dtype == np.int32
+        # Conns are sorted, upper triangular and free of duplicates
+        assert np.all(conns[:, 0] < conns[:, 1])
+        keys = conns[:, 0].astype(int)*len(net['vert.coords']) + conns[:, 1]
+        assert np.all(np.diff(keys) > 0)
+        # Every Delaunay edge of the tessellation is present
+        pairs = set(map(tuple, np.sort(vor.ridge_points, axis=1)))
+        assert pairs.issubset(set(map(tuple, conns.tolist())))
+        # Each base point connects to every finite vertex of its region
+        Np = vor.npoints
+        am = op.topotools.conns_to_am(conns).tocsr()
+        am = am + am.T
+        for i in range(Np):
+            region = vor.regions[vor.point_region[i]]
+            verts = {v + Np for v in region if v > -1}
+            assert verts == set(am[i].indices[am[i].indices >= Np])
+
     def test_cubic_template(self):
         im = np.ones([50, 50], dtype=bool)
         im[25:, ...] = False
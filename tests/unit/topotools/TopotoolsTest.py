@@ -3,6 +3,7 @@ import numpy as np
 import openpnm as op
 from numpy.testing import assert_allclose
 from openpnm import topotools
+from scipy.sparse import csgraph
 
 
 class TopotoolsTest:
@@ -273,6 +274,71 @@ class TopotoolsTest:
                                       inlets=Pin, outlets=Pout)
         assert val
 
+    def test_find_path(self):
+        np.random.seed(0)
+        net = op.network.Cubic(shape=[6, 5, 4])
+        topotools.extend(network=net, conns=net['throat.conns'][:3])
+        conns = net['throat.conns']
+        weights = np.random.rand(net.Nt) + 0.1
+        weights[-3:] = 0.01
+        pairs = np.random.randint(0, net.Np, size=[200, 2])
+        pairs[:20, 0] = 0
+        pairs[20, :] = 7
+        am = net.create_adjacency_matrix(weights=weights, fmt='csr')
+        dist = csgraph.dijkstra(am, indices=pairs[:, 0])
+        for chunk_size in [None, 1, 7]:
+            paths = topotools.find_path(net, pore_pairs=pairs, weights=weights,
+                                        chunk_size=chunk_size)
+            assert_allclose(paths['distance'],
+                            dist[np.arange(200), pairs[:, 1]])
+            for (a, b), Ps, Ts in zip(pairs, paths['pores'], paths['throats']):
+                assert Ps[0] == a and Ps[-1] == b
+                assert Ts.size == Ps.size - 1
+                steps = np.sort(np.vstack((Ps[:-1], Ps[1:])).T, axis=1)
+                assert np.all(conns[Ts] == steps)
+        # Duplicate throats with the lower weight are used
+        Ts = np.hstack(paths['throats'])
+        assert not np.any(np.isin(Ts, np.arange(3)))
+        assert paths['pores'][20].tolist() == [7]
+        # Pairs beyond the limit are returned empty
+        limited = topotools.find_path(net, pore_pairs=pairs, weights=weights,
+                                      limit=1.0)
+        far = limited['distance'] > 1.0
+        assert np.all(np.isinf(limited['distance'][far]))
+        assert all(limited['pores'][i].size == 0 for i in np.where(far)[0])
+        assert_allclose(limited['distance'][~far], paths['distance'][~far])
+
+    def test_find_path_directed_weights(self):
+        np.random.seed(0)
+        net = op.network.Cubic(shape=[6, 5, 4])
+        topotools.extend(network=net, conns=net['throat.conns'][:3])
+        conns = net['throat.conns']
+        weights = np.random.rand(net.Nt, 2) + 0.1
+        weights[-3:, 0] = 0.01
+        pairs = np.random.randint(0, net.Np, size=[100, 2])
+        pairs[:20, 1] = 0
+        am = net.create_adjacency_matrix(weights=weights, fmt='csr')
+        dist = csgraph.dijkstra(am, indices=pairs[:, 0])[np.arange(100),
+                                                         pairs[:, 1]]
+        for w in [weights, weights.flatten(order='F')]:
+            paths = topotools.find_path(net, pore_pairs=pairs, weights=w)
+            assert_allclose(paths['distance'], dist)
+            for (a, b), Ps, Ts, d in zip(pairs, paths['pores'],
+                                         paths['throats'], dist):
+                assert Ps[0] == a and Ps[-1] == b
+                assert_allclose(am[Ps[:-1], Ps[1:]].sum(), d)
+                # The throat with the lowest weight in the direction of
+                # travel is used
+                for p, q, t in zip(Ps[:-1], Ps[1:], Ts):
+                    out = weights[conns[:, 0] == p, 0]
+                    back = weights[conns[:, 1] == p, 1]
+                    hits = np.hstack((conns[conns[:, 0] == p, 1],
+                                      conns[conns[:, 1] == p, 0])) == q
+                    col = 0 if conns[t, 0] == p else 1
+                    assert weights[t, col] == np.hstack((out, back))[hits].min()
+        with pytest.raises(Exception):
+            topotools.find_path(net, pore_pairs=pairs, weights=weights[:, :1])
+
     def test_trim_pores(self):
         np.random.seed(1)
         pn = op.network.Cubic(shape=[2, 2, 2], spacing=1)
@@ -303,6 +369,86 @@ class TopotoolsTest:
         topotools.trim(pn, throats=pn.throats()[trimmers])
         assert ~np.any(pn['throat.random'] < 0.25)
 
+    def test_transaction_matches_sequential_trims(self):
+        for in_place in [False, True]:
+            pn1 = op.network.Cubic(shape=[6, 6, 6])
+            pn2 = op.network.Cubic(shape=[6, 6, 6])
+            for pn in [pn1, pn2]:
+                geo = op.geometry.GenericGeometry(network=pn, pores=pn.Ps,
+                                                  throats=pn.Ts)
+                geo['pore.index'] = pn.Ps
+                geo['throat.index'] = pn.Ts
+            topotools.trim(pn1, pores=pn1.pores('left'))
+            topotools.trim(pn1, throats=[0, 1, 2])
+            with topotools.TopologyTransaction(pn2, in_place=in_place) as t:
+                t.trim(pores=pn2.pores('left'))
+                Ts = pn2.find_neighbor_throats(pores=pn2.pores('left'))
+                Ts = np.setdiff1d(pn2.Ts, Ts)[:3]
+                t.trim(throats=Ts)
+            assert pn1.Np == pn2.Np == 180
+            assert pn1.Nt == pn2.Nt
+            assert np.all(pn1.conns == pn2.conns)
+            assert np.all(pn1['pore.index'] == pn2['pore.index'])
+            assert np.all(pn1['throat.index'] == pn2['throat.index'])
+            assert pn2['pore.index'].dtype == pn1['pore.index'].dtype
+            assert pn2.get_adjacency_matrix().nnz == 2*pn2.Nt
+
+    def test_transaction_extend_and_trim_new_elements(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        pn['pore.value'] = 1.0
+        pn['pore.index'] = pn.Ps
+        t = topotools.TopologyTransaction(pn)
+        Ps, _ = t.extend(coords=[[0.5, 0.5, 3.5], [0.5, 0.5, 4.5]],
+                         labels='new')
+        assert np.all(Ps == [27, 28])
+        _, Ts = t.extend(conns=[[2, 27], [27, 28]], labels=['new'])
+        assert np.all(Ts == [54, 55])
+        t.trim(pores=[0, 28])
+        assert pn.Np == 27
+        t.apply()
+        assert pn.Np == 27
+        assert pn.Nt == 52
+        assert np.all(pn.pores('new') == [26])
+        assert np.all(pn.conns[pn.throats('new')] == [[1, 26]])
+        assert np.all(pn['pore.coords'][26] == [0.5, 0.5, 3.5])
+        assert np.isnan(pn['pore.value'][26])
+        assert np.isnan(pn['pore.index'][26])
+        assert np.all(pn['pore.index'][:26] == np.arange(1, 27))
+
+    def test_transaction_errors(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        t = topotools.TopologyTransaction(pn)
+        with pytest.raises(Exception):
+            t.extend(conns=[[0, 27]])
+        with pytest.raises(Exception):
+            t.trim(pores=[27])
+        t.trim(pores=pn.Ps)
+        with pytest.raises(Exception):
+            t.apply()
+        t = topotools.TopologyTransaction(pn)
+        t.trim(pores=[0])
+        topotools.trim(pn, pores=[1])
+        with pytest.raises(Exception):
+            t.apply()
+
+    def test_transaction_in_place_reuses_memory(self):
+        import tracemalloc
+        peaks = []
+        for in_place in [False, True]:
+            tracemalloc.start()
+            pn = op.network.Cubic(shape=[30, 30, 30])
+            pn['throat.big'] = np.random.rand(pn.Nt, 50)  # About 30 MB
+            Ps = pn.pores('left')
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            with topotools.TopologyTransaction(pn, in_place=in_place) as t:
+                t.trim(pores=Ps)
+            peaks.append(tracemalloc.get_traced_memory()[1] - start)
+            tracemalloc.stop()
+            assert pn['throat.big'].shape == (pn.Nt, 50)
+        assert peaks[0] > 30e6
+        assert peaks[1] < 10e6
+
     def test_iscoplanar(self):
         # Generate planar points with several parallel vectors at start
         coords = [[0, 0, 0], [0, 0, 0], [0, 0, 1], [0, 0, 2], [0, 1, 2]]
@@ -400,6 +546,26 @@ class TopotoolsTest:
                             method='nearest')
         assert pn.Nt == (pn2.Nt * 3 + 20)
 
+    def test_stitch_order_follows_given_pores(self):
+        from scipy.spatial.distance import cdist
+        np.random.seed(0)
+        for method in ['nearest', 'radius']:
+            pn = op.network.Cubic(shape=[6, 6, 1])
+            pn2 = op.network.Cubic(shape=[6, 6, 1])
+            pn2['pore.coords'] += [6, 0.5, 0]
+            P1 = np.random.permutation(pn.pores('right'))
+            P2 = np.random.permutation(pn2.pores('left'))
+            D = cdist(pn['pore.coords'][P1], pn2['pore.coords'][P2])
+            if method == 'nearest':
+                i, j = np.where(D == D.min(axis=0))
+            else:
+                i, j = np.where(D <= 2)
+            conns = np.vstack((P1[i], P2[j] + pn.Np)).T
+            op.topotools.stitch(network=pn, donor=pn2, P_network=P1,
+                                P_donor=P2, method=method, len_max=2)
+            assert conns.shape[0] > 6
+            assert np.all(pn['throat.conns'][-conns.shape[0]:] == conns)
+
     def test_dimensionality(self):
         # 3D network
         pn = op.network.Cubic(shape=[3, 4, 5])
@@ -601,6 +767,113 @@ class TopotoolsTest:
         Ts_int = op.topotools.find_interface_throats(net, "internal", "surface")
         assert_allclose(Ts_int, np.array([0, 3]))
 
+    def test_reorder(self):
+        pn = op.network.Cubic(shape=[8, 7, 6])
+        np.random.seed(0)
+        shuffled = np.random.permutation(pn.Np)
+        pn['pore.coords'] = pn['pore.coords'][shuffled]
+        pn['throat.conns'] = np.argsort(shuffled)[pn['throat.conns']]
+        pn['pore.left'] = pn['pore.left'][shuffled]
+        pn['pore.right'] = pn['pore.right'][shuffled]
+        geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps,
+                                              throats=pn.Ts)
+        air = op.phase.Air(network=pn)
+        phys = op.physics.Standard(network=pn, phase=air, geometry=geo)
+        fd = op.algorithms.FickianDiffusion(network=pn, phase=air)
+        fd.set_value_BC(pores=pn.pores('left'), values=1)
+        fd.set_value_BC(pores=pn.pores('right'), values=0)
+        fd.run()
+        x = fd.x.copy()
+        coords = pn['pore.coords'].copy()
+        D = geo['pore.diameter'].copy()
+        g = phys['throat.diffusive_conductance'].copy()
+        am = pn.create_adjacency_matrix(fmt='coo')
+        width = np.abs(am.row - am.col).max()
+        for method in ['rcm', 'hilbert', 'morton']:
+            op.topotools.reorder(network=pn, method=method)
+            Ps = pn['pore.original_index']
+            Ts = pn['throat.original_index']
+            assert_allclose(pn['pore.coords'], coords[Ps])
+            assert_allclose(geo['pore.diameter'], D[Ps])
+            assert_allclose(phys['throat.diffusive_conductance'], g[Ts])
+            assert_allclose(fd.x, x[Ps])
+            am = pn.create_adjacency_matrix(fmt='coo')
+            assert np.abs(am.row - am.col).max() < width
+            assert pn.project.check_geometry_health().health
+            fd.run()
+            assert_allclose(fd.x, x[Ps])
+        with pytest.raises(Exception):
+            op.topotools.reorder(network=pn, method='blah')
+
+    def test_reorder_swaps_throat_end_values(self):
+        pn = op.network.Cubic(shape=[6, 6, 6])
+        np.random.seed(0)
+        shuffled = np.random.permutation(pn.Np)
+        pn['pore.coords'] = pn['pore.coords'][shuffled]
+        pn['throat.conns'] = np.argsort(shuffled)[pn['throat.conns']]
+        Ps = pn['pore.coords'][:, 0] < 3
+        Ts = pn.find_neighbor_throats(pores=Ps, mode='or')
+        geo1 = op.geometry.SpheresAndCylinders(network=pn, pores=Ps,
+                                               throats=Ts)
+        Ts = np.setdiff1d(pn.Ts, Ts)
+        geo2 = op.geometry.SpheresAndCylinders(network=pn, pores=~Ps,
+                                               throats=Ts)
+        # Update the throats of geo1 that see the pores of geo2
+        geo1.regenerate_models(exclude=['pore.seed'])
+        keys = [k for k in geo1.keys() if k.endswith(('.pore1', '.pore2'))]
+        models = list({k.rsplit('.', 1)[0] for k in keys})
+        assert len(keys) > 0
+        for method in ['rcm', 'hilbert']:
+            op.topotools.reorder(network=pn, method=method)
+            for geo in [geo1, geo2]:
+                before = {k: geo[k].copy() for k in keys}
+                geo.regenerate_models(propnames=models)
+                for k in keys:
+                    assert_allclose(geo[k], before[k])
+
+    def test_reorder_hilbert_curve_is_continuous(self):
+        pn = op.network.Cubic(shape=[8, 8, 8])
+        pn['pore.coords'] = pn['pore.coords'][::-1]
+        op.topotools.reorder(network=pn, method='hilbert')
+        steps = np.diff(pn['pore.coords'], axis=0)
+        assert_allclose(np.linalg.norm(steps, axis=1), 1.0)
+
+    def test_partition(self):
+        np.random.seed(0)
+        pn = op.network.Voronoi(shape=[1, 1, 1], points=1000)
+        conns = pn['throat.conns']
+        for parts in [1, 2, 3, 7]:
+            rcb, Ts_rcb = topotools.partition(pn, parts=parts, refine=False)
+            labels, Ts = topotools.partition(pn, parts=parts, tol=0.05)
+            assert labels.shape == (pn.Np, )
+            counts = np.bincount(labels, minlength=parts)
+            assert counts.size == parts
+            assert counts.max() <= 1.05 * pn.Np / parts
+            assert counts.min() >= 0.95 * pn.Np / parts
+            cut = labels[conns[:, 0]] != labels[conns[:, 1]]
+            assert_allclose(Ts, np.where(cut)[0])
+            assert Ts.size <= Ts_rcb.size
+        assert Ts.size < Ts_rcb.size
+        with pytest.raises(Exception):
+            topotools.partition(pn, parts=0)
+        with pytest.raises(Exception):
+            topotools.partition(pn, parts=2, weights=[1, 2])
+
+    def test_partition_with_weights_and_geometries(self):
+        pn = op.network.Cubic(shape=[10, 10, 1])
+        weights = np.where(pn['pore.coords'][:, 0] < 5, 3.0, 1.0)
+        labels, Ts = topotools.partition(pn, parts=2, weights=weights,
+                                         refine=False)
+        assert_allclose(np.bincount(labels, weights=weights), 100, atol=3)
+        labels, Ts = topotools.partition(pn, parts=4, geometries=True)
+        geos = pn.project.geometries().values()
+        assert len(geos) == 4
+        assert sum(geo.Np for geo in geos) == pn.Np
+        assert sum(geo.Nt for geo in geos) == pn.Nt
+        for i, geo in enumerate(geos):
+            assert np.all(labels[geo.to_global(pores=geo.Ps)] == i)
+        assert pn.project.check_geometry_health().health
+
 
 if __name__ == '__main__':
 
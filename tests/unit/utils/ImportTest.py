@@ -0,0 +1,53 @@
+import sys
+import subprocess
+import pytest
+import openpnm as op
+
+
+class ImportTest:
+
+    def setup_class(self):
+        self.core = ('import numpy, scipy.sparse, scipy.spatial, '
+                     'scipy.sparse.csgraph, scipy.sparse.linalg')
+
+    def _run(self, code):
+        out = subprocess.run([sys.executable, '-c', code], check=True,
+                             capture_output=True, text=True)
+        return out.stdout
+
+    def test_heavy_dependencies_not_imported(self):
+        code = 'import sys, openpnm; print(" ".join(sys.modules.keys()))'
+        mods = self._run(code).split()
+        for mod in ['h5py', 'pandas', 'sympy', 'pypardiso', 'scipy.stats',
+                    'scipy.integrate', 'matplotlib', 'numba', 'tqdm',
+                    'networkx', 'skimage', 'chemicals', 'openpnm.io',
+                    'openpnm.materials', 'openpnm.metrics',
+                    'openpnm.contrib']:
+            assert mod not in mods
+
+    def test_lazy_modules(self):
+        for mod in ['io', 'materials', 'metrics', 'contrib']:
+            assert mod in dir(op)
+        assert hasattr(op.io, 'to_vtk')
+        from openpnm import metrics
+        assert metrics is op.metrics
+        with pytest.raises(AttributeError):
+            op.foo
+
+    def test_import_time(self):
+        # Time spent importing OpenPNM on top of its core dependencies
+        code = (self.core + '; import time; t = time.perf_counter(); '
+                + 'import openpnm; print(time.perf_counter() - t)')
+        t = min([float(self._run(code)) for _ in range(3)])
+        assert t < 1.0
+
+
+if __name__ == '__main__':
+
+    t = ImportTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print('running test: '+item)
+            t.__getattribute__(item)()
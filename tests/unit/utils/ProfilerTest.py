@@ -0,0 +1,106 @@
+import os
+import json
+import openpnm as op
+
+
+class ProfilerTest:
+
+    def setup_class(self):
+        self.ws = op.Workspace()
+        self.ws.clear()
+        self.prof = op.utils.Profiler()
+        self.net = op.network.Cubic(shape=[5, 5, 5])
+        self.geo = op.geometry.SpheresAndCylinders(network=self.net,
+                                                   pores=self.net.Ps,
+                                                   throats=self.net.Ts)
+        self.phase = op.phase.Water(network=self.net)
+        self.phys = op.physics.Standard(network=self.net, phase=self.phase,
+                                        geometry=self.geo)
+
+    def teardown_class(self):
+        self.prof.disable()
+        self.prof.clear()
+        self.ws.clear()
+
+    def teardown_method(self):
+        self.prof.disable()
+        self.prof.clear()
+
+    def test_singleton(self):
+        assert op.utils.Profiler() is self.prof
+
+    def test_disabled_by_default_records_nothing(self):
+        self.geo.regenerate_models()
+        assert len(self.prof.records) == 0
+
+    def test_model_events(self):
+        with self.prof:
+            self.geo.regenerate_models()
+        report = self.net.project.profile_report()
+        assert report['model: pore.diameter']['calls'] == 1
+        assert report['model: pore.diameter']['output_shapes'] == [125]
+        assert report['model: pore.diameter']['output_bytes'] == 125*8
+        # Models returning dicts are stored as several arrays
+        temp = report['model: throat.hydraulic_size_factors']
+        assert temp['output_bytes'] == 3*300*8
+        assert not self.prof.enabled
+
+    def test_transport_events(self):
+        alg = op.algorithms.StokesFlow(network=self.net, phase=self.phase)
+        alg.set_value_BC(pores=self.net.pores('left'), values=1)
+        alg.set_value_BC(pores=self.net.pores('right'), values=0)
+        self.prof.enable()
+        alg.run()
+        self.prof.disable()
+        report = self.prof.report(project=self.net.project)
+        assert report['transport: GenericTransport.run']['calls'] == 1
+        assert report['transport: GenericTransport._build_A']['calls'] >= 1
+        assert report['transport: GenericTransport._apply_BCs']['calls'] >= 1
+        solver = [k for k in report.keys() if k.startswith('solver:')]
+        assert len(solver) == 1
+        # Solver calls are attributed to the project of the algorithm
+        assert all([r['project'] == self.net.project.name
+                    for r in self.prof.records])
+
+    def test_report_filter_by_project(self):
+        pn2 = op.network.Cubic(shape=[3, 3, 3])
+        with self.prof:
+            op.geometry.SpheresAndCylinders(network=pn2, pores=pn2.Ps,
+                                            throats=pn2.Ts)
+            self.geo.regenerate_models(propnames=['pore.diameter'])
+        r1 = self.net.project.profile_report()
+        r2 = pn2.project.profile_report()
+        assert r1['model: pore.diameter']['calls'] == 1
+        assert r2['model: pore.diameter']['calls'] == 1
+        assert len(r2) > len(r1)
+        assert 'Calls' in str(r1)
+
+    def test_export_json_and_chrome_trace(self, tmpdir):
+        with self.prof:
+            op.io.to_csv(network=self.net, filename=tmpdir.join('a.csv'))
+        report = self.prof.report()
+        assert report['io: CSV.export_data']['calls'] == 1
+        fname = tmpdir.join('prof.json')
+        self.prof.to_json(fname)
+        with open(fname, 'r') as f:
+            records = json.load(f)
+        assert records[0]['cat'] == 'io'
+        fname = tmpdir.join('trace.json')
+        self.prof.to_chrome_trace(fname, project=self.net.project)
+        with open(fname, 'r') as f:
+            trace = json.load(f)
+        assert trace['traceEvents'][0]['ph'] == 'X'
+        assert trace['traceEvents'][0]['dur'] > 0
+        assert os.path.isfile(fname)
+
+
+if __name__ == '__main__':
+
+    t = ProfilerTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print(f'Running test: {item}')
+            t.__getattribute__(item)()
+    t.teardown_class()
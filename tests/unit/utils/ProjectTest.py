@@ -397,6 +397,115 @@ class ProjectTest:
         assert df.shape[1] == 3
         assert self.net.name + '.throat.conns_head' in df.index
 
+    def test_dtype_policy(self):
+        self.ws.settings.index_dtype = 'int32'
+        self.ws.settings.float32_props = ['pore.diameter']
+        try:
+            pn = op.network.Cubic(shape=[4, 4, 4])
+        finally:
+            self.ws.settings.index_dtype = 'int64'
+            self.ws.settings.float32_props = []
+        assert pn['throat.conns'].dtype == np.int32
+        assert pn['pore._id'].dtype == np.int32
+        geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps,
+                                              throats=pn.Ts)
+        assert geo['pore.diameter'].dtype == np.float32
+        assert pn['pore.coords'].dtype == np.float64
+        op.topotools.trim(network=pn, pores=[0, 1])
+        assert pn['throat.conns'].dtype == np.int32
+        op.topotools.extend(network=pn, pore_coords=[[5, 5, 5]],
+                            throat_conns=[[0, 62]])
+        assert pn['throat.conns'].dtype == np.int32
+        # Coefficient matrix is built in double precision regardless
+        phase = op.phase.GenericPhase(network=pn)
+        phase['throat.diffusive_conductance'] = \
+            np.ones(pn.Nt, dtype=np.float32)
+        fd = op.algorithms.FickianDiffusion(network=pn, phase=phase)
+        assert fd.A.dtype == np.float64
+        # Switching the policy on an existing project
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        assert pn['throat.conns'].dtype == np.int64
+        pn.project.settings.index_dtype = 'int32'
+        pn.project.apply_dtype_policy()
+        assert pn['throat.conns'].dtype == np.int32
+        # Values exceeding the int32 range are kept as int64
+        pn['pore._id'] = np.arange(pn.Np) + 2**40
+        assert pn['pore._id'].dtype == np.int64
+
+    def test_memmap_storage(self):
+        self.ws.settings.storage = 'memmap'
+        self.ws.settings.memmap_threshold = 0
+        try:
+            pn = op.network.Cubic(shape=[5, 5, 5])
+        finally:
+            self.ws.settings.storage = 'memory'
+            self.ws.settings.memmap_threshold = 2**20
+        proj = pn.project
+        assert isinstance(pn['pore.coords'], np.memmap)
+        assert isinstance(pn['throat.conns'], np.memmap)
+        geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps,
+                                              throats=pn.Ts)
+        assert isinstance(geo['pore.diameter'], np.memmap)
+        # Overwriting a property replaces its file rather than adding one
+        n = len(os.listdir(proj._scratch))
+        geo.regenerate_models()
+        assert len(os.listdir(proj._scratch)) == n
+        op.topotools.trim(network=pn, pores=[0])
+        assert isinstance(geo['pore.diameter'], np.memmap)
+        assert geo['pore.diameter'].shape == (124, )
+        phase = op.phase.GenericPhase(network=pn)
+        phase['throat.diffusive_conductance'] = 1.0
+        alg = op.algorithms.FickianDiffusion(network=pn, phase=phase)
+        alg.set_value_BC(pores=pn.pores('left'), values=1.0)
+        alg.set_value_BC(pores=pn.pores('right'), values=0.0)
+        alg.run()
+        assert not isinstance(alg['pore.concentration'], np.memmap)
+        assert np.all(alg['pore.concentration'] <= 1.0)
+        # Small arrays stay in memory
+        proj.settings.memmap_threshold = 10**6
+        pn['pore.foo'] = 1.0
+        assert not isinstance(pn['pore.foo'], np.memmap)
+        scratch = proj._scratch
+        copy = proj.copy()
+        assert copy._scratch is None
+        self.ws.close_project(copy)
+        self.ws.close_project(proj)
+        del proj, pn, geo, phase, alg
+        import gc
+        gc.collect()
+        assert not os.path.exists(scratch)
+
+    def test_copy_on_write(self):
+        pn = op.network.Cubic(shape=[4, 4, 4])
+        geo = op.geometry.SpheresAndCylinders(network=pn, pores=pn.Ps,
+                                              throats=pn.Ts)
+        proj = self.ws.copy_project(pn.project, mode='cow')
+        pn2 = proj.network
+        geo2 = proj.geometries()[geo.name]
+        # Numerical arrays are shared but read-only on the copy
+        assert geo2['pore.diameter'].base is geo['pore.diameter']
+        assert not geo2['pore.diameter'].flags.writeable
+        assert geo['pore.diameter'].flags.writeable
+        with pytest.raises(ValueError):
+            geo2['pore.diameter'][0] = 0.0
+        # Labels are duplicated so can be changed in place
+        pn2['pore.left'][:] = True
+        assert not np.all(pn['pore.left'])
+        # Writing a property on the copy leaves the original untouched
+        d = geo['pore.diameter'].copy()
+        geo2['pore.diameter'] = 1.0
+        assert np.all(geo2['pore.diameter'] == 1.0)
+        assert np.all(geo['pore.diameter'] == d)
+        # Models are distinct dicts sharing their parameters
+        assert geo2.models is not geo.models
+        assert geo2.models._find_parent() is geo2
+        geo2.models['pore.seed']['num_range'] = [0.3, 0.6]
+        assert geo.models['pore.seed']['num_range'] != [0.3, 0.6]
+        geo2.regenerate_models()
+        assert np.all(geo['pore.diameter'] == d)
+        with pytest.raises(Exception):
+            pn.project.copy(mode='blah')
+
 
 if __name__ == '__main__':
 
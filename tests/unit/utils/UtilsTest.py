@@ -105,6 +105,33 @@ class UtilsTest:
         assert not op.utils.is_valid_propname("throat.")
         assert not op.utils.is_valid_propname("pore.foo..bar")
 
+    def test_ragged_array(self):
+        a = op.utils.RaggedArray(indptr=[0, 2, 2, 5], indices=[4, 1, 3, 0, 2])
+        assert len(a) == 3
+        assert np.all(a.counts == [2, 0, 3])
+        assert np.all(a.rows == [0, 0, 2, 2, 2])
+        assert np.all(a[2] == [3, 0, 2])
+        assert a[1].size == 0
+        b = a[[2, 0]]
+        assert np.all(b.indptr == [0, 3, 5])
+        assert np.all(b.indices == [3, 0, 2, 4, 1])
+        b = a[np.array([True, False, True])]
+        assert np.all(b.indices == [4, 1, 3, 0, 2])
+        assert len(a[[]]) == 0
+        assert [list(i) for i in a] == [[4, 1], [], [3, 0, 2]]
+
+    def test_ragged_array_compress_and_reduce(self):
+        a = op.utils.RaggedArray(indptr=[0, 2, 2, 5], indices=[4, 1, 3, 0, 2])
+        b = a.compress(a.indices > 1)
+        assert np.all(b.indptr == [0, 1, 1, 3])
+        assert np.all(b.indices == [4, 3, 2])
+        vals = np.array([10., 20., 30., 40., 50.])
+        c = a.reduce(np.maximum, vals)
+        assert np.all(c[[0, 2]] == [50., 40.])
+        assert np.isnan(c[1])
+        c = a.reduce(np.add, vals, fill=0)
+        assert np.all(c == [70., 0., 80.])
+
 
 if __name__ == '__main__':
 
@@ -1,4 +1,5 @@
 import os
+import py
 import pytest
 import openpnm as op
 from numpy.testing import assert_allclose
@@ -101,21 +102,31 @@ class WorkspaceTest:
     #         self.ws.load_project('single_object.pnm')
     #     os.remove('single_object.pnm')
 
-    # def test_save_and_load_workspace(self):
-    #     self.ws.clear()
-    #     proj1 = self.ws.new_project('test_proj_1')
-    #     proj2 = self.ws.new_project('test_proj_2')
-    #     op.network.Cubic(shape=[3, 3, 3], project=proj1, name='net1')
-    #     op.network.Cubic(shape=[3, 3, 3], project=proj2, name='net2')
-    #     self.ws.save_workspace(filename='workspace_test')
-    #     self.ws.clear()
-    #     assert 'test_proj_1' not in self.ws.keys()
-    #     assert 'test_proj_2' not in self.ws.keys()
-    #     self.ws.load_workspace('workspace_test', overwrite=True)
-    #     assert 'test_proj_1' in self.ws.keys()
-    #     assert 'test_proj_2' in self.ws.keys()
-    #     self.ws.clear()
-    #     os.remove('workspace_test.pnm')
+    def test_save_and_load_workspace(self, tmpdir):
+        self.ws.clear()
+        proj1 = self.ws.new_project('test_proj_1')
+        proj2 = self.ws.new_project('test_proj_2')
+        net1 = op.network.Cubic(shape=[3, 3, 3], project=proj1, name='net1')
+        op.network.Cubic(shape=[4, 4, 4], project=proj2, name='net2')
+        op.phase.Air(network=net1, name='air')
+        fname = tmpdir.join('workspace_test')
+        self.ws.save_workspace(filename=fname, max_workers=2)
+        assert os.listdir(tmpdir) == ['workspace_test.wrk']
+        self.ws.clear()
+        fname = tmpdir.join('workspace_test.wrk')
+        projects = self.ws.load_workspace(fname, max_workers=2)
+        assert [p.name for p in projects] == ['test_proj_1', 'test_proj_2']
+        assert 'test_proj_1' in self.ws.keys()
+        assert 'test_proj_2' in self.ws.keys()
+        assert self.ws['test_proj_2'].network.Np == 64
+        assert 'air' in self.ws['test_proj_1'].phases().keys()
+        net2 = self.ws['test_proj_2'].network
+        assert_allclose(net2.find_neighbor_pores(pores=0), [1, 4, 16])
+        assert net2.get_kdtree().query(net2.coords[21])[1] == 21
+        # Loading again renames the projects
+        projects = self.ws.load_workspace(fname)
+        assert len(self.ws) == 4
+        self.ws.clear()
 
 
 if __name__ == '__main__':
@@ -126,4 +137,7 @@ if __name__ == '__main__':
     for item in t.__dir__():
         if item.startswith('test'):
             print(f"Running test {item}")
-            t.__getattribute__(item)()
+            try:
+                t.__getattribute__(item)()
+            except TypeError:
+                t.__getattribute__(item)(tmpdir=py.path.local())